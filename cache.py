@@ -0,0 +1,88 @@
+"""
+SQLite-backed response cache that survives restarts and is shared across processes.
+"""
+import os
+import time
+import sqlite3
+import logging
+import tempfile
+import threading
+from typing import Optional
+from dotenv import load_dotenv
+
+# Load environment variables (the cache is created at import, possibly before other modules load them)
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCache:
+    """
+    Key -> bytes store with per-entry expiry, kept in a single SQLite file.
+    Sits below the in-memory TTL caches; any SQLite error degrades to a cache miss.
+    """
+
+    def __init__(self, path: Optional[str]):
+        self.path = path
+        self._conn = None
+        self._lock = threading.Lock()
+
+        if not path:
+            return
+
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires REAL NOT NULL)"
+            )
+            self._conn.execute("DELETE FROM cache WHERE expires < ?", (time.time(),))
+            self._conn.commit()
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"Disk cache unavailable at {path}: {e}")
+            self._conn = None
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored bytes for key, or None if missing or expired."""
+        if self._conn is None:
+            return None
+
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache read failed: {e}")
+            return None
+
+        if row is None or row[1] < time.time():
+            return None
+        return row[0]
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store value under key for ttl seconds."""
+        if self._conn is None:
+            return
+
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                    (key, value, time.time() + ttl),
+                )
+                self._conn.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Disk cache write failed: {e}")
+
+
+def _default_path() -> Optional[str]:
+    # Off unless enabled: a persistent cache shared by every run would leak results between
+    # dev sessions and test runs
+    if os.getenv("DISK_CACHE", "false").lower() != "true":
+        return None
+    cache_dir = os.getenv("DISK_CACHE_DIR", os.path.join(tempfile.gettempdir(), "hackutd_cache"))
+    return os.path.join(cache_dir, "responses.sqlite3")
+
+
+# Shared instance used by the LLM client and the Maps tool
+disk_cache = DiskCache(_default_path())
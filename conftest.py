@@ -0,0 +1,7 @@
+"""
+Shared pytest setup.
+"""
+import os
+
+# Keep test runs hermetic: never read or write the persistent response cache, even if .env enables it
+os.environ["DISK_CACHE"] = "false"
@@ -3,6 +3,7 @@ Executor module for running plan steps, updating budget, and handling re-plannin
 """
 import logging
 from datetime import date, datetime
+from itertools import islice
 from typing import Dict, Any, List
 from .state import AgentState, ToolResult, TransportSelection, HotelSelection, ActivitySelection
 from .planner import update_plan_with_constraints
@@ -10,6 +11,11 @@ from tools import maps, weather, places, hotels
 
 logger = logging.getLogger(__name__)
 
+# Tags that make an activity a rainy-day option
+_INDOOR_TAGS = frozenset({"indoor", "museum", "coffee", "restaurant", "bar"})
+# Name/tag words that suggest a place without a price is free to visit
+_FREE_INDICATORS = ("park", "trail", "beach", "plaza", "square", "bridge", "viewpoint", "monument")
+
 
 def execute_plan(agent_state: AgentState) -> AgentState:
     """
@@ -288,25 +294,25 @@ def _process_tool_result(agent_state: AgentState, step, tool_result: ToolResult)
     return agent_state
 
 
-def _select_best_hotel(hotels: List[Dict[str, Any]], agent_state: AgentState) -> tuple:
+def _select_best_hotel(hotel_options: List[Dict[str, Any]], agent_state: AgentState) -> tuple:
     """Select the best hotel based on rating, price, and other factors.
     
     Returns:
         tuple: (selected_hotel, thinking_reasoning)
     """
     
-    if not hotels:
+    if not hotel_options:
         raise ValueError("No hotels to select from")
     
     # Agent thinking: Analyze each hotel option
     thinking_steps = []
-    thinking_steps.append(f"🧠 Thinking: Evaluating {len(hotels)} hotel options...")
+    thinking_steps.append(f"🧠 Thinking: Evaluating {len(hotel_options)} hotel options...")
     
-    # Score hotels based on multiple factors
+    # Score hotels based on multiple factors (all candidates scored in one batch)
     scored_hotels = []
+    base_scores = hotels.calculate_hotel_scores(hotel_options, [], None, None)
     
-    for hotel in hotels:
-        score = hotels.calculate_hotel_score(hotel, [], None, None)
+    for hotel, score in zip(hotel_options, base_scores):
         price = hotel.get("price_per_night", 0)
         rating = hotel.get("rating", 0)
         
@@ -499,8 +505,11 @@ def select_activities(agent_state: AgentState, user_interests: List[str], max_ac
     
     all_places = list(unique_places.values())
     
+    # Column view shared by the interest and distance filters below
+    place_table = places.PlaceTable.from_dicts(all_places)
+    
     # Find overlapping interests (places that match multiple interests)
-    multi_interest_places = places.find_overlapping_interests(all_places, user_interests)
+    multi_interest_places = places.find_overlapping_interests(all_places, user_interests, table=place_table)
     
     # Filter by location if hotel is selected
     if agent_state.selections.hotel:
@@ -508,7 +517,8 @@ def select_activities(agent_state: AgentState, user_interests: List[str], max_ac
             all_places,
             agent_state.selections.hotel.lat,
             agent_state.selections.hotel.lng,
-            max_distance_miles=5.0
+            max_distance_miles=5.0,
+            table=place_table
         )
     else:
         nearby_places = all_places
@@ -519,7 +529,7 @@ def select_activities(agent_state: AgentState, user_interests: List[str], max_ac
     
     if is_rainy:
         # Prefer indoor activities
-        indoor_places = [p for p in nearby_places if any(tag in ["indoor", "museum", "coffee", "restaurant", "bar"] for tag in p.get("tags", []))]
+        indoor_places = [p for p in nearby_places if not _INDOOR_TAGS.isdisjoint(p.get("tags", []))]
         selected_places.extend(indoor_places[:4])  # 4 indoor activities
         
         # Add 1-2 outdoor activities as backup
@@ -571,32 +581,30 @@ def select_activities(agent_state: AgentState, user_interests: List[str], max_ac
         # Check if price is valid
         if place_price is None:
             # Price key doesn't exist or is None - check if it's a free activity by name/tags
+            # Lowercase name and tags once, then one substring test per free-activity indicator
             place_name_lower = place.get("name", "").lower()
-            place_tags_lower = [tag.lower() for tag in place.get("tags", [])]
-            
-            # Common free activity indicators
-            free_indicators = ["park", "trail", "beach", "plaza", "square", "bridge", "viewpoint", "monument"]
-            is_likely_free = any(indicator in place_name_lower for indicator in free_indicators) or \
-                           any(indicator in " ".join(place_tags_lower) for indicator in free_indicators)
+            place_tags_lower = " ".join(place.get("tags", [])).lower()
+            is_likely_free = any(indicator in place_name_lower or indicator in place_tags_lower
+                                 for indicator in _FREE_INDICATORS)
             
             if is_likely_free:
                 place_price = 0.0
-                logger.info(f"Activity '{place.get('name')}' appears to be free (no price, but matches free activity patterns)")
+                logger.info("Activity '%s' appears to be free (no price, but matches free activity patterns)", place.get('name'))
             else:
                 place_price = 15.0  # Default for paid activities
-                logger.debug(f"Activity '{place.get('name')}' has no price, using default $15.0/person")
+                logger.debug("Activity '%s' has no price, using default $15.0/person", place.get('name'))
         elif isinstance(place_price, (int, float)):
             if place_price < 0:
                 place_price = 15.0
-                logger.warning(f"Activity '{place.get('name')}' has negative price, using default $15.0/person")
+                logger.warning("Activity '%s' has negative price, using default $15.0/person", place.get('name'))
             elif place_price == 0.0:
                 # Valid free activity
-                logger.debug(f"Activity '{place.get('name')}' is free (price: $0.0/person)")
+                logger.debug("Activity '%s' is free (price: $0.0/person)", place.get('name'))
             # else: valid paid activity with price > 0
         else:
             # Invalid price type
+            logger.warning("Activity '%s' has invalid price type %s, using default $15.0/person", place.get('name'), type(place_price))
             place_price = 15.0
-            logger.warning(f"Activity '{place.get('name')}' has invalid price type {type(place_price)}, using default $15.0/person")
         
         # Categorize as free or paid
         if place_price == 0.0:
@@ -606,19 +614,9 @@ def select_activities(agent_state: AgentState, user_interests: List[str], max_ac
     
     # Always add free activities first (they don't cost anything)
     for place, place_price in free_places[:max_activities]:
-        activity = ActivitySelection(
-            name=place["name"],
-            tags=place.get("tags", []),
-            rating=place.get("rating", 4.0),
-            price=0.0,  # Explicitly set to 0.0 for free activities
-            lat=place["lat"],
-            lng=place["lng"],
-            place_id=place.get("place_id"),
-            link=place.get("link"),
-            address=place.get("address")
-        )
+        activity = _activity_from_place(place, 0.0)  # Explicitly 0.0 for free activities
         final_activities.append(activity)
-        logger.info(f"✓ Added FREE activity: '{place['name']}' (price: $0.00/person)")
+        logger.info("✓ Added FREE activity: '%s' (price: $0.00/person)", place['name'])
     
     # Then add paid activities that fit within budget
     for place, place_price in paid_places:
@@ -629,40 +627,21 @@ def select_activities(agent_state: AgentState, user_interests: List[str], max_ac
         
         # Check if we can afford this activity
         if total_activity_cost + place_cost <= activity_budget:
-            activity = ActivitySelection(
-                name=place["name"],
-                tags=place.get("tags", []),
-                rating=place.get("rating", 4.0),
-                price=float(place_price),
-                lat=place["lat"],
-                lng=place["lng"],
-                place_id=place.get("place_id"),
-                link=place.get("link"),
-                address=place.get("address")
-            )
+            activity = _activity_from_place(place, float(place_price))
             final_activities.append(activity)
             total_activity_cost += place_cost
-            logger.info(f"✓ Added PAID activity: '{place['name']}' - Price: ${place_price:.2f}/person, Cost: ${place_cost:.2f} total (${total_activity_cost:.2f} cumulative)")
+            logger.info("✓ Added PAID activity: '%s' - Price: $%.2f/person, Cost: $%.2f total ($%.2f cumulative)", place['name'], place_price, place_cost, total_activity_cost)
         else:
-            logger.debug(f"⊘ Skipped paid activity '{place['name']}' - would exceed budget (${total_activity_cost + place_cost:.2f} > ${activity_budget:.2f})")
+            logger.debug("⊘ Skipped paid activity '%s' - would exceed budget ($%.2f > $%.2f)", place['name'], total_activity_cost + place_cost, activity_budget)
     
     # If we still don't have enough activities and budget allows, add more free activities
     if len(final_activities) < max_activities and len(free_places) > len([a for a in final_activities if a.price == 0.0]):
-        remaining_free = [p for p in free_places if p[0]["name"] not in [a.name for a in final_activities]]
-        for place, place_price in remaining_free[:max_activities - len(final_activities)]:
-            activity = ActivitySelection(
-                name=place["name"],
-                tags=place.get("tags", []),
-                rating=place.get("rating", 4.0),
-                price=0.0,
-                lat=place["lat"],
-                lng=place["lng"],
-                place_id=place.get("place_id"),
-                link=place.get("link"),
-                address=place.get("address")
-            )
+        chosen_names = frozenset(a.name for a in final_activities)
+        remaining_free = (p for p in free_places if p[0]["name"] not in chosen_names)
+        for place, place_price in islice(remaining_free, max_activities - len(final_activities)):
+            activity = _activity_from_place(place, 0.0)
             final_activities.append(activity)
-            logger.info(f"✓ Added additional FREE activity: '{place['name']}'")
+            logger.info("✓ Added additional FREE activity: '%s'", place['name'])
     
     # Update agent state
     agent_state.selections.activities = final_activities
@@ -675,7 +654,8 @@ def select_activities(agent_state: AgentState, user_interests: List[str], max_ac
     else:
         selection_notes = f"Selected {len(final_activities)} activities for ${total_activity_cost:.2f} total"
         if multi_interest_places:
-            multi_count = len([p for p in final_activities if p.name in [mp['name'] for mp in multi_interest_places]])
+            multi_interest_names = frozenset(mp['name'] for mp in multi_interest_places)
+            multi_count = sum(1 for a in final_activities if a.name in multi_interest_names)
             if multi_count > 0:
                 selection_notes += f" (including {multi_count} multi-interest matches)"
     
@@ -693,6 +673,21 @@ def select_activities(agent_state: AgentState, user_interests: List[str], max_ac
     return agent_state
 
 
+def _activity_from_place(place: Dict[str, Any], price: float) -> ActivitySelection:
+    """Build an ActivitySelection from a place search result at the given per-person price."""
+    return ActivitySelection(
+        name=place["name"],
+        tags=place.get("tags", []),
+        rating=place.get("rating", 4.0),
+        price=price,
+        lat=place["lat"],
+        lng=place["lng"],
+        place_id=place.get("place_id"),
+        link=place.get("link"),
+        address=place.get("address")
+    )
+
+
 def validate_selections(agent_state: AgentState) -> List[str]:
     """Validate that all required selections have been made."""
     issues = []
@@ -5,18 +5,36 @@ Test your NVIDIA Nemotron API key step by step.
 import requests
 import json
 import os
+import re
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
+# Shared HTTP session so repeated NVIDIA API calls reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    # Connection errors only: urllib3 never retries a POST on status, and a repeated
+    # generation call would be billed again
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+
+# One pass over the key: "nvapi-" prefix is valid, "your_" prefix or "placeholder" anywhere is not
+_KEY_RE = re.compile(r'^(?P<nvapi>nvapi-)|^your_|placeholder', re.IGNORECASE)
+_ENV_KEY_LINE_RE = re.compile(r'^LLM_API_KEY=.*$', re.MULTILINE)
+
 def test_api_key_format(api_key):
     """Check if API key has correct format."""
     if not api_key:
         print("❌ No API key provided")
         return False
     
-    if api_key.startswith('nvapi-'):
+    match = _KEY_RE.search(api_key)
+    if match and match.group('nvapi'):
         print(f"✅ API key format looks correct: {api_key[:15]}...")
         return True
-    elif api_key.startswith('your_') or 'placeholder' in api_key.lower():
+    elif match:
         print(f"❌ API key is still placeholder: {api_key}")
         return False
     else:
@@ -44,7 +62,7 @@ def test_nvidia_api(api_key, model="nvidia/nemotron-nano-9b-v2"):
     
     try:
         print(f"🚀 Testing API call to {model}...")
-        response = requests.post(
+        response = _SESSION.post(
             f"{api_base}/chat/completions",
             headers=headers,
             json=payload,
@@ -151,16 +169,15 @@ def main():
                             with open(env_path, 'r') as f:
                                 content = f.read()
                             
-                            # Replace API key line
-                            lines = content.split('\n')
-                            for i, line in enumerate(lines):
-                                if line.startswith('LLM_API_KEY='):
-                                    lines[i] = f'LLM_API_KEY={manual_key}'
-                                    break
+                            # Replace API key line (or append it if missing)
+                            key_line = f'LLM_API_KEY={manual_key}'
+                            new_content, replaced = _ENV_KEY_LINE_RE.subn(lambda _: key_line, content, count=1)
+                            if not replaced:
+                                new_content = content.rstrip() + f'\n{key_line}\n'
                             
                             # Write back
                             with open(env_path, 'w') as f:
-                                f.write('\n'.join(lines))
+                                f.write(new_content)
                             
                             print("✅ API key saved to .env file!")
                             
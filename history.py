@@ -6,6 +6,8 @@ import json
 import logging
 from typing import Dict, Any, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -14,6 +16,58 @@ logger = logging.getLogger(__name__)
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
 USE_MOCKS = os.getenv("USE_MOCKS", "false").lower() == "true"
 
+# Shared HTTP session so repeated Gemini calls reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    # Connection errors only: urllib3 never retries a POST on status, and a repeated
+    # generation call would be billed again
+    max_retries=Retry(total=3, backoff_factor=0.3)
+))
+
+_HEADERS = {
+    "Content-Type": "application/json"
+}
+
+# Static Gemini request settings; generate_city_history only fills in "contents" per call
+_BASE_PAYLOAD = {
+    "generationConfig": {
+        "temperature": 0.7,
+        "topK": 40,
+        "topP": 0.95,
+        "maxOutputTokens": 500,
+        "stopSequences": []
+    },
+    "safetySettings": [
+        {
+            "category": "HARM_CATEGORY_HARASSMENT",
+            "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+        },
+        {
+            "category": "HARM_CATEGORY_HATE_SPEECH",
+            "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+        },
+        {
+            "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
+            "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+        },
+        {
+            "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
+            "threshold": "BLOCK_MEDIUM_AND_ABOVE"
+        }
+    ]
+}
+
+# Mock histories for common destinations, keyed by normalized city name
+_MOCK_HISTORIES = {
+    "austin": "Austin, Texas, was founded in 1839 and named after Stephen F. Austin, the 'Father of Texas'. Originally a small frontier settlement, it became the capital of the Republic of Texas in 1839 and later the state capital. Known for its music scene, Austin earned the nickname 'Live Music Capital of the World' and is home to major festivals like South by Southwest (SXSW) and Austin City Limits.",
+    "new york": "New York City, originally called New Amsterdam when founded by Dutch settlers in 1624, became New York when the English took control in 1664. It grew into America's largest city and a global financial and cultural center. The city's iconic landmarks like the Statue of Liberty, Empire State Building, and Central Park reflect its rich history as a gateway for immigrants and a hub of innovation.",
+    "los angeles": "Los Angeles was founded in 1781 by Spanish settlers and became part of Mexico before joining the United States in 1848. The discovery of oil in the 1890s and the arrival of the film industry in the early 20th century transformed LA into a global entertainment capital. Today, it's known for Hollywood, diverse neighborhoods, and its role as a cultural and economic powerhouse.",
+    "san francisco": "San Francisco, originally a Spanish mission settlement in 1776, boomed during the California Gold Rush of 1849, growing from a small village to a major city. The 1906 earthquake and fire destroyed much of the city, but it was quickly rebuilt. Known for the Golden Gate Bridge, Alcatraz Island, and its progressive culture, San Francisco remains a center of innovation and diversity.",
+    "chicago": "Chicago was incorporated as a city in 1837 and quickly grew into a major transportation hub thanks to its location on Lake Michigan and central position in America. The Great Chicago Fire of 1871 destroyed much of the city, but it was rebuilt with innovative architecture, including the world's first skyscrapers. Today, Chicago is known for its architecture, deep-dish pizza, blues music, and vibrant neighborhoods."
+}
+
 
 def generate_city_history(destination: str, max_length: int = 500) -> Dict[str, Any]:
     """
@@ -30,8 +84,8 @@ def generate_city_history(destination: str, max_length: int = 500) -> Dict[str,
         return _get_mock_history(destination)
     
     try:
-        # Gemini API endpoint
-        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:generateContent?key={GEMINI_API_KEY}"
+        # Gemini streaming endpoint (server-sent events) so we can stop reading once we have enough text
+        url = f"https://generativelanguage.googleapis.com/v1beta/models/gemini-pro:streamGenerateContent?alt=sse&key={GEMINI_API_KEY}"
         
         # Create prompt for city history
         prompt = f"""Write a brief, engaging history of {destination} in approximately {max_length} characters or less. 
@@ -44,72 +98,53 @@ Focus on:
 
 Keep it concise, informative, and travel-friendly. Write in a friendly, accessible tone."""
         
-        headers = {
-            "Content-Type": "application/json"
-        }
-        
-        payload = {
-            "contents": [{
-                "parts": [{
-                    "text": prompt
-                }]
-            }],
-            "generationConfig": {
-                "temperature": 0.7,
-                "topK": 40,
-                "topP": 0.95,
-                "maxOutputTokens": 500,
-                "stopSequences": []
-            },
-            "safetySettings": [
-                {
-                    "category": "HARM_CATEGORY_HARASSMENT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    "category": "HARM_CATEGORY_HATE_SPEECH",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                },
-                {
-                    "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-                    "threshold": "BLOCK_MEDIUM_AND_ABOVE"
-                }
-            ]
-        }
+        payload = _BASE_PAYLOAD.copy()
+        payload["contents"] = [{"parts": [{"text": prompt}]}]
         
-        response = requests.post(url, headers=headers, json=payload, timeout=30)
+        response = _SESSION.post(url, headers=_HEADERS, json=payload, stream=True, timeout=30)
         
         if response.status_code == 200:
-            data = response.json()
+            chunks = []
+            received = 0
             
-            # Extract text from Gemini response
-            if "candidates" in data and len(data["candidates"]) > 0:
-                candidate = data["candidates"][0]
-                if "content" in candidate and "parts" in candidate["content"]:
-                    parts = candidate["content"]["parts"]
-                    if len(parts) > 0 and "text" in parts[0]:
-                        history_text = parts[0]["text"].strip()
-                        
-                        # Truncate if too long
-                        if len(history_text) > max_length:
-                            history_text = history_text[:max_length].rsplit('.', 1)[0] + '.'
-                        
-                        logger.info(f"Generated history for {destination} ({len(history_text)} characters)")
+            try:
+                for raw_line in response.iter_lines():
+                    line = raw_line.decode("utf-8")
+                    if not line.startswith("data:"):
+                        continue
+                    
+                    chunk_text = _extract_candidate_text(json.loads(line[5:]))
+                    if chunk_text:
+                        chunks.append(chunk_text)
+                        received += len(chunk_text)
                         
-                        return {
-                            "status": "success",
-                            "destination": destination,
-                            "history": history_text,
-                            "source": "gemini_api",
-                            "length": len(history_text)
-                        }
+                        # Enough text to truncate at max_length - stop reading the rest of the stream
+                        if received >= max_length + 64:
+                            break
+            finally:
+                response.close()
+            
+            history_text = "".join(chunks).strip()
+            
+            if history_text:
+                # Truncate if too long
+                if len(history_text) > max_length:
+                    truncated = history_text[:max_length]
+                    head, sep, _ = truncated.rpartition('.')
+                    history_text = (head + '.') if sep else truncated
+                
+                logger.info(f"Generated history for {destination} ({len(history_text)} characters)")
+                
+                return {
+                    "status": "success",
+                    "destination": destination,
+                    "history": history_text,
+                    "source": "gemini_api",
+                    "length": len(history_text)
+                }
             
-            # If response structure is unexpected, log and return fallback
-            logger.warning(f"Unexpected Gemini API response structure: {data}")
+            # If the stream carried no text, log and return fallback
+            logger.warning(f"Gemini API stream returned no history text for {destination}")
             return _get_mock_history(destination)
         
         else:
@@ -122,30 +157,50 @@ Keep it concise, informative, and travel-friendly. Write in a friendly, accessib
         return _get_mock_history(destination)
 
 
-def _get_mock_history(destination: str) -> Dict[str, Any]:
-    """Generate mock city history for testing or when API is unavailable."""
+def _extract_candidate_text(data: Dict[str, Any]) -> str:
+    """Extract the text of the first candidate from a Gemini response chunk."""
+    candidates = data.get("candidates") or []
+    if not candidates:
+        return ""
     
-    # Mock histories for common destinations
-    mock_histories = {
-        "austin": "Austin, Texas, was founded in 1839 and named after Stephen F. Austin, the 'Father of Texas'. Originally a small frontier settlement, it became the capital of the Republic of Texas in 1839 and later the state capital. Known for its music scene, Austin earned the nickname 'Live Music Capital of the World' and is home to major festivals like South by Southwest (SXSW) and Austin City Limits.",
-        "new york": "New York City, originally called New Amsterdam when founded by Dutch settlers in 1624, became New York when the English took control in 1664. It grew into America's largest city and a global financial and cultural center. The city's iconic landmarks like the Statue of Liberty, Empire State Building, and Central Park reflect its rich history as a gateway for immigrants and a hub of innovation.",
-        "los angeles": "Los Angeles was founded in 1781 by Spanish settlers and became part of Mexico before joining the United States in 1848. The discovery of oil in the 1890s and the arrival of the film industry in the early 20th century transformed LA into a global entertainment capital. Today, it's known for Hollywood, diverse neighborhoods, and its role as a cultural and economic powerhouse.",
-        "san francisco": "San Francisco, originally a Spanish mission settlement in 1776, boomed during the California Gold Rush of 1849, growing from a small village to a major city. The 1906 earthquake and fire destroyed much of the city, but it was quickly rebuilt. Known for the Golden Gate Bridge, Alcatraz Island, and its progressive culture, San Francisco remains a center of innovation and diversity.",
-        "chicago": "Chicago was incorporated as a city in 1837 and quickly grew into a major transportation hub thanks to its location on Lake Michigan and central position in America. The Great Chicago Fire of 1871 destroyed much of the city, but it was rebuilt with innovative architecture, including the world's first skyscrapers. Today, Chicago is known for its architecture, deep-dish pizza, blues music, and vibrant neighborhoods."
-    }
+    parts = candidates[0].get("content", {}).get("parts") or []
+    if parts and "text" in parts[0]:
+        return parts[0]["text"]
+    
+    return ""
+
+
+def _find_mock_history(destination_lower: str) -> Optional[str]:
+    """Look up a mock history by exact city name, then the city part of "City, State", then a city-name prefix."""
+    history = _MOCK_HISTORIES.get(destination_lower)
+    if history:
+        return history
+    
+    city_part = destination_lower.split(",")[0].strip()
+    history = _MOCK_HISTORIES.get(city_part)
+    if history:
+        return history
     
-    destination_lower = destination.lower()
+    # e.g. "new york city" -> "new york"
+    for city_key, history in _MOCK_HISTORIES.items():
+        if city_part.startswith(city_key):
+            return history
     
-    # Try to find a matching mock history
-    for city_key, history in mock_histories.items():
-        if city_key in destination_lower or destination_lower in city_key:
-            return {
-                "status": "success",
-                "destination": destination,
-                "history": history,
-                "source": "mock",
-                "length": len(history)
-            }
+    return None
+
+
+def _get_mock_history(destination: str) -> Dict[str, Any]:
+    """Generate mock city history for testing or when API is unavailable."""
+    
+    history = _find_mock_history(destination.lower().strip())
+    if history:
+        return {
+            "status": "success",
+            "destination": destination,
+            "history": history,
+            "source": "mock",
+            "length": len(history)
+        }
     
     # Generic fallback history
     generic_history = f"{destination} is a vibrant city with a rich history and cultural heritage. The city has grown from its early beginnings to become an important destination known for its unique character, landmarks, and contributions to culture and commerce."
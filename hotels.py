@@ -3,17 +3,66 @@ Hotel search tool using Google Maps Places API.
 No mock data fallback - requires valid API key.
 """
 import os
+import heapq
 import logging
+from bisect import bisect_right
 from datetime import date
 from typing import Dict, Any, List, Optional
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
+from .maps import calculate_distance_batch
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", "")
 
+# Shared HTTP session so repeated Places calls reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    # Places text search is a POST but only reads, so it is as safe to retry as the Details GET
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504],
+                      allowed_methods=Retry.DEFAULT_ALLOWED_METHODS | {"POST"}, raise_on_status=False)
+))
+
+# Base nightly price indexed by Google Places price_level (0-4)
+_PRICE_LEVEL_BASE = (
+    50.0,   # 0: Budget hotels
+    80.0,   # 1: Inexpensive
+    120.0,  # 2: Moderate
+    180.0,  # 3: Expensive
+    250.0,  # 4: Very expensive/luxury
+)
+_DEFAULT_BASE_PRICE = 100.0
+
+# Places API (New) reports price level as an enum string
+_PRICE_LEVEL_ENUM = {
+    "PRICE_LEVEL_FREE": 0,
+    "PRICE_LEVEL_INEXPENSIVE": 1,
+    "PRICE_LEVEL_MODERATE": 2,
+    "PRICE_LEVEL_EXPENSIVE": 3,
+    "PRICE_LEVEL_VERY_EXPENSIVE": 4,
+}
+
+# Only request the fields we actually read to keep responses small
+_SEARCH_FIELD_MASK = "places.id,places.displayName,places.rating,places.priceLevel,places.location,places.formattedAddress,places.userRatingCount"
+_DETAILS_FIELD_MASK = "rating,priceLevel,googleMapsUri"
+
+# Score buckets for calculate_hotel_scores: bisect the value into the bounds, then index the scores
+_PRICE_SCORE_BOUNDS = (60, 100, 150)
+_PRICE_SCORES = (
+    0.6,  # < $60: very cheap might be low quality
+    1.0,  # < $100: sweet spot
+    0.8,  # < $150: moderate
+    0.6,  # expensive
+)
+_LOCATION_SCORE_BOUNDS = (2, 5, 10)  # miles from center
+_LOCATION_SCORES = (1.0, 0.8, 0.6, 0.4)
+
 
 def search(city: str, start_date: date, end_date: date, max_price: float, near: Optional[str] = None, limit: int = 10) -> List[Dict[str, Any]]:
     """
@@ -49,34 +98,30 @@ def _search_hotels_via_places_api(city: str, start_date: date, end_date: date, m
         nights = 1
     
     try:
-        # Use Google Places API text search for hotels
-        base_url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-        params = {
-            "query": f"hotels in {city}",
-            "key": GOOGLE_MAPS_API_KEY,
-            "type": "lodging"  # Filter for lodging/hotels
+        # Use Places API (New) text search, requesting only the fields we read
+        base_url = "https://places.googleapis.com/v1/places:searchText"
+        headers = {
+            "X-Goog-Api-Key": GOOGLE_MAPS_API_KEY,
+            "X-Goog-FieldMask": _SEARCH_FIELD_MASK
+        }
+        body = {
+            "textQuery": f"hotels in {city}",
+            "includedType": "lodging"  # Filter for lodging/hotels
         }
         
-        response = requests.get(base_url, params=params, timeout=10)
-        
-        if response.status_code != 200:
-            logger.error(f"Google Places API error: HTTP {response.status_code}")
-            return []
-        
-        data = response.json()
-        api_status = data.get("status", "")
+        response = _SESSION.post(base_url, headers=headers, json=body, timeout=10)
         
-        if api_status == "REQUEST_DENIED":
-            error_msg = data.get("error_message", "API access denied")
+        if response.status_code == 403:
+            error_msg = response.json().get("error", {}).get("message", "API access denied")
             logger.error(f"Google Places API denied: {error_msg}")
             logger.error("Please enable 'Places API' in Google Cloud Console and check your API key.")
             return []
         
-        if api_status != "OK":
-            logger.error(f"Google Places API returned status: {api_status}")
+        if response.status_code != 200:
+            logger.error(f"Google Places API error: HTTP {response.status_code}")
             return []
         
-        results = data.get("results", [])
+        results = response.json().get("places", [])
         
         if not results:
             logger.warning(f"No hotels found via API for {city}")
@@ -92,7 +137,7 @@ def _search_hotels_via_places_api(city: str, start_date: date, end_date: date, m
                 continue
             
             # Estimate price per night from price_level (0-4 scale)
-            price_level = result.get("price_level")
+            price_level = _PRICE_LEVEL_ENUM.get(result.get("priceLevel"))
             price_per_night = _estimate_hotel_price_from_level(price_level, rating)
             
             # Filter by max_price (budget-friendly)
@@ -102,39 +147,34 @@ def _search_hotels_via_places_api(city: str, start_date: date, end_date: date, m
             total_price = price_per_night * nights
             
             # Get location
-            geometry = result.get("geometry", {})
-            location = geometry.get("location", {})
+            location = result.get("location", {})
             if not location:
                 continue
             
+            place_id = result.get("id", "")
             hotel = {
-                "name": result.get("name", ""),
+                "name": result.get("displayName", {}).get("text", ""),
                 "price_per_night": price_per_night,
                 "total_price": total_price,
                 "rating": rating,
-                "lat": location.get("lat"),
-                "lng": location.get("lng"),
-                "place_id": result.get("place_id", ""),
-                "link": f"https://www.google.com/maps/place/?q=place_id:{result.get('place_id', '')}",
-                "address": result.get("formatted_address", ""),
+                "lat": location.get("latitude"),
+                "lng": location.get("longitude"),
+                "place_id": place_id,
+                "link": f"https://www.google.com/maps/place/?q=place_id:{place_id}",
+                "address": result.get("formattedAddress", ""),
                 "nights": nights,
-                "user_ratings_total": result.get("user_ratings_total", 0),
+                "user_ratings_total": result.get("userRatingCount", 0),
                 "price_level": price_level
             }
             hotels.append(hotel)
         
-        # Sort by rating (highest first) to get top-rated hotels
-        hotels.sort(key=lambda x: (x["rating"], -x["price_per_night"]), reverse=True)
-        
-        # Filter by budget
-        budget_friendly_hotels = [h for h in hotels if h["price_per_night"] <= max_price]
-        
-        if not budget_friendly_hotels:
+        # Hotels over max_price were already skipped above, so everything left is within budget
+        if not hotels:
             logger.warning(f"No budget-friendly hotels found within ${max_price}/night for {city}")
             return []
         
-        # Get top 1 hotel (highest rated within budget)
-        top_hotel = budget_friendly_hotels[0]
+        # Get top 1 hotel (highest rated, cheapest on ties) without sorting the whole list
+        top_hotel = heapq.nlargest(1, hotels, key=lambda x: (x["rating"], -x["price_per_night"]))[0]
         
         # Enhance pricing using Place Details API for the top hotel
         enhanced_hotel = _enhance_hotel_pricing(top_hotel, nights, max_price)
@@ -155,26 +195,17 @@ def _estimate_hotel_price_from_level(price_level: int = None, rating: float = No
     Uses rating to refine price estimation for more accuracy.
     Price levels: 0=Free, 1=Inexpensive, 2=Moderate, 3=Expensive, 4=Very Expensive
     """
-    # Base price map
-    base_price_map = {
-        0: 50.0,   # Budget hotels
-        1: 80.0,   # Inexpensive
-        2: 120.0,  # Moderate
-        3: 180.0,  # Expensive
-        4: 250.0   # Very expensive/luxury
-    }
-    
-    if price_level is None:
-        base_price = 100.0  # Default moderate price
+    if price_level is not None and 0 <= price_level < len(_PRICE_LEVEL_BASE):
+        base_price = _PRICE_LEVEL_BASE[price_level]
     else:
-        base_price = base_price_map.get(price_level, 100.0)
+        base_price = _DEFAULT_BASE_PRICE  # Default moderate price
     
     # Adjust price based on rating (higher rating = slightly higher price)
     if rating is not None:
         # Rating adjustment: ±20% based on rating
         # 5.0 rating = +20%, 3.0 rating = -20%, 4.0 rating = no change
-        rating_factor = 1.0 + ((rating - 4.0) * 0.1)  # 0.1 = 10% per rating point
-        base_price = base_price * rating_factor
+        # 1.0 + (rating - 4.0) * 0.1 folded into a single multiply-add (10% per rating point)
+        base_price = base_price * (0.1 * rating + 0.6)
     
     return round(base_price, 2)
 
@@ -189,23 +220,20 @@ def _enhance_hotel_pricing(hotel: Dict[str, Any], nights: int, max_price: float)
         return hotel
     
     try:
-        # Use Place Details API to get more information
-        details_url = "https://maps.googleapis.com/maps/api/place/details/json"
-        params = {
-            "place_id": place_id,
-            "key": GOOGLE_MAPS_API_KEY,
-            "fields": "name,rating,price_level,user_ratings_total,formatted_address,geometry,url"
+        # Use Place Details (New) to get more information, limited by field mask
+        details_url = f"https://places.googleapis.com/v1/places/{place_id}"
+        headers = {
+            "X-Goog-Api-Key": GOOGLE_MAPS_API_KEY,
+            "X-Goog-FieldMask": _DETAILS_FIELD_MASK
         }
         
-        response = requests.get(details_url, params=params, timeout=10)
+        response = _SESSION.get(details_url, headers=headers, timeout=10)
         
         if response.status_code == 200:
-            data = response.json()
-            if data.get("status") == "OK":
-                result = data.get("result", {})
-                
+            result = response.json()
+            if result:
                 # Update price level if available from details
-                details_price_level = result.get("price_level")
+                details_price_level = _PRICE_LEVEL_ENUM.get(result.get("priceLevel"))
                 if details_price_level is not None:
                     hotel["price_level"] = details_price_level
                 
@@ -229,8 +257,8 @@ def _enhance_hotel_pricing(hotel: Dict[str, Any], nights: int, max_price: float)
                 hotel["total_price"] = round(refined_price * nights, 2)
                 
                 # Update other fields if available
-                if result.get("url"):
-                    hotel["link"] = result.get("url")
+                if result.get("googleMapsUri"):
+                    hotel["link"] = result.get("googleMapsUri")
                 
                 logger.info(f"Enhanced pricing for {hotel['name']}: ${hotel['price_per_night']:.2f}/night (refined from Place Details)")
         
@@ -264,36 +292,35 @@ def find_plan_b_hotels(city: str, start_date: date, end_date: date, original_max
 
 def calculate_hotel_score(hotel: Dict[str, Any], interests: List[str], center_lat: float = None, center_lng: float = None) -> float:
     """Calculate a score for hotel selection based on rating, price, and location."""
-    
-    # Base score from rating (0-5 scale, normalize to 0-1)
-    rating_score = hotel.get("rating", 4.0) / 5.0
-    
-    # Price score (inverse - cheaper is better, but not too cheap)
-    price = hotel.get("price_per_night", 100)
-    if price < 60:
-        price_score = 0.6  # Very cheap might be low quality
-    elif price < 100:
-        price_score = 1.0  # Sweet spot
-    elif price < 150:
-        price_score = 0.8  # Moderate
-    else:
-        price_score = 0.6  # Expensive
-    
-    # Location score (if center point provided)
-    location_score = 0.5  # Default neutral
+    return calculate_hotel_scores([hotel], interests, center_lat, center_lng)[0]
+
+
+def calculate_hotel_scores(hotels: List[Dict[str, Any]], interests: List[str], center_lat: float = None, center_lng: float = None) -> List[float]:
+    """
+    Score a whole list of candidate hotels in one pass.
+    Same weighting as calculate_hotel_score; scores are returned in input order.
+    """
+    distances = None
     if center_lat and center_lng:
-        from .maps import calculate_distance
-        distance = calculate_distance(center_lat, center_lng, hotel["lat"], hotel["lng"])
-        if distance < 2:
-            location_score = 1.0
-        elif distance < 5:
-            location_score = 0.8
-        elif distance < 10:
-            location_score = 0.6
-        else:
-            location_score = 0.4
+        distances = calculate_distance_batch(center_lat, center_lng,
+                                             [h["lat"] for h in hotels], [h["lng"] for h in hotels])
+    scores = []
     
-    # Weighted final score
-    final_score = (rating_score * 0.4 + price_score * 0.4 + location_score * 0.2)
+    for i, hotel in enumerate(hotels):
+        # Base score from rating (0-5 scale, normalize to 0-1)
+        rating_score = hotel.get("rating", 4.0) / 5.0
+        
+        # Price score (inverse - cheaper is better, but not too cheap)
+        price = hotel.get("price_per_night", 100)
+        price_score = _PRICE_SCORES[bisect_right(_PRICE_SCORE_BOUNDS, price)]
+        
+        # Location score (if center point provided)
+        location_score = 0.5  # Default neutral
+        if distances is not None:
+            location_score = _LOCATION_SCORES[bisect_right(_LOCATION_SCORE_BOUNDS, distances[i])]
+        
+        # Weighted final score
+        final_score = (rating_score * 0.4 + price_score * 0.4 + location_score * 0.2)
+        scores.append(round(final_score, 2))
     
-    return round(final_score, 2)
+    return scores
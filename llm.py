@@ -2,17 +2,73 @@
 Nemotron LLM client with OpenAI-compatible API support and fallbacks.
 """
 import os
+import re
+import asyncio
 import json
+import zlib
+import hashlib
 import logging
-from typing import Dict, Any, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, Iterator, List, Optional, Tuple
+import orjson
 import requests
+from cachetools import LRUCache, TTLCache
+from requests.adapters import HTTPAdapter
 from dotenv import load_dotenv
+from .cache import disk_cache
+from .reliability import LLM_BULKHEAD, LatencyTracker, circuit_breaker, is_upstream_failure, retry_request
 
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Process-wide HTTP session so repeated completions reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=20, max_retries=0))
+
+# zlib level for cached responses (fast, still ~3-5x smaller on JSON)
+_CACHE_COMPRESS_LEVEL = 3
+
+# Circuit breaker key for the Nemotron backend
+_BREAKER_KEY = "nemotron"
+
+_JSON_SYSTEM_TEMPLATE = """You are a helpful assistant that always responds with valid JSON.
+
+Please respond with valid JSON matching this exact schema:
+{schema}
+
+Return ONLY the JSON object, no other text or markdown formatting."""
+
+# Markdown code fence around a JSON reply (closing fence optional for truncated replies)
+_FENCE_RE = re.compile(r'^\s*```(?:json)?\s*(.*?)\s*(?:```)?\s*$', re.DOTALL)
+
+# JSON schema type -> factory for its empty value (called per use so arrays/objects are never shared)
+_SCHEMA_TYPE_DEFAULTS = {
+    "string": str,
+    "number": float,
+    "integer": int,
+    "boolean": bool,
+    "array": list,
+    "object": dict,
+}
+
+# Per-schema-object memo; entries hold a reference to the schema so its id can't be reused while cached
+_SCHEMA_MEMO = LRUCache(maxsize=64)
+_SCHEMA_MEMO_LOCK = threading.Lock()
+
+# Planner prompt fields read by the fallbacks, extracted in a single pass
+_FIELDS_RE = re.compile(r'(Origin|Destination|Interests|Total Budget):\s*([^\n]+)')
+_AMOUNT_RE = re.compile(r'\$?([\d.]+)')
+# Canonical planner template (see planner.create_plan)
+_PLAN_SENTINEL = re.compile(r'Origin:.*\n.*Destination:.*\n(?:.*\n)*?.*Total Budget:')
+
+
+class LLMUnavailableError(Exception):
+    """A live completion failed and the caller asked for no fallback (fallback=False)."""
+
 
 class NemotronClient:
     """OpenAI-compatible client for Nemotron with robust fallbacks."""
@@ -23,24 +79,49 @@ class NemotronClient:
         self.model = os.getenv("LLM_MODEL", "nvidia/nemotron-4-340b-reward")
         self.provider = os.getenv("LLM_PROVIDER", "openai_compatible")
         self.use_mocks = os.getenv("USE_MOCKS", "false").lower() == "true"
+        self.plan_fast_path = os.getenv("PLANNER_FAST_PATH", "false").lower() == "true"
         
         # Check if we have valid API configuration
         self.has_api_config = bool(self.api_base and self.api_key)
         
+        # Request constants, computed once instead of per call
+        self._headers = {
+            "Authorization": f"Bearer {self.api_key}",
+            "Content-Type": "application/json"
+        }
+        # Handle both endpoint formats
+        if self.api_base.endswith(('/chats/complete', '/chat/completions')):
+            self._endpoint = self.api_base
+        else:
+            self._endpoint = f"{self.api_base.rstrip('/')}/chat/completions"
+        # Timeouts adapt to observed latency: 30s until warmed up, then 3x p95 within 10-60s.
+        # One tracker per call class and max_tokens (see _latency_for), so quick short completions
+        # can't train the timeout down below what a long JSON plan needs
+        self._latency: Dict[Tuple[str, int], LatencyTracker] = {}
+        self._latency_lock = threading.Lock()
+        
+        # Response caches for repeated identical requests (LRU, entries expire after an hour)
+        self._text_cache = TTLCache(maxsize=1024, ttl=3600)
+        self._json_cache = TTLCache(maxsize=1024, ttl=3600)
+        self._cache_lock = threading.Lock()
+        
         if not self.has_api_config:
             logger.info("No LLM API configuration found, using fallback responses")
     
-    def get_completion(self, prompt: str, max_tokens: int = 1000) -> str:
-        """Get a text completion from Nemotron or fallback."""
+    def get_completion(self, prompt: str, max_tokens: int = 1000, fallback: bool = True) -> str:
+        """
+        Get a text completion from Nemotron or fallback.
+        With fallback=False a failed live call raises LLMUnavailableError instead.
+        """
         if self.use_mocks or not self.has_api_config:
             return self._get_fallback_completion(prompt)
         
+        cache_key = self._cache_key(prompt, 0.7, max_tokens)
+        cached = self._cache_get(self._text_cache, cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
-            }
-            
             payload = {
                 "model": self.model,
                 "messages": [
@@ -50,111 +131,290 @@ class NemotronClient:
                 "temperature": 0.7
             }
             
-            # Handle both endpoint formats
-            if self.api_base.endswith('/chats/complete') or self.api_base.endswith('/chat/completions'):
-                endpoint = self.api_base
-            else:
-                endpoint = f"{self.api_base.rstrip('/')}/chat/completions"
-            
-            response = requests.post(
-                endpoint,
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
+            response = self._post_chat(payload)
+            if response is None:
+                logger.warning("Nemotron circuit open, using fallback response")
+                return self._text_fallback(prompt, fallback, "circuit open")
             
             if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"]
+                result = orjson.loads(response.content)
+                content = result["choices"][0]["message"]["content"]
+                self._cache_set(self._text_cache, cache_key, content)
+                return content
             else:
                 logger.error(f"API error: {response.status_code} - {response.text}")
-                return self._get_fallback_completion(prompt)
+                return self._text_fallback(prompt, fallback, f"status {response.status_code}")
                 
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"LLM API call failed: {e}")
-            return self._get_fallback_completion(prompt)
+            return self._text_fallback(prompt, fallback, str(e))
     
-    def get_json_completion(self, prompt: str, schema: Dict[str, Any], max_tokens: int = 2000) -> Dict[str, Any]:
-        """Get structured JSON output from Nemotron with schema validation."""
+    def _text_fallback(self, prompt: str, fallback: bool, reason: str) -> str:
+        if not fallback:
+            raise LLMUnavailableError(reason)
+        return self._get_fallback_completion(prompt)
+    
+    def stream_completion(self, prompt: str, max_tokens: int = 1000, fallback: bool = True) -> Iterator[str]:
+        """
+        Stream a text completion, yielding content chunks as the model generates them.
+        Cached and fallback responses arrive as a single chunk; a stream that fails before
+        producing any text yields the fallback, one that fails midway ends early (uncached).
+        With fallback=False any failure, including one midway, raises LLMUnavailableError instead.
+        """
         if self.use_mocks or not self.has_api_config:
-            return self._get_fallback_json(prompt, schema)
+            yield self._get_fallback_completion(prompt)
+            return
         
-        # Add JSON schema instructions to prompt
-        schema_prompt = f"""
-{prompt}
-
-Please respond with valid JSON matching this exact schema:
-{json.dumps(schema, indent=2)}
-
-Return ONLY the JSON object, no other text or markdown formatting.
-"""
+        cache_key = self._cache_key(prompt, 0.7, max_tokens)
+        cached = self._cache_get(self._text_cache, cache_key)
+        if cached is not None:
+            yield cached
+            return
         
+        received = []
         try:
-            headers = {
-                "Authorization": f"Bearer {self.api_key}",
-                "Content-Type": "application/json"
+            payload = {
+                "model": self.model,
+                "messages": [
+                    {"role": "user", "content": prompt}
+                ],
+                "max_tokens": max_tokens,
+                "temperature": 0.7,
+                "stream": True
             }
             
+            response = self._post_chat(payload, stream=True)
+            if response is None:
+                logger.warning("Nemotron circuit open, using fallback response")
+                yield self._text_fallback(prompt, fallback, "circuit open")
+                return
+            
+            with response:
+                if response.status_code != 200:
+                    logger.error(f"API error: {response.status_code} - {response.text}")
+                    yield self._text_fallback(prompt, fallback, f"status {response.status_code}")
+                    return
+                
+                # Server-sent events: "data: {chunk json}" lines, terminated by "data: [DONE]"
+                for line in response.iter_lines():
+                    if not line.startswith(b"data:"):
+                        continue
+                    data = line[5:].strip()
+                    if data == b"[DONE]":
+                        break
+                    content = orjson.loads(data)["choices"][0].get("delta", {}).get("content")
+                    if content:
+                        received.append(content)
+                        yield content
+                        
+        except LLMUnavailableError:
+            raise
+        except Exception as e:
+            logger.error(f"LLM streaming call failed: {e}")
+            if not fallback:
+                raise LLMUnavailableError(str(e)) from e
+            if not received:
+                yield self._get_fallback_completion(prompt)
+            return
+        
+        if received:
+            self._cache_set(self._text_cache, cache_key, "".join(received))
+        else:
+            yield self._text_fallback(prompt, fallback, "empty stream")
+    
+    def get_json_completion(self, prompt: str, schema: Dict[str, Any], max_tokens: int = 2000,
+                            fallback: bool = True) -> Dict[str, Any]:
+        """
+        Get structured JSON output from Nemotron with schema validation.
+        With fallback=False a failed live call raises LLMUnavailableError instead of returning the
+        fallback JSON, so callers can tell model output apart (e.g. to avoid caching a fallback).
+        """
+        if self.use_mocks or not self.has_api_config:
+            return self._get_fallback_json(prompt, schema)
+        
+        # Templated planner prompts are fully answered by the deterministic plan; skip the round trip when enabled
+        if self.plan_fast_path and "steps" in schema.get("properties", {}) and _PLAN_SENTINEL.search(prompt):
+            logger.info("cag_hit: planner prompt served by deterministic plan")
+            return self._get_fallback_json(prompt, schema)
+        
+        # Cache the JSON text, not the dict, so callers that mutate the result can't alter cached entries
+        cache_key = self._cache_key(prompt, 0.3, max_tokens, schema)
+        cached = self._cache_get(self._json_cache, cache_key)
+        if cached is not None:
+            return orjson.loads(cached)
+        
+        # Static instructions + canonical schema go first so the message prefix is byte-identical
+        # across calls with the same schema (provider prefix caching); the dynamic prompt goes last
+        system_prompt = _JSON_SYSTEM_TEMPLATE.format(schema=_schema_memo(schema)[0])
+        
+        try:
             payload = {
                 "model": self.model,
                 "messages": [
-                    {"role": "system", "content": "You are a helpful assistant that always responds with valid JSON."},
-                    {"role": "user", "content": schema_prompt}
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": prompt}
                 ],
                 "max_tokens": max_tokens,
                 "temperature": 0.3
             }
             
-            # Handle both endpoint formats
-            if self.api_base.endswith('/chats/complete') or self.api_base.endswith('/chat/completions'):
-                endpoint = self.api_base
-            else:
-                endpoint = f"{self.api_base.rstrip('/')}/chat/completions"
-            
-            response = requests.post(
-                endpoint,
-                headers=headers,
-                json=payload,
-                timeout=30
-            )
+            response = self._post_chat(payload, kind="json")
+            if response is None:
+                logger.warning("Nemotron circuit open, using fallback response")
+                return self._json_fallback(prompt, schema, fallback, "circuit open")
             
             if response.status_code == 200:
-                result = response.json()
+                result = orjson.loads(response.content)
                 content = result["choices"][0]["message"]["content"]
                 
                 # Try to parse JSON from response
                 try:
                     # Clean the response (remove markdown formatting if present)
-                    content = content.strip()
-                    if content.startswith("```json"):
-                        content = content[7:]
-                    if content.endswith("```"):
-                        content = content[:-3]
-                    content = content.strip()
+                    fenced = _FENCE_RE.match(content)
+                    content = fenced.group(1) if fenced else content.strip()
                     
-                    return json.loads(content)
+                    parsed = orjson.loads(content)
+                    self._cache_set(self._json_cache, cache_key, content)
+                    return parsed
                 except json.JSONDecodeError as e:
                     logger.error(f"Failed to parse JSON response: {e}")
                     logger.error(f"Raw response: {content}")
-                    return self._get_fallback_json(prompt, schema)
+                    return self._json_fallback(prompt, schema, fallback, "unparseable JSON")
             else:
                 logger.error(f"API error: {response.status_code} - {response.text}")
-                return self._get_fallback_json(prompt, schema)
+                return self._json_fallback(prompt, schema, fallback, f"status {response.status_code}")
                 
+        except LLMUnavailableError:
+            raise
         except Exception as e:
             logger.error(f"LLM JSON API call failed: {e}")
-            return self._get_fallback_json(prompt, schema)
+            return self._json_fallback(prompt, schema, fallback, str(e))
+    
+    def _json_fallback(self, prompt: str, schema: Dict[str, Any], fallback: bool, reason: str) -> Dict[str, Any]:
+        if not fallback:
+            raise LLMUnavailableError(reason)
+        return self._get_fallback_json(prompt, schema)
+    
+    def _post_chat(self, payload: Dict[str, Any], stream: bool = False, kind: str = "text") -> Optional[requests.Response]:
+        """
+        POST a chat completion, retrying transient failures, through the circuit breaker.
+        kind ("text" or "json") picks the latency tracker along with max_tokens; streams use their own.
+        Returns None while the breaker is open.
+        """
+        if circuit_breaker.is_open(_BREAKER_KEY):
+            return None
+        
+        body = orjson.dumps(payload)
+        latency = self._latency_for("stream" if stream else kind, payload["max_tokens"])
+        try:
+            response = retry_request(lambda: self._send(body, latency, stream))
+        except Exception:
+            # Any exception counts, so a half-open probe always reports back
+            circuit_breaker.record_failure(_BREAKER_KEY)
+            raise
+        
+        if is_upstream_failure(response.status_code):
+            circuit_breaker.record_failure(_BREAKER_KEY)
+        else:
+            circuit_breaker.record_success(_BREAKER_KEY)
+        return response
+    
+    def _latency_for(self, kind: str, max_tokens: int) -> LatencyTracker:
+        """Latency tracker for one class of call, created on first use."""
+        key = (kind, max_tokens)
+        with self._latency_lock:
+            latency = self._latency.get(key)
+            if latency is None:
+                latency = self._latency[key] = LatencyTracker(default_timeout=30, min_timeout=10, max_timeout=60)
+        return latency
+    
+    def _send(self, body: bytes, latency: LatencyTracker, stream: bool = False) -> requests.Response:
+        """
+        Single POST attempt, holding an LLM bulkhead slot only while the request is in flight.
+        Streamed responses release the slot once headers arrive and don't feed the latency tracker.
+        """
+        with LLM_BULKHEAD:
+            started = time.monotonic()
+            response = _SESSION.post(self._endpoint, headers=self._headers, data=body,
+                                     timeout=latency.timeout(), stream=stream)
+        if response.status_code == 200 and not stream:
+            latency.observe(time.monotonic() - started)
+        return response
+    
+    def get_completions(self, prompts: List[str], max_tokens: int = 1000, concurrency: int = 8,
+                        fallback: bool = True) -> List[Optional[str]]:
+        """
+        Get text completions for several prompts concurrently.
+        Results are returned in prompt order; each prompt falls back independently on failure
+        (with fallback=False a failed prompt's entry is None instead).
+        """
+        def complete(prompt: str) -> Optional[str]:
+            try:
+                return self.get_completion(prompt, max_tokens, fallback)
+            except LLMUnavailableError:
+                return None
+        
+        if len(prompts) <= 1 or self.use_mocks or not self.has_api_config:
+            return [complete(prompt) for prompt in prompts]
+        
+        with ThreadPoolExecutor(max_workers=min(concurrency, len(prompts))) as pool:
+            return list(pool.map(complete, prompts))
+    
+    async def aget_completion(self, prompt: str, max_tokens: int = 1000) -> str:
+        """
+        Async variant of get_completion for use from event-loop code (e.g. async web handlers).
+        The blocking HTTP call runs in a worker thread; never call get_completion directly from a coroutine.
+        """
+        return await asyncio.to_thread(self.get_completion, prompt, max_tokens)
+    
+    async def aget_json_completion(self, prompt: str, schema: Dict[str, Any], max_tokens: int = 2000) -> Dict[str, Any]:
+        """Async variant of get_json_completion; see aget_completion."""
+        return await asyncio.to_thread(self.get_json_completion, prompt, schema, max_tokens)
+    
+    def _cache_key(self, prompt: str, temperature: float, max_tokens: int, schema: Optional[Dict[str, Any]] = None) -> str:
+        """SHA-256 of the request parameters that determine the response."""
+        key_data = {
+            "prompt": prompt,
+            "model": self.model,
+            "temperature": temperature,
+            "max_tokens": max_tokens,
+            "schema": _schema_memo(schema)[0] if schema is not None else None
+        }
+        return hashlib.sha256(orjson.dumps(key_data, option=orjson.OPT_SORT_KEYS)).hexdigest()
+    
+    def _cache_get(self, cache: TTLCache, key: str) -> Optional[str]:
+        """Look in the in-memory cache, then the shared disk cache (promoting disk hits into memory)."""
+        with self._cache_lock:
+            blob = cache.get(key)
+        if blob is None:
+            blob = disk_cache.get(key)
+            if blob is None:
+                return None
+            with self._cache_lock:
+                cache[key] = blob
+        
+        try:
+            return zlib.decompress(blob).decode("utf-8")
+        except zlib.error:
+            # Entry written before responses were compressed; treat as a miss
+            return None
+    
+    def _cache_set(self, cache: TTLCache, key: str, value: str) -> None:
+        # Responses are repetitive text/JSON, so both cache layers hold them zlib-compressed
+        blob = zlib.compress(value.encode("utf-8"), _CACHE_COMPRESS_LEVEL)
+        with self._cache_lock:
+            cache[key] = blob
+        disk_cache.set(key, blob, cache.ttl)
     
     def _get_fallback_completion(self, prompt: str) -> str:
         """Deterministic fallback for text completions."""
         if "planning" in prompt.lower() or "itinerary" in prompt.lower():
             # Extract origin and destination from prompt
-            import re
-            origin_match = re.search(r'Origin:\s*([^\n]+)', prompt)
-            destination_match = re.search(r'Destination:\s*([^\n]+)', prompt)
-            
-            origin = origin_match.group(1).strip() if origin_match else "your origin"
-            destination = destination_match.group(1).strip() if destination_match else "your destination"
+            fields = _extract_prompt_fields(prompt)
+            origin = fields.get("Origin", "your origin")
+            destination = fields.get("Destination", "your destination")
             
             return f"""Based on your request for a trip from {origin} to {destination}, I recommend:
 
@@ -179,15 +439,11 @@ This plan maximizes your interests while staying within budget."""
         # Planning response fallback - extract values from prompt
         if "steps" in schema.get("properties", {}):
             # Extract origin, destination, and interests from prompt
-            import re
-            origin_match = re.search(r'Origin:\s*([^\n]+)', prompt)
-            destination_match = re.search(r'Destination:\s*([^\n]+)', prompt)
-            interests_match = re.search(r'Interests:\s*([^\n]+)', prompt)
-            budget_match = re.search(r'Total Budget:\s*\$?([\d.]+)', prompt)
-            
-            origin = origin_match.group(1).strip() if origin_match else "Unknown"
-            destination = destination_match.group(1).strip() if destination_match else "Unknown"
-            interests_str = interests_match.group(1).strip() if interests_match else "None specified"
+            fields = _extract_prompt_fields(prompt)
+            origin = fields.get("Origin", "Unknown")
+            destination = fields.get("Destination", "Unknown")
+            interests_str = fields.get("Interests", "None specified")
+            budget_match = _AMOUNT_RE.match(fields.get("Total Budget", ""))
             budget = float(budget_match.group(1)) if budget_match else 800.0
             
             # Parse interests
@@ -262,37 +518,74 @@ This plan maximizes your interests while staying within budget."""
     
     def _generate_schema_defaults(self, schema: Dict[str, Any]) -> Dict[str, Any]:
         """Generate default values based on JSON schema."""
-        result = {}
-        properties = schema.get("properties", {})
-        
-        for key, prop in properties.items():
-            prop_type = prop.get("type", "string")
-            
-            if prop_type == "string":
-                result[key] = prop.get("default", "")
-            elif prop_type == "number":
-                result[key] = prop.get("default", 0.0)
-            elif prop_type == "integer":
-                result[key] = prop.get("default", 0)
-            elif prop_type == "boolean":
-                result[key] = prop.get("default", False)
-            elif prop_type == "array":
-                result[key] = prop.get("default", [])
-            elif prop_type == "object":
-                result[key] = prop.get("default", {})
-        
-        return result
+        return {key: factory() if factory else default for key, default, factory in _schema_memo(schema)[1]}
+
+
+def _schema_memo(schema: Dict[str, Any]) -> Tuple[str, List[Tuple[str, Any, Optional[Callable[[], Any]]]]]:
+    """
+    Canonical JSON and default-value plan for a schema, memoized per schema object.
+    The plan holds (key, explicit default, factory) so defaults are still built fresh per call.
+    Schemas are treated as immutable once passed to the client.
+    """
+    with _SCHEMA_MEMO_LOCK:
+        entry = _SCHEMA_MEMO.get(id(schema))
+    if entry is not None and entry[0] is schema:
+        return entry[1]
+    
+    plan = []
+    for key, prop in schema.get("properties", {}).items():
+        prop_type = prop.get("type", "string")
+        if prop_type not in _SCHEMA_TYPE_DEFAULTS:
+            continue
+        if "default" in prop:
+            plan.append((key, prop["default"], None))
+        else:
+            plan.append((key, None, _SCHEMA_TYPE_DEFAULTS[prop_type]))
+    
+    memo = (json.dumps(schema, sort_keys=True, separators=(",", ":")), plan)
+    with _SCHEMA_MEMO_LOCK:
+        _SCHEMA_MEMO[id(schema)] = (schema, memo)
+    return memo
+
+
+def _extract_prompt_fields(prompt: str) -> Dict[str, str]:
+    """Extract Origin/Destination/Interests/Total Budget values from a planning prompt (first occurrence wins)."""
+    fields = {}
+    for match in _FIELDS_RE.finditer(prompt):
+        fields.setdefault(match.group(1), match.group(2).strip())
+    return fields
 
 
 # Global client instance
 llm_client = NemotronClient()
 
 
-def get_completion(prompt: str, max_tokens: int = 1000) -> str:
+def get_completion(prompt: str, max_tokens: int = 1000, fallback: bool = True) -> str:
     """Get text completion from Nemotron."""
-    return llm_client.get_completion(prompt, max_tokens)
+    return llm_client.get_completion(prompt, max_tokens, fallback)
 
 
-def get_json_completion(prompt: str, schema: Dict[str, Any], max_tokens: int = 2000) -> Dict[str, Any]:
+def stream_completion(prompt: str, max_tokens: int = 1000, fallback: bool = True) -> Iterator[str]:
+    """Stream text completion chunks from Nemotron as they are generated."""
+    return llm_client.stream_completion(prompt, max_tokens, fallback)
+
+
+def get_json_completion(prompt: str, schema: Dict[str, Any], max_tokens: int = 2000,
+                        fallback: bool = True) -> Dict[str, Any]:
     """Get structured JSON completion from Nemotron."""
-    return llm_client.get_json_completion(prompt, schema, max_tokens)
+    return llm_client.get_json_completion(prompt, schema, max_tokens, fallback)
+
+
+def get_completions(prompts: List[str], max_tokens: int = 1000, fallback: bool = True) -> List[Optional[str]]:
+    """Get text completions for several prompts concurrently from Nemotron."""
+    return llm_client.get_completions(prompts, max_tokens, fallback=fallback)
+
+
+async def aget_completion(prompt: str, max_tokens: int = 1000) -> str:
+    """Get text completion from Nemotron without blocking the event loop."""
+    return await llm_client.aget_completion(prompt, max_tokens)
+
+
+async def aget_json_completion(prompt: str, schema: Dict[str, Any], max_tokens: int = 2000) -> Dict[str, Any]:
+    """Get structured JSON completion from Nemotron without blocking the event loop."""
+    return await llm_client.aget_json_completion(prompt, schema, max_tokens)
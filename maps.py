@@ -4,9 +4,19 @@ Maps and directions tool with mock support.
 import os
 import json
 import logging
-from typing import Dict, Any, Optional, Tuple
+import threading
+import time
+from math import asin, cos, inf, pi, sin, sqrt
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+import orjson
 import requests
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
+from agent.cache import disk_cache
+from agent.reliability import MAPS_BULKHEAD, LatencyTracker, circuit_breaker, is_upstream_failure
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -14,6 +24,80 @@ logger = logging.getLogger(__name__)
 USE_MOCKS = os.getenv("USE_MOCKS", "false").lower() == "true"
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", "")
 
+# Mock route table: sorted (city, city) pair -> (duration_minutes, distance_miles, gas_estimate)
+_MOCK_ROUTES = {
+    ("austin", "dallas"): (195, 195.0, 27.30),       # 3 hours 15 minutes
+    ("austin", "houston"): (165, 165.0, 23.10),      # 2 hours 45 minutes
+    ("austin", "san antonio"): (80, 80.0, 11.20),    # 1 hour 20 minutes
+}
+_MOCK_ROUTE_CITIES = ("san antonio", "austin", "dallas", "houston")
+
+# Circuit breaker key for Google Maps web services
+_BREAKER_KEY = "googleapis"
+
+# Timeout adapts to observed latency: 10s until warmed up, then 3x p95 within 2-10s
+_LATENCY = LatencyTracker(default_timeout=10, min_timeout=2, max_timeout=10)
+
+# Radius of Earth in miles
+_EARTH_RADIUS_MILES = 3956
+# Same factor math.radians multiplies by
+_DEG_TO_RAD = pi / 180.0
+
+# Common city coordinates, keyed by lowercase city name (see _table_city)
+_CITY_COORDS = {
+    "austin": (30.2672, -97.7431),
+    "dallas": (32.7767, -96.7970),
+    "houston": (29.7604, -95.3698),
+    "san antonio": (29.4241, -98.4936),
+    "new york": (40.7128, -74.0060),
+    "los angeles": (34.0522, -118.2437),
+    "chicago": (41.8781, -87.6298),
+    "miami": (25.7617, -80.1918),
+    "seattle": (47.6062, -122.3321),
+    "denver": (39.7392, -104.9903),
+    "phoenix": (33.4484, -112.0740),
+}
+
+# State of each table city as (postal code, full name): "Austin, MN" must not match Austin, TX
+_CITY_STATES = {
+    "austin": ("tx", "texas"),
+    "dallas": ("tx", "texas"),
+    "houston": ("tx", "texas"),
+    "san antonio": ("tx", "texas"),
+    "new york": ("ny", "new york"),
+    "los angeles": ("ca", "california"),
+    "chicago": ("il", "illinois"),
+    "miami": ("fl", "florida"),
+    "seattle": ("wa", "washington"),
+    "denver": ("co", "colorado"),
+    "phoenix": ("az", "arizona"),
+}
+
+# Column views of _CITY_COORDS for batch distance queries
+_CITY_NAMES = tuple(_CITY_COORDS)
+_CITY_LATS = tuple(lat for lat, _ in _CITY_COORDS.values())
+_CITY_LNGS = tuple(lng for _, lng in _CITY_COORDS.values())
+
+_US_STATE_CODES = frozenset({
+    "al", "ak", "az", "ar", "ca", "co", "ct", "de", "dc", "fl", "ga", "hi", "id", "il", "in", "ia",
+    "ks", "ky", "la", "me", "md", "ma", "mi", "mn", "ms", "mo", "mt", "ne", "nv", "nh", "nj", "nm",
+    "ny", "nc", "nd", "oh", "ok", "or", "pa", "ri", "sc", "sd", "tn", "tx", "ut", "vt", "va", "wa",
+    "wv", "wi", "wy",
+})
+
+# Shared HTTP session so repeated Directions/Geocoding calls reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=10,
+    pool_maxsize=20,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+))
+
+# Successful API results, keyed by normalized inputs; errors are never cached
+_DIRECTIONS_CACHE = TTLCache(maxsize=512, ttl=6 * 3600)
+_GEOCODE_CACHE = TTLCache(maxsize=1024, ttl=24 * 3600)
+_CACHE_LOCK = threading.Lock()
+
 
 def find_directions(origin: str, destination: str) -> Dict[str, Any]:
     """
@@ -35,6 +119,11 @@ def find_directions(origin: str, destination: str) -> Dict[str, Any]:
             "gas_estimate": 0
         }
     
+    cache_key = (_normalize_location(origin), _normalize_location(destination))
+    cached = _cache_get(_DIRECTIONS_CACHE, cache_key, f"maps:directions:{cache_key[0]}|{cache_key[1]}")
+    if cached is not None:
+        return dict(cached)
+    
     try:
         # Google Maps Directions API call
         base_url = "https://maps.googleapis.com/maps/api/directions/json"
@@ -45,10 +134,19 @@ def find_directions(origin: str, destination: str) -> Dict[str, Any]:
             "units": "imperial"
         }
         
-        response = requests.get(base_url, params=params, timeout=10)
+        response = _get_maps(base_url, params)
+        if response is None:
+            logger.warning("Google Maps circuit open, skipping directions request")
+            return {
+                "status": "error",
+                "error": "Google Maps temporarily unavailable",
+                "duration_minutes": 0,
+                "distance_miles": 0,
+                "gas_estimate": 0
+            }
         
         if response.status_code == 200:
-            data = response.json()
+            data = orjson.loads(response.content)
             
             if data["status"] == "OK" and data["routes"]:
                 route = data["routes"][0]
@@ -60,13 +158,15 @@ def find_directions(origin: str, destination: str) -> Dict[str, Any]:
                 # Simple gas estimate: $3.50/gallon, 25 mpg average
                 gas_estimate = (distance_miles / 25.0) * 3.50
                 
-                return {
+                result = {
                     "duration_minutes": duration_minutes,
                     "distance_miles": round(distance_miles, 1),
                     "gas_estimate": round(gas_estimate, 2),
                     "polyline": route.get("overview_polyline", {}).get("points", ""),
                     "status": "success"
                 }
+                _cache_set(_DIRECTIONS_CACHE, cache_key, f"maps:directions:{cache_key[0]}|{cache_key[1]}", result)
+                return dict(result)
         
         logger.error(f"Google Maps API error: {response.status_code}")
         # Return error status instead of mock data
@@ -90,79 +190,103 @@ def find_directions(origin: str, destination: str) -> Dict[str, Any]:
         }
 
 
-def _get_mock_directions(origin: str, destination: str) -> Dict[str, Any]:
-    """Mock directions data for common routes."""
-    
-    # Normalize locations for matching
-    origin_lower = origin.lower()
-    destination_lower = destination.lower()
+def _get_maps(url: str, params: Dict[str, Any]) -> Optional[requests.Response]:
+    """GET a Google Maps endpoint through the circuit breaker; returns None while it is open."""
+    if circuit_breaker.is_open(_BREAKER_KEY):
+        return None
     
-    # Dallas to Austin (most common case)
-    if ("dallas" in origin_lower and "austin" in destination_lower) or \
-       ("austin" in origin_lower and "dallas" in destination_lower):
-        return {
-            "duration_minutes": 195,  # 3 hours 15 minutes
-            "distance_miles": 195.0,
-            "gas_estimate": 27.30,  # ~$27 for gas
-            "polyline": "mock_polyline_data",
-            "status": "success"
-        }
+    try:
+        with MAPS_BULKHEAD:
+            started = time.monotonic()
+            response = _SESSION.get(url, params=params, timeout=_LATENCY.timeout())
+        if response.status_code == 200:
+            _LATENCY.observe(time.monotonic() - started)
+    except Exception:
+        # Any exception counts, so a half-open probe always reports back
+        circuit_breaker.record_failure(_BREAKER_KEY)
+        raise
     
-    # Houston to Austin
-    elif ("houston" in origin_lower and "austin" in destination_lower) or \
-         ("austin" in origin_lower and "houston" in destination_lower):
-        return {
-            "duration_minutes": 165,  # 2 hours 45 minutes
-            "distance_miles": 165.0,
-            "gas_estimate": 23.10,
-            "polyline": "mock_polyline_data",
-            "status": "success"
-        }
+    if is_upstream_failure(response.status_code):
+        circuit_breaker.record_failure(_BREAKER_KEY)
+    else:
+        circuit_breaker.record_success(_BREAKER_KEY)
+    return response
+
+
+def find_directions_many(routes: List[Tuple[str, str]], concurrency: int = 8) -> List[Dict[str, Any]]:
+    """
+    Find directions for several (origin, destination) pairs concurrently.
+    Results are returned in input order, each in the same format as find_directions.
+    """
+    if len(routes) <= 1:
+        return [find_directions(origin, destination) for origin, destination in routes]
     
-    # San Antonio to Austin
-    elif ("san antonio" in origin_lower and "austin" in destination_lower) or \
-         ("austin" in origin_lower and "san antonio" in destination_lower):
-        return {
-            "duration_minutes": 80,  # 1 hour 20 minutes
-            "distance_miles": 80.0,
-            "gas_estimate": 11.20,
-            "polyline": "mock_polyline_data",
-            "status": "success"
-        }
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(routes))) as pool:
+        return list(pool.map(lambda route: find_directions(*route), routes))
+
+
+def _get_mock_directions(origin: str, destination: str) -> Dict[str, Any]:
+    """Mock directions data for common routes."""
+    key = tuple(sorted((_extract_mock_city(origin) or "", _extract_mock_city(destination) or "")))
+    # Default estimate for any other route (2 hours)
+    duration, distance, gas = _MOCK_ROUTES.get(key, (120, 120.0, 16.80))
     
-    # Default estimate for any other route
-    else:
-        # Rough estimate based on typical distances
-        return {
-            "duration_minutes": 120,  # 2 hours default
-            "distance_miles": 120.0,
-            "gas_estimate": 16.80,
-            "polyline": "mock_polyline_data",
-            "status": "success"
-        }
+    return {
+        "duration_minutes": duration,
+        "distance_miles": distance,
+        "gas_estimate": gas,
+        "polyline": "mock_polyline_data",
+        "status": "success"
+    }
+
+
+def _extract_mock_city(location: str) -> Optional[str]:
+    """Return the first known mock-route city mentioned in a location string."""
+    location_lower = location.lower()
+    for city in _MOCK_ROUTE_CITIES:
+        if city in location_lower:
+            return city
+    return None
 
 
 def calculate_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
     """Calculate distance between two points in miles using Haversine formula."""
-    import math
-    
-    # Convert latitude and longitude from degrees to radians
-    lat1_rad = math.radians(lat1)
-    lon1_rad = math.radians(lon1)
-    lat2_rad = math.radians(lat2)
-    lon2_rad = math.radians(lon2)
-    
-    # Haversine formula
-    dlat = lat2_rad - lat1_rad
-    dlon = lon2_rad - lon1_rad
+    return calculate_distance_batch(lat1, lon1, (lat2,), (lon2,))[0]
+
+
+def calculate_distance_batch(lat1: float, lon1: float, lats: Sequence[float], lons: Sequence[float],
+                             max_miles: Optional[float] = None) -> List[float]:
+    """
+    Haversine distances in miles from one origin to many points.
+    The origin's radians/cosine are computed once instead of per pair.
+    With max_miles, points whose latitude difference alone exceeds it are reported as inf
+    without any trig (the great-circle distance is at least the latitude arc).
+    """
+    lat1_rad = lat1 * _DEG_TO_RAD
+    lon1_rad = lon1 * _DEG_TO_RAD
+    cos_lat1 = cos(lat1_rad)
+    # Small slack so rounding never prunes a point that lies exactly on the boundary
+    max_dlat = max_miles / _EARTH_RADIUS_MILES + 1e-12 if max_miles is not None else inf
     
-    a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-    c = 2 * math.asin(math.sqrt(a))
+    # Tight loop: constants and math functions bound to locals, degree conversion as a
+    # plain multiplication (bit-for-bit what radians() computes)
+    deg_to_rad = _DEG_TO_RAD
+    diameter = 2 * _EARTH_RADIUS_MILES
+    _sin, _cos, _asin, _sqrt = sin, cos, asin, sqrt
     
-    # Radius of Earth in miles
-    r = 3956
+    distances = []
+    append = distances.append
+    for lat2, lon2 in zip(lats, lons):
+        lat2_rad = lat2 * deg_to_rad
+        dlat = lat2_rad - lat1_rad
+        if abs(dlat) > max_dlat:
+            append(inf)
+            continue
+        dlon = lon2 * deg_to_rad - lon1_rad
+        a = _sin(dlat * 0.5) ** 2 + cos_lat1 * _cos(lat2_rad) * _sin(dlon * 0.5) ** 2
+        append(diameter * _asin(_sqrt(a)))
     
-    return c * r
+    return distances
 
 
 def estimate_travel_time(distance_miles: float) -> int:
@@ -179,36 +303,18 @@ def geocode_city(city_name: str) -> Tuple[float, float]:
     Returns:
         tuple: (latitude, longitude) or (30.2672, -97.7431) as default (Austin)
     """
-    # Common city coordinates lookup
-    city_coordinates = {
-        "austin": (30.2672, -97.7431),
-        "austin, tx": (30.2672, -97.7431),
-        "dallas": (32.7767, -96.7970),
-        "dallas, tx": (32.7767, -96.7970),
-        "houston": (29.7604, -95.3698),
-        "houston, tx": (29.7604, -95.3698),
-        "san antonio": (29.4241, -98.4936),
-        "san antonio, tx": (29.4241, -98.4936),
-        "new york": (40.7128, -74.0060),
-        "new york, ny": (40.7128, -74.0060),
-        "los angeles": (34.0522, -118.2437),
-        "los angeles, ca": (34.0522, -118.2437),
-        "chicago": (41.8781, -87.6298),
-        "chicago, il": (41.8781, -87.6298),
-        "miami": (25.7617, -80.1918),
-        "miami, fl": (25.7617, -80.1918),
-        "seattle": (47.6062, -122.3321),
-        "seattle, wa": (47.6062, -122.3321),
-        "denver": (39.7392, -104.9903),
-        "denver, co": (39.7392, -104.9903),
-        "phoenix": (33.4484, -112.0740),
-        "phoenix, az": (33.4484, -112.0740),
-    }
+    # Try lookup table first (only when the state, if given, is the table city's own)
+    city_key = _table_city(city_name)
+    if city_key:
+        return _CITY_COORDS[city_key]
     
-    # Try lookup table first
-    city_lower = city_name.lower().strip()
-    if city_lower in city_coordinates:
-        return city_coordinates[city_lower]
+    # API results are keyed on the full location: "Portland, OR" and "Portland, ME" share a
+    # city name but not coordinates ("v2" skips older entries that were keyed on the city alone)
+    location_key = _normalize_location(city_name)
+    disk_key = f"maps:geocode:v2:{location_key}"
+    coords = _cache_get(_GEOCODE_CACHE, location_key, disk_key)
+    if coords:
+        return tuple(coords)
     
     # Try Google Geocoding API if available
     if not USE_MOCKS and GOOGLE_MAPS_API_KEY:
@@ -219,25 +325,78 @@ def geocode_city(city_name: str) -> Tuple[float, float]:
                 "key": GOOGLE_MAPS_API_KEY
             }
             
-            response = requests.get(base_url, params=params, timeout=10)
+            response = _get_maps(base_url, params)
             
-            if response.status_code == 200:
-                data = response.json()
+            if response is not None and response.status_code == 200:
+                data = orjson.loads(response.content)
                 if data.get("status") == "OK" and data.get("results"):
                     location = data["results"][0]["geometry"]["location"]
                     lat = location["lat"]
                     lng = location["lng"]
                     logger.info(f"Geocoded {city_name} to ({lat}, {lng})")
+                    _cache_set(_GEOCODE_CACHE, location_key, disk_key, (lat, lng))
                     return (lat, lng)
         except Exception as e:
             logger.warning(f"Geocoding API failed for {city_name}: {e}")
     
-    # Fallback: try to extract state and match
-    if "," in city_lower:
-        city_part = city_lower.split(",")[0].strip()
-        if city_part in city_coordinates:
-            return city_coordinates[city_part]
+    # Fallback: without the API, match the city part alone
+    if "," in city_name:
+        city_part = " ".join(city_name.lower().split(",")[0].split())
+        if city_part in _CITY_COORDS:
+            return _CITY_COORDS[city_part]
     
     # Default fallback (Austin coordinates)
     logger.warning(f"Could not geocode {city_name}, using default coordinates")
-    return (30.2672, -97.7431)
+    return _CITY_COORDS["austin"]
+
+
+def _cache_get(cache: TTLCache, key: Any, disk_key: str) -> Any:
+    """Look in the in-memory cache, then the shared disk cache (promoting disk hits into memory)."""
+    with _CACHE_LOCK:
+        value = cache.get(key)
+    if value is None:
+        raw = disk_cache.get(disk_key)
+        if raw is not None:
+            value = orjson.loads(raw)
+            with _CACHE_LOCK:
+                cache[key] = value
+    return value
+
+
+def _cache_set(cache: TTLCache, key: Any, disk_key: str, value: Any) -> None:
+    with _CACHE_LOCK:
+        cache[key] = value
+    disk_cache.set(disk_key, orjson.dumps(value), cache.ttl)
+
+
+def nearest_city(lat: float, lng: float) -> str:
+    """Snap a coordinate to the closest city in the built-in coordinate table."""
+    distances = calculate_distance_batch(lat, lng, _CITY_LATS, _CITY_LNGS)
+    return _CITY_NAMES[min(range(len(distances)), key=distances.__getitem__)]
+
+
+def _normalize_location(location: str) -> str:
+    """Case- and whitespace-insensitive key for a free-form origin/destination."""
+    return " ".join(location.lower().split())
+
+
+def _table_city(city_name: str) -> Optional[str]:
+    """
+    Key of city_name in the coordinate table, or None if it isn't a table city.
+    "Austin", "Austin, TX", "austin,tx", "Austin, Texas" and "Austin TX" all become "austin";
+    "Austin, MN" gives None so it goes to the Geocoding API.
+    """
+    location = city_name.lower()
+    if "," in location:
+        city, _, state = location.partition(",")
+    else:
+        city, state = location, ""
+        tokens = location.split()
+        if len(tokens) > 1 and tokens[-1] in _US_STATE_CODES:
+            city, state = " ".join(tokens[:-1]), tokens[-1]
+    
+    city = " ".join(city.split())
+    state = " ".join(state.split())
+    if city not in _CITY_COORDS or (state and state not in _CITY_STATES[city]):
+        return None
+    return city
@@ -2,14 +2,106 @@
 Music recommendation tool with LLM-powered location-based song suggestions for social media.
 """
 import os
+import copy
 import json
 import logging
 import re
-from typing import Dict, Any, List, Optional
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, Any, Iterable, List, Optional
+from cachetools import TTLCache
 from agent.llm import llm_client
 
 logger = logging.getLogger(__name__)
 
+# Parser patterns, compiled once for the per-line hot loop
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_NUM_PREFIX_RE = re.compile(r'^\d+[\.\)]\s*')
+# Field markers present anywhere in a parsed line (case-insensitive), one optional lookahead per field
+_LINE_MARKERS_RE = re.compile(
+    r'^(?:(?=.*?(?P<by> by )))?'
+    r'(?:(?=.*?(?P<title>song:|track:|title:|(?:10|[1-9])\.)))?'
+    r'(?:(?=.*?(?P<artist>artist:|by:)))?'
+    r'(?:(?=.*?(?P<genre>genre:)))?'
+    r'(?:(?=.*?(?P<mood>mood:|energy:|vibe:)))?',
+    re.IGNORECASE
+)
+# Song/artist separators in free text: first " by " (case-insensitive), " - " and " – " in one pass
+_SEPARATORS_RE = re.compile(
+    r'^(?:(?=.*?(?P<by> by )))?'
+    r'(?:(?=.*?(?P<dash> - )))?'
+    r'(?:(?=.*?(?P<en_dash> – )))?',
+    re.IGNORECASE
+)
+# Lowercase line prefixes stripped from title/artist lines (tuples so str.startswith can test them all in one call)
+_TITLE_PREFIXES = ("song:", "track:", "title:", "1.", "2.", "3.", "4.", "5.", "6.", "7.", "8.", "9.", "10.", "11.", "12.")
+_ARTIST_PREFIXES = ("artist:", "by:", "performed by:")
+# Bold/italic markers (*, **, _, __) are always dropped, so delete both characters in one pass
+_MARKDOWN_MARKERS = str.maketrans('', '', '*_')
+_NON_LETTERS_RE = re.compile(r'[^a-z]+')
+
+# Successful recommendation results keyed by normalized (destination, season, climate_zone, mood)
+_RESULT_CACHE = TTLCache(maxsize=512, ttl=24 * 3600)
+_RESULT_CACHE_LOCK = threading.Lock()
+
+# Name-cleaning word tables
+_LOWERCASE_WORDS = frozenset({'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'})
+_FEAT_MARKERS = frozenset({'ft', 'ft.', 'feat', 'feat.', 'featuring', 'featuring.'})
+_ABBREVIATIONS = frozenset({'dr', 'mr', 'ms', 'mrs', 'jr', 'sr'})
+_TRAILING_PUNCT = ',;:!?'
+_LEADING_PUNCT = '"\'('
+# Artist words the cleaner rewrites ("feat" -> "ft.", "and" -> "&", "x" -> "×", "dr" -> "Dr.")
+_ARTIST_REWRITE_WORDS = _FEAT_MARKERS | _ABBREVIATIONS | {'and', 'vs', 'x'}
+# Plain capitalized words separated by single spaces: names the cleaners would return unchanged
+_CLEAN_WORDS_RE = re.compile(r'[A-Z][a-z]*(?: [A-Za-z][a-z]*)*')
+# Text _strip_markdown can change beyond trimming its ends
+_MARKDOWN_CHARS = frozenset('*_<')
+# Character sets trimmed from the ends of parsed text (str.strip scans them in C from both ends)
+_MARKDOWN_TRIM_CHARS = '. -–—•'
+_NUMBERED_TITLE_TRIM_CHARS = _MARKDOWN_TRIM_CHARS + '0123456789)'
+_DASHED_TITLE_TRIM_CHARS = _MARKDOWN_TRIM_CHARS + '0123456789,;:!?()[]{}'
+_DASHED_ARTIST_TRIM_CHARS = '"\'.,;:!?()[]{}'
+
+# Location-based genre mapping
+_GENRE_MAP = {
+    # West Coast
+    "los angeles": ["Pop", "Hip-Hop", "R&B", "Rock", "Latin"],
+    "san francisco": ["Indie Rock", "Electronic", "Alternative", "Folk"],
+    "san diego": ["Surf Rock", "Pop", "Reggae", "Latin"],
+    "california": ["Pop", "Hip-Hop", "Rock", "Latin", "Electronic"],
+    
+    # East Coast
+    "new york": ["Hip-Hop", "Pop", "Jazz", "Rock", "Electronic"],
+    "boston": ["Rock", "Folk", "Indie", "Alternative"],
+    "philadelphia": ["Hip-Hop", "Soul", "Rock", "R&B"],
+    
+    # Southern
+    "austin": ["Country", "Rock", "Blues", "Indie", "Folk"],
+    "houston": ["Hip-Hop", "Country", "R&B", "Latin"],
+    "dallas": ["Country", "Hip-Hop", "Rock", "Pop"],
+    "atlanta": ["Hip-Hop", "R&B", "Trap", "Pop"],
+    "nashville": ["Country", "Folk", "Rock", "Bluegrass"],
+    "miami": ["Latin", "Reggaeton", "Hip-Hop", "Electronic", "Pop"],
+    "texas": ["Country", "Rock", "Blues", "Hip-Hop"],
+    "florida": ["Latin", "Pop", "Hip-Hop", "Electronic"],
+    
+    # Northern
+    "chicago": ["Blues", "Jazz", "Hip-Hop", "Rock", "House"],
+    "detroit": ["Motown", "Hip-Hop", "Techno", "Soul"],
+    "minneapolis": ["Pop", "Rock", "Indie", "Hip-Hop"],
+    
+    # Mountain/West
+    "denver": ["Rock", "Folk", "Country", "Indie"],
+    "seattle": ["Grunge", "Indie Rock", "Alternative", "Folk"],
+    "portland": ["Indie", "Folk", "Alternative", "Rock"],
+    
+    # Desert
+    "phoenix": ["Country", "Rock", "Latin", "Hip-Hop"],
+    "las vegas": ["Electronic", "Pop", "Hip-Hop", "Rock"],
+}
+_GENRE_PRIORITY = {location: i for i, location in enumerate(_GENRE_MAP)}
+_TWO_WORD_KEYS = frozenset(location for location in _GENRE_MAP if ' ' in location)
+
 
 def get_location_music_genres(destination: str) -> List[str]:
     """
@@ -19,48 +111,17 @@ def get_location_music_genres(destination: str) -> List[str]:
     """
     destination_lower = destination.lower()
     
-    # Location-based genre mapping
-    genre_map = {
-        # West Coast
-        "los angeles": ["Pop", "Hip-Hop", "R&B", "Rock", "Latin"],
-        "san francisco": ["Indie Rock", "Electronic", "Alternative", "Folk"],
-        "san diego": ["Surf Rock", "Pop", "Reggae", "Latin"],
-        "california": ["Pop", "Hip-Hop", "Rock", "Latin", "Electronic"],
-        
-        # East Coast
-        "new york": ["Hip-Hop", "Pop", "Jazz", "Rock", "Electronic"],
-        "boston": ["Rock", "Folk", "Indie", "Alternative"],
-        "philadelphia": ["Hip-Hop", "Soul", "Rock", "R&B"],
-        
-        # Southern
-        "austin": ["Country", "Rock", "Blues", "Indie", "Folk"],
-        "houston": ["Hip-Hop", "Country", "R&B", "Latin"],
-        "dallas": ["Country", "Hip-Hop", "Rock", "Pop"],
-        "atlanta": ["Hip-Hop", "R&B", "Trap", "Pop"],
-        "nashville": ["Country", "Folk", "Rock", "Bluegrass"],
-        "miami": ["Latin", "Reggaeton", "Hip-Hop", "Electronic", "Pop"],
-        "texas": ["Country", "Rock", "Blues", "Hip-Hop"],
-        "florida": ["Latin", "Pop", "Hip-Hop", "Electronic"],
-        
-        # Northern
-        "chicago": ["Blues", "Jazz", "Hip-Hop", "Rock", "House"],
-        "detroit": ["Motown", "Hip-Hop", "Techno", "Soul"],
-        "minneapolis": ["Pop", "Rock", "Indie", "Hip-Hop"],
-        
-        # Mountain/West
-        "denver": ["Rock", "Folk", "Country", "Indie"],
-        "seattle": ["Grunge", "Indie Rock", "Alternative", "Folk"],
-        "portland": ["Indie", "Folk", "Alternative", "Rock"],
-        
-        # Desert
-        "phoenix": ["Country", "Rock", "Latin", "Hip-Hop"],
-        "las vegas": ["Electronic", "Pop", "Hip-Hop", "Rock"],
-    }
+    # Probe whole-name, single-word and two-word tokens; the earliest table entry wins
+    genres = _GENRE_MAP.get(destination_lower.strip())
+    if genres:
+        return list(genres)
     
-    # Check for exact matches first
-    for location, genres in genre_map.items():
-        if location in destination_lower:
-            return genres
+    tokens = [token for token in _NON_LETTERS_RE.split(destination_lower) if token]
+    candidates = [token for token in tokens if token in _GENRE_MAP]
+    if len(tokens) > 1:
+        candidates.extend(pair for pair in map(" ".join, zip(tokens, tokens[1:])) if pair in _TWO_WORD_KEYS)
+    if candidates:
+        return list(_GENRE_MAP[min(candidates, key=_GENRE_PRIORITY.__getitem__)])
     
     # Default genres based on region keywords
     if any(keyword in destination_lower for keyword in ["california", "oregon", "washington"]):
@@ -94,16 +155,105 @@ def recommend_music(
     Returns:
         Dictionary with music recommendations including songs, artists, genres
     """
+    cache_key = _music_cache_key(destination, season, climate_zone, mood)
+    cached = _cached_result(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
         # Get location-based genres
         location_genres = get_location_music_genres(destination)
-        genres_str = ", ".join(location_genres)
+        prompt = _build_music_prompt(destination, season, climate_zone, mood, location_genres)
         
-        # Build enhanced prompt for music recommendations
-        season_context = f" during {season.title()} season" if season else ""
-        climate_context = f" The location has a {climate_zone.replace('_', ' ')} climate" if climate_zone else ""
+        # Stream the LLM completion and parse it once complete: markdown and HTML cleanup runs on the
+        # whole response and can span lines, so lines can't be parsed as they arrive.
+        # A failed stream raises instead of yielding stand-in text, so it never reaches the result cache
+        response = "".join(llm_client.stream_completion(prompt, max_tokens=2000, fallback=False))
         
-        prompt = f"""You are a music curator and social media expert. Recommend popular and trending songs perfect for social media posts (Instagram stories, TikTok, Reels) for a trip to {destination}{season_context}.{climate_context}
+        return _store_result(cache_key, _build_music_result(response, destination, season, mood, location_genres))
+        
+    except Exception as e:
+        logger.error(f"Failed to generate music recommendations: {e}")
+        return _get_fallback_music_recommendations(destination, location_genres, season)
+
+
+def recommend_music_batch(music_requests: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Generate music recommendations for several destinations, issuing the LLM calls concurrently.
+    
+    Args:
+        music_requests: One dict per destination with recommend_music's arguments
+            (destination, and optionally season, climate_zone, mood)
+    
+    Returns:
+        List of recommendation dictionaries in request order
+    """
+    results: List[Optional[Dict[str, Any]]] = [None] * len(music_requests)
+    jobs = []
+    for i, req in enumerate(music_requests):
+        destination = req["destination"]
+        season = req.get("season")
+        climate_zone = req.get("climate_zone")
+        mood = req.get("mood", "vibrant")
+        cache_key = _music_cache_key(destination, season, climate_zone, mood)
+        results[i] = _cached_result(cache_key)
+        if results[i] is None:
+            location_genres = get_location_music_genres(destination)
+            prompt = _build_music_prompt(destination, season, climate_zone, mood, location_genres)
+            jobs.append((i, cache_key, destination, season, mood, location_genres, prompt))
+    
+    if not jobs:
+        return results
+    
+    try:
+        # Failed prompts come back as None rather than stand-in text, so only real answers are cached
+        responses = llm_client.get_completions([job[6] for job in jobs], max_tokens=2000, fallback=False)
+    except Exception as e:
+        logger.error(f"Failed to generate batch music recommendations: {e}")
+        for i, _, destination, season, _, location_genres, _ in jobs:
+            results[i] = _get_fallback_music_recommendations(destination, location_genres, season)
+        return results
+    
+    for (i, cache_key, destination, season, mood, location_genres, _), response in zip(jobs, responses):
+        if response is None:
+            results[i] = _get_fallback_music_recommendations(destination, location_genres, season)
+            continue
+        try:
+            results[i] = _store_result(cache_key, _build_music_result(response, destination, season, mood, location_genres))
+        except Exception as e:
+            logger.error(f"Failed to parse music recommendations for {destination}: {e}")
+            results[i] = _get_fallback_music_recommendations(destination, location_genres, season)
+    return results
+
+
+def _music_cache_key(destination: str, season: Optional[str], climate_zone: Optional[str], mood: str) -> tuple:
+    return (destination.strip().lower(), (season or "").lower(), (climate_zone or "").lower(), mood.strip().lower())
+
+
+def _cached_result(cache_key: tuple) -> Optional[Dict[str, Any]]:
+    """Return a private copy of a cached recommendation result, or None."""
+    with _RESULT_CACHE_LOCK:
+        result = _RESULT_CACHE.get(cache_key)
+    return copy.deepcopy(result) if result is not None else None
+
+
+def _store_result(cache_key: tuple, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Cache a successful result; the caller keeps the original and the cache holds its own copy."""
+    with _RESULT_CACHE_LOCK:
+        _RESULT_CACHE[cache_key] = copy.deepcopy(result)
+    return result
+
+
+def _build_music_prompt(destination: str, season: Optional[str], climate_zone: Optional[str],
+                        mood: str, location_genres: List[str]) -> str:
+    """Build the LLM prompt for location-based music recommendations."""
+    genres_str = ", ".join(location_genres)
+    
+    # Build enhanced prompt for music recommendations
+    season_context = f" during {season.title()} season" if season else ""
+    climate_context = f" The location has a {climate_zone.replace('_', ' ')} climate" if climate_zone else ""
+    
+    return f"""You are a music curator and social media expert. Recommend popular and trending songs perfect for social media posts (Instagram stories, TikTok, Reels) for a trip to {destination}{season_context}.{climate_context}
 
 LOCATION CONTEXT:
 - Destination: {destination}
@@ -134,25 +284,21 @@ Provide 8-12 diverse song recommendations that capture the vibe of {destination}
 
 Format your response with clear song recommendations and details."""
 
-        # Get LLM completion
-        response = llm_client.get_completion(prompt, max_tokens=2000)
-        
-        # Parse response and create structured output
-        recommendations = _parse_music_response(response, destination, location_genres)
-        
-        return {
-            "status": "success",
-            "destination": destination,
-            "location_genres": location_genres,
-            "season": season,
-            "mood": mood,
-            "recommendations": recommendations,
-            "raw_llm_response": response
-        }
-        
-    except Exception as e:
-        logger.error(f"Failed to generate music recommendations: {e}")
-        return _get_fallback_music_recommendations(destination, location_genres, season)
+
+def _build_music_result(response: str, destination: str, season: Optional[str],
+                        mood: str, location_genres: List[str]) -> Dict[str, Any]:
+    """Parse an LLM response into the recommend_music result structure."""
+    recommendations = _parse_music_response(response, destination, location_genres)
+    
+    return {
+        "status": "success",
+        "destination": destination,
+        "location_genres": location_genres,
+        "season": season,
+        "mood": mood,
+        "recommendations": recommendations,
+        "raw_llm_response": response
+    }
 
 
 def _strip_markdown(text: str) -> str:
@@ -160,23 +306,53 @@ def _strip_markdown(text: str) -> str:
     if not text:
         return ""
     
+    # Plain text: only the trim applies
+    if _MARKDOWN_CHARS.isdisjoint(text):
+        return _trim_text(text)
+    
     # Remove markdown bold/italic (**, *, __, _)
-    text = text.replace('**', '').replace('__', '').replace('*', '').replace('_', '')
+    text = text.translate(_MARKDOWN_MARKERS)
     
     # Remove leading/trailing dots, dashes, and other markdown artifacts
-    text = text.strip('. -–—•')
+    text = text.strip(_MARKDOWN_TRIM_CHARS)
     
     # Remove HTML tags if any
-    text = re.sub(r'<[^>]+>', '', text)
+    text = _HTML_TAG_RE.sub('', text)
     
     return text.strip()
 
 
+def _trim_text(text: str) -> str:
+    """The part of _strip_markdown that still applies to text without '*', '_' or '<'."""
+    return text.strip(_MARKDOWN_TRIM_CHARS).strip()
+
+
+def _is_clean_song_name(name: str) -> bool:
+    """True if _clean_song_name would return name unchanged."""
+    if not _CLEAN_WORDS_RE.fullmatch(name):
+        return False
+    # After the first word, articles/prepositions must be lowercase and everything else capitalized
+    words = name.split(' ')
+    return all((word.lower() in _LOWERCASE_WORDS) == word.islower() for word in words[1:])
+
+
+def _is_clean_artist_name(artist: str) -> bool:
+    """True if _clean_artist_name would return artist unchanged."""
+    if not _CLEAN_WORDS_RE.fullmatch(artist):
+        return False
+    words = artist.split(' ')
+    return all(word[0].isupper() for word in words) and _ARTIST_REWRITE_WORDS.isdisjoint(artist.lower().split(' '))
+
+
 def _clean_song_name(name: str) -> str:
     """Clean and format song name for better readability."""
     if not name:
         return ""
     
+    # Already clean (e.g. "Hotel California", "Back in Black"): nothing to rewrite
+    if _is_clean_song_name(name):
+        return name
+    
     # Remove markdown formatting first
     name = _strip_markdown(name)
     
@@ -200,12 +376,12 @@ def _clean_song_name(name: str) -> str:
         punctuation_start = ""
         
         # Extract trailing punctuation (but keep commas and apostrophes in the word)
-        if word and word[-1] in ',;:!?':
+        if word and word[-1] in _TRAILING_PUNCT:
             punctuation_end = word[-1]
             word = word[:-1]
         
         # Extract leading punctuation
-        if word and word[0] in '"\'(':
+        if word and word[0] in _LEADING_PUNCT:
             punctuation_start = word[0]
             word = word[1:]
         
@@ -214,17 +390,18 @@ def _clean_song_name(name: str) -> str:
             continue
         
         # Preserve common prepositions and articles in lowercase (except first word)
-        lowercase_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by'}
-        if word.lower() in lowercase_words and i > 0:
+        if i > 0 and word.lower() in _LOWERCASE_WORDS:
             cleaned_word = word.lower()
+        elif word.replace("'", "").isalpha():
+            # Letters and apostrophes only: str.title() capitalizes each apostrophe-separated
+            # part in one C pass (e.g., "dreamin'" -> "Dreamin'")
+            cleaned_word = word.title()
+        elif "'" in word:
+            # title() would also split on digits/hyphens, so mixed words capitalize per part
+            parts = word.split("'")
+            cleaned_word = "'".join([p.capitalize() if p else "" for p in parts])
         else:
-            # Title case, but handle special cases
-            # Handle words with apostrophes (e.g., "Dreamin'" -> "Dreamin'")
-            if "'" in word:
-                parts = word.split("'")
-                cleaned_word = "'".join([p.capitalize() if p else "" for p in parts])
-            else:
-                cleaned_word = word.capitalize()
+            cleaned_word = word.capitalize()
         
         cleaned_words.append(punctuation_start + cleaned_word + punctuation_end)
     
@@ -240,6 +417,10 @@ def _clean_artist_name(artist: str) -> str:
     if not artist:
         return ""
     
+    # Already clean (e.g. "Willie Nelson"): nothing to rewrite
+    if _is_clean_artist_name(artist):
+        return artist
+    
     # Remove markdown formatting first
     artist = _strip_markdown(artist)
     
@@ -261,18 +442,19 @@ def _clean_artist_name(artist: str) -> str:
         
         if not part_clean:
             continue
+        part_lower = part_clean.lower()
         
         # Handle featured/collaboration markers
-        if part_clean.lower() in ['ft', 'ft.', 'feat', 'feat.', 'featuring', 'featuring.']:
+        if part_lower in _FEAT_MARKERS:
             # Standardize to "ft."
             cleaned_parts.append('ft.')
-        elif part_clean.lower() == '&' or part_clean == '&':
+        elif part_clean == '&':
             cleaned_parts.append('&')
-        elif part_clean.lower() == 'and' and i > 0:  # "and" between artists
+        elif part_lower == 'and' and i > 0:  # "and" between artists
             cleaned_parts.append('&')
-        elif part_clean.lower() == 'vs' or part_clean.lower() == 'vs.':
+        elif part_lower == 'vs' or part_lower == 'vs.':
             cleaned_parts.append('vs.')
-        elif part_clean.lower() == 'x' or part_clean == 'x':  # Collaboration marker
+        elif part_lower == 'x':  # Collaboration marker
             cleaned_parts.append('×')
         else:
             # Title case artist names, handling special characters
@@ -291,7 +473,7 @@ def _clean_artist_name(artist: str) -> str:
                 if len(part_clean) > 1:
                     cleaned_part += part_clean[1:].capitalize()
             # Handle common abbreviations (Dr, Mr, Ms, etc.)
-            elif part_clean.lower() in ['dr', 'mr', 'ms', 'mrs', 'jr', 'sr']:
+            elif part_lower in _ABBREVIATIONS:
                 cleaned_part = part_clean.capitalize() + '.'
             else:
                 cleaned_part = part_clean.capitalize()
@@ -308,29 +490,42 @@ def _clean_artist_name(artist: str) -> str:
 
 def _parse_music_response(response: str, destination: str, location_genres: List[str]) -> List[Dict[str, Any]]:
     """Parse LLM response and extract structured music recommendations."""
-    
-    recommendations = []
-    
     # Remove markdown formatting from entire response first
     response = _strip_markdown(response)
     
+    # Once stripped, a response is usually free of markers, so its lines only need trimming
+    strip_line = _strip_markdown if not _MARKDOWN_CHARS.isdisjoint(response) else _trim_text
+    recommendations = _collect_music_recommendations(response.split('\n'), destination, strip_line)
+    return _finish_music_recommendations(recommendations, response, destination, location_genres)
+
+
+def _collect_music_recommendations(lines: Iterable[str], destination: str,
+                                   strip_line: Callable[[str], str] = _strip_markdown) -> List[Dict[str, Any]]:
+    """
+    Line-by-line state machine that groups response lines into raw song dicts.
+    strip_line may be _trim_text when the lines are known to contain no markdown.
+    """
+    recommendations = []
+    
     # Common patterns to extract songs
     # Look for song title patterns (quoted, numbered lists, etc.)
-    lines = response.split('\n')
     current_song = {}
     
     for line in lines:
         # Remove markdown and clean line
-        line = _strip_markdown(line.strip())
+        line = strip_line(line.strip())
         if not line:
             if current_song:
                 recommendations.append(current_song)
                 current_song = {}
             continue
         
+        # Which field markers the line contains, found in a single regex pass
+        markers = _LINE_MARKERS_RE.match(line)
+        
         # Pattern 1: "song" by artist or **"song"** by artist
         # This handles cases like: . **"austin" by the Allman Brothers**
-        if ' by ' in line.lower():
+        if markers.group("by"):
             # Extract title and artist from "title" by artist format
             parts = line.split(' by ', 1)
             if len(parts) == 2:
@@ -339,9 +534,9 @@ def _parse_music_response(response: str, destination: str, location_genres: List
                 
                 # Remove quotes, markdown, and numbering from title
                 title = title.strip('"\'')
-                title = title.strip('. -–—•1234567890)')
+                title = title.strip(_NUMBERED_TITLE_TRIM_CHARS)
                 # Remove any leading numbering like "1.", "2.", etc.
-                title = re.sub(r'^\d+[\.\)]\s*', '', title)
+                title = _NUM_PREFIX_RE.sub('', title)
                 # Remove any remaining quotes
                 title = title.strip('"\'')
                 
@@ -356,48 +551,48 @@ def _parse_music_response(response: str, destination: str, location_genres: List
                     continue
         
         # Pattern 2: Look for song title patterns with keywords
-        if any(keyword in line.lower() for keyword in ["song:", "track:", "title:", "1.", "2.", "3.", "4.", "5.", "6.", "7.", "8.", "9.", "10."]):
+        if markers.group("title"):
             if current_song:
                 recommendations.append(current_song)
             current_song = {"destination": destination}
             
             # Extract song title (remove numbering, keywords)
             title = line
-            for prefix in ["song:", "track:", "title:", "1.", "2.", "3.", "4.", "5.", "6.", "7.", "8.", "9.", "10.", "11.", "12."]:
-                if title.lower().startswith(prefix.lower()):
-                    title = title[len(prefix):].strip()
-                    break
+            line_lower = line.lower()
+            if line_lower.startswith(_TITLE_PREFIXES):
+                prefix = next(p for p in _TITLE_PREFIXES if line_lower.startswith(p))
+                title = title[len(prefix):].strip()
             
             # Remove quotes and markdown if present
             title = title.strip('"\'')
-            title = _strip_markdown(title)
+            title = strip_line(title)
             # Clean the title
             current_song["title"] = _clean_song_name(title)
         
         # Pattern 3: Look for artist
-        elif any(keyword in line.lower() for keyword in ["artist:", "by:", "performed by:"]):
+        elif markers.group("artist"):
             artist = line
-            for prefix in ["artist:", "by:", "performed by:"]:
-                if artist.lower().startswith(prefix.lower()):
-                    artist = artist[len(prefix):].strip()
-                    break
+            line_lower = line.lower()
+            if line_lower.startswith(_ARTIST_PREFIXES):
+                prefix = next(p for p in _ARTIST_PREFIXES if line_lower.startswith(p))
+                artist = artist[len(prefix):].strip()
             # Clean the artist name
-            artist = _strip_markdown(artist)
+            artist = strip_line(artist)
             current_song["artist"] = _clean_artist_name(artist)
         
         # Pattern 4: Look for genre
-        elif "genre:" in line.lower():
+        elif markers.group("genre"):
             genre = line.split(":")[1].strip() if ":" in line else line
             # Clean genre name
-            genre = _strip_markdown(genre)
+            genre = strip_line(genre)
             genre = genre.strip().title()
             current_song["genre"] = genre
         
         # Pattern 5: Look for mood/energy
-        elif any(keyword in line.lower() for keyword in ["mood:", "energy:", "vibe:"]):
+        elif markers.group("mood"):
             mood = line.split(":")[1].strip() if ":" in line else line
             # Clean mood name
-            mood = _strip_markdown(mood)
+            mood = strip_line(mood)
             mood = mood.strip().title()
             current_song["mood"] = mood
     
@@ -405,39 +600,37 @@ def _parse_music_response(response: str, destination: str, location_genres: List
     if current_song:
         recommendations.append(current_song)
     
+    return recommendations
+
+
+def _finish_music_recommendations(recommendations: List[Dict[str, Any]], response: str, destination: str,
+                                  location_genres: List[str]) -> List[Dict[str, Any]]:
+    """Fill in and clean collected songs, or fall back to free-text extraction when too few were found."""
     # If parsing didn't work well, use fallback extraction
     if len(recommendations) < 3:
         return _extract_songs_from_text(response, destination, location_genres)
     
-    # Enhance recommendations with missing fields and clean all fields
-    for rec in recommendations:
-        # Clean title and artist if they exist
-        if "title" in rec:
-            rec["title"] = _clean_song_name(rec["title"])
-        if "artist" in rec:
-            rec["artist"] = _clean_artist_name(rec["artist"])
-        
-        if "genre" not in rec:
-            rec["genre"] = location_genres[0] if location_genres else "Pop"
-        else:
-            rec["genre"] = _strip_markdown(rec["genre"]).strip().title()
-        
-        if "mood" not in rec:
-            rec["mood"] = "Upbeat"
-        else:
-            rec["mood"] = _strip_markdown(rec["mood"]).strip().title()
-        
-        if "why" not in rec:
-            rec["why"] = f"Perfect vibe for {destination}"
-        else:
-            rec["why"] = _strip_markdown(rec["why"]).strip()
-        
-        if "best_for" not in rec:
-            rec["best_for"] = "Instagram Stories & Reels"
-        else:
-            rec["best_for"] = _strip_markdown(rec["best_for"]).strip()
-    
-    return recommendations[:12]  # Limit to 12 songs
+    # Enhance recommendations with missing fields and clean all fields.
+    # Each field is cleaned as its own column, then zipped back into dicts.
+    recommendations = recommendations[:12]  # Limit to 12 songs
+    default_genre = location_genres[0] if location_genres else "Pop"
+    titles = [_clean_song_name(rec["title"]) if "title" in rec else None for rec in recommendations]
+    artists = [_clean_artist_name(rec["artist"]) if "artist" in rec else None for rec in recommendations]
+    genres = [_strip_markdown(rec["genre"]).strip().title() if "genre" in rec else default_genre for rec in recommendations]
+    moods = [_strip_markdown(rec["mood"]).strip().title() if "mood" in rec else "Upbeat" for rec in recommendations]
+    whys = [_strip_markdown(rec["why"]).strip() if "why" in rec else f"Perfect vibe for {destination}" for rec in recommendations]
+    best_fors = [_strip_markdown(rec["best_for"]).strip() if "best_for" in rec else "Instagram Stories & Reels" for rec in recommendations]
+    
+    cleaned = []
+    for rec, title, artist, genre, mood, why, best_for in zip(recommendations, titles, artists, genres, moods, whys, best_fors):
+        song = {**rec, "genre": genre, "mood": mood, "why": why, "best_for": best_for}
+        if title is not None:
+            song["title"] = title
+        if artist is not None:
+            song["artist"] = artist
+        cleaned.append(song)
+    
+    return cleaned
 
 
 def _extract_songs_from_text(text: str, destination: str, location_genres: List[str]) -> List[Dict[str, Any]]:
@@ -447,80 +640,75 @@ def _extract_songs_from_text(text: str, destination: str, location_genres: List[
     
     # Remove markdown formatting first
     text = _strip_markdown(text)
+    strip_line = _strip_markdown if not _MARKDOWN_CHARS.isdisjoint(text) else _trim_text
     
     # Look for common song patterns in the text
     # This is a fallback if structured parsing fails
     lines = text.split('\n')
     
     for line in lines:
-        line = _strip_markdown(line.strip())
+        line = strip_line(line.strip())
         if not line:
             continue
             
         # Look for lines that might contain song information
         # Pattern: "song" by artist or song - artist or song – artist
-        if " by " in line.lower():
-            # Find " by " case-insensitive
-            idx = line.lower().find(" by ")
-            if idx >= 0:
-                title = line[:idx].strip()
-                artist = line[idx+4:].strip()
-                
-                # Remove quotes, numbering, and markdown
-                title = title.strip('"\'')
-                title = re.sub(r'^\d+[\.\)]\s*', '', title)  # Remove numbering
-                title = title.strip('. -–—•')
-                title = title.strip('"\'')  # Remove any remaining quotes
-                artist = artist.strip('. -–—•')
-                
-                # Clean the title and artist
-                title = _clean_song_name(title)
-                artist = _clean_artist_name(artist)
-                
-                if title and artist and len(title) > 2:
-                    recommendations.append({
-                        "title": title,
-                        "artist": artist,
-                        "genre": location_genres[0] if location_genres else "Pop",
-                        "mood": "Upbeat",
-                        "why": f"Great vibe for {destination}",
-                        "best_for": "Social Media Posts",
-                        "destination": destination
-                    })
-        elif " - " in line or " – " in line:
-            # Try different separators
-            if " - " in line:
-                parts = line.split(" - ", 1)
-            elif " – " in line:
-                parts = line.split(" – ", 1)
-            else:
-                continue
+        # One regex pass locates the first " by " (case-insensitive), " - " and " – "
+        separators = _SEPARATORS_RE.match(line)
+        if separators.group("by"):
+            idx = separators.start("by")
+            title = line[:idx].strip()
+            artist = line[idx+4:].strip()
             
-            if len(parts) >= 2:
-                title = parts[0].strip()
-                artist = parts[1].strip()
-                
-                # Remove quotes, numbering, and markdown
-                title = title.strip('"\'')
-                title = re.sub(r'^\d+[\.\)]\s*', '', title)
-                title = title.strip('. -–—•1234567890.,;:!?()[]{}')
-                title = title.strip('"\'')  # Remove any remaining quotes
-                artist = artist.strip('"\'.,;:!?()[]{}')
-                
-                # Clean the title and artist
-                title = _clean_song_name(title)
-                artist = _clean_artist_name(artist)
-                
-                if title and artist and len(title) > 2:
-                    recommendations.append({
-                        "title": title,
-                        "artist": artist,
-                        "genre": location_genres[0] if location_genres else "Pop",
-                        "mood": "Upbeat",
-                        "why": f"Great vibe for {destination}",
-                        "best_for": "Social Media Posts",
-                        "destination": destination
-                    })
+            # Remove quotes, numbering, and markdown
+            title = title.strip('"\'')
+            title = _NUM_PREFIX_RE.sub('', title)  # Remove numbering
+            title = title.strip(_MARKDOWN_TRIM_CHARS)
+            title = title.strip('"\'')  # Remove any remaining quotes
+            artist = artist.strip(_MARKDOWN_TRIM_CHARS)
+            
+            # Clean the title and artist
+            title = _clean_song_name(title)
+            artist = _clean_artist_name(artist)
+            
+            if title and artist and len(title) > 2:
+                recommendations.append({
+                    "title": title,
+                    "artist": artist,
+                    "genre": location_genres[0] if location_genres else "Pop",
+                    "mood": "Upbeat",
+                    "why": f"Great vibe for {destination}",
+                    "best_for": "Social Media Posts",
+                    "destination": destination
+                })
+        elif separators.group("dash") or separators.group("en_dash"):
+            # Prefer " - " over " – "
+            sep = "dash" if separators.group("dash") else "en_dash"
+            idx = separators.start(sep)
+            title = line[:idx].strip()
+            artist = line[idx+3:].strip()
+            
+            # Remove quotes, numbering, and markdown
+            title = title.strip('"\'')
+            title = _NUM_PREFIX_RE.sub('', title)
+            title = title.strip(_DASHED_TITLE_TRIM_CHARS)
+            title = title.strip('"\'')  # Remove any remaining quotes
+            artist = artist.strip(_DASHED_ARTIST_TRIM_CHARS)
+            
+            # Clean the title and artist
+            title = _clean_song_name(title)
+            artist = _clean_artist_name(artist)
+            
+            if title and artist and len(title) > 2:
+                recommendations.append({
+                    "title": title,
+                    "artist": artist,
+                    "genre": location_genres[0] if location_genres else "Pop",
+                    "mood": "Upbeat",
+                    "why": f"Great vibe for {destination}",
+                    "best_for": "Social Media Posts",
+                    "destination": destination
+                })
     
     # If still no songs, use location-based defaults
     if not recommendations:
@@ -536,86 +724,95 @@ def _extract_songs_from_text(text: str, destination: str, location_genres: List[
     return recommendations[:12]
 
 
+def _normalize_song(song: Dict[str, str]) -> Dict[str, str]:
+    """Apply the same title/artist/genre/mood formatting as parsed recommendations."""
+    return {
+        **song,
+        "title": _clean_song_name(song["title"]),
+        "artist": _clean_artist_name(song["artist"]),
+        "genre": song["genre"].title(),
+        "mood": song["mood"].title(),
+    }
+
+
+# Location-specific default songs
+_RAW_DEFAULT_SONGS = {
+    "austin": [
+        {"title": "Texas Sun", "artist": "Khruangbin & Leon Bridges", "genre": "Indie", "mood": "Chill", "why": "Austin vibe classic", "best_for": "Instagram Stories"},
+        {"title": "God Blessed Texas", "artist": "Little Texas", "genre": "Country", "mood": "Energetic", "why": "Texas anthem", "best_for": "TikTok"},
+        {"title": "South Side", "artist": "Moby", "genre": "Electronic", "mood": "Upbeat", "why": "Great for travel content", "best_for": "Reels"},
+        {"title": "Austin", "artist": "Blake Shelton", "genre": "Country", "mood": "Upbeat", "why": "Perfect Austin song", "best_for": "Instagram Stories"},
+        {"title": "Deep In The Heart Of Texas", "artist": "George Strait", "genre": "Country", "mood": "Chill", "why": "Texas classic", "best_for": "Reels"},
+    ],
+    "california": [
+        {"title": "California Love", "artist": "2Pac ft. Dr. Dre", "genre": "Hip-Hop", "mood": "Energetic", "why": "California classic", "best_for": "Instagram Stories"},
+        {"title": "Hotel California", "artist": "Eagles", "genre": "Rock", "mood": "Chill", "why": "Iconic California song", "best_for": "Photo Slideshows"},
+        {"title": "California Gurls", "artist": "Katy Perry", "genre": "Pop", "mood": "Upbeat", "why": "Fun California vibe", "best_for": "TikTok"},
+        {"title": "California Dreamin'", "artist": "The Mamas & The Papas", "genre": "Folk Rock", "mood": "Chill", "why": "Classic California vibe", "best_for": "Reels"},
+        {"title": "California", "artist": "Phantom Planet", "genre": "Rock", "mood": "Upbeat", "why": "Perfect for California posts", "best_for": "Instagram Stories"},
+    ],
+    "new york": [
+        {"title": "Empire State Of Mind", "artist": "Jay-Z & Alicia Keys", "genre": "Hip-Hop", "mood": "Inspiring", "why": "NYC anthem", "best_for": "Instagram Stories"},
+        {"title": "New York, New York", "artist": "Frank Sinatra", "genre": "Jazz", "mood": "Classic", "why": "Timeless NYC song", "best_for": "Reels"},
+        {"title": "Welcome To New York", "artist": "Taylor Swift", "genre": "Pop", "mood": "Upbeat", "why": "Perfect for travel posts", "best_for": "TikTok"},
+        {"title": "New York State Of Mind", "artist": "Billy Joel", "genre": "Rock", "mood": "Chill", "why": "NYC classic", "best_for": "Instagram Stories"},
+        {"title": "Theme From New York, New York", "artist": "Frank Sinatra", "genre": "Jazz", "mood": "Classic", "why": "Iconic NYC song", "best_for": "Reels"},
+    ],
+    "miami": [
+        {"title": "Despacito", "artist": "Luis Fonsi & Daddy Yankee", "genre": "Latin", "mood": "Energetic", "why": "Miami Latin vibe", "best_for": "Instagram Stories"},
+        {"title": "Conga", "artist": "Gloria Estefan", "genre": "Latin", "mood": "Energetic", "why": "Miami classic", "best_for": "TikTok"},
+        {"title": "Mi Gente", "artist": "J Balvin & Willy William", "genre": "Reggaeton", "mood": "Upbeat", "why": "Perfect for Miami", "best_for": "Reels"},
+        {"title": "Gasolina", "artist": "Daddy Yankee", "genre": "Reggaeton", "mood": "Energetic", "why": "Miami party vibe", "best_for": "Instagram Stories"},
+        {"title": "La Bicicleta", "artist": "Carlos Vives & Shakira", "genre": "Latin", "mood": "Upbeat", "why": "Great for Miami posts", "best_for": "TikTok"},
+    ],
+    "texas": [
+        {"title": "Texas Sun", "artist": "Khruangbin & Leon Bridges", "genre": "Indie", "mood": "Chill", "why": "Texas vibe classic", "best_for": "Instagram Stories"},
+        {"title": "God Blessed Texas", "artist": "Little Texas", "genre": "Country", "mood": "Energetic", "why": "Texas anthem", "best_for": "TikTok"},
+        {"title": "All My Ex's Live In Texas", "artist": "George Strait", "genre": "Country", "mood": "Upbeat", "why": "Texas country classic", "best_for": "Reels"},
+        {"title": "The Yellow Rose Of Texas", "artist": "Mitch Miller", "genre": "Country", "mood": "Chill", "why": "Texas tradition", "best_for": "Instagram Stories"},
+    ],
+    "los angeles": [
+        {"title": "California Love", "artist": "2Pac ft. Dr. Dre", "genre": "Hip-Hop", "mood": "Energetic", "why": "LA classic", "best_for": "Instagram Stories"},
+        {"title": "I Love LA", "artist": "Randy Newman", "genre": "Pop", "mood": "Upbeat", "why": "Perfect LA anthem", "best_for": "TikTok"},
+        {"title": "California", "artist": "Phantom Planet", "genre": "Rock", "mood": "Upbeat", "why": "Great for LA posts", "best_for": "Reels"},
+        {"title": "Malibu", "artist": "Miley Cyrus", "genre": "Pop", "mood": "Chill", "why": "LA beach vibe", "best_for": "Instagram Stories"},
+    ],
+}
+
+# Generic travel songs; the first takes the destination's primary genre
+_RAW_GENERIC_SONGS = [
+    {"title": "On Top Of The World", "artist": "Imagine Dragons", "genre": "Pop", "mood": "Inspiring", "why": "Perfect travel anthem", "best_for": "Instagram Stories"},
+    {"title": "Good Life", "artist": "OneRepublic", "genre": "Pop", "mood": "Upbeat", "why": "Great for vacation vibes", "best_for": "Reels"},
+    {"title": "Adventure Of A Lifetime", "artist": "Coldplay", "genre": "Pop Rock", "mood": "Energetic", "why": "Perfect for travel content", "best_for": "TikTok"},
+    {"title": "I Gotta Feeling", "artist": "Black Eyed Peas", "genre": "Pop", "mood": "Upbeat", "why": "Fun vacation vibe", "best_for": "Instagram Stories"},
+    {"title": "Walking On Sunshine", "artist": "Katrina & The Waves", "genre": "Pop", "mood": "Upbeat", "why": "Perfect for travel posts", "best_for": "Reels"},
+    {"title": "Happy", "artist": "Pharrell Williams", "genre": "Pop", "mood": "Upbeat", "why": "Great vacation vibe", "best_for": "TikTok"},
+]
+
+# Default song tables, formatted once at import instead of on every fallback.
+# Read-only templates so a caller mutating its result can never alter the shared tables.
+_DEFAULT_SONGS = {
+    location: tuple(MappingProxyType(_normalize_song(song)) for song in songs)
+    for location, songs in _RAW_DEFAULT_SONGS.items()
+}
+_GENERIC_SONGS = tuple(MappingProxyType(_normalize_song(song)) for song in _RAW_GENERIC_SONGS)
+
+
 def _get_default_songs_for_location(destination: str, location_genres: List[str]) -> List[Dict[str, Any]]:
     """Get default song recommendations based on location and genres."""
     
     destination_lower = destination.lower()
     genre = location_genres[0] if location_genres else "Pop"
     
-    # Location-specific default songs (all properly formatted)
-    default_songs = {
-        "austin": [
-            {"title": "Texas Sun", "artist": "Khruangbin & Leon Bridges", "genre": "Indie", "mood": "Chill", "why": "Austin vibe classic", "best_for": "Instagram Stories"},
-            {"title": "God Blessed Texas", "artist": "Little Texas", "genre": "Country", "mood": "Energetic", "why": "Texas anthem", "best_for": "TikTok"},
-            {"title": "South Side", "artist": "Moby", "genre": "Electronic", "mood": "Upbeat", "why": "Great for travel content", "best_for": "Reels"},
-            {"title": "Austin", "artist": "Blake Shelton", "genre": "Country", "mood": "Upbeat", "why": "Perfect Austin song", "best_for": "Instagram Stories"},
-            {"title": "Deep In The Heart Of Texas", "artist": "George Strait", "genre": "Country", "mood": "Chill", "why": "Texas classic", "best_for": "Reels"},
-        ],
-        "california": [
-            {"title": "California Love", "artist": "2Pac ft. Dr. Dre", "genre": "Hip-Hop", "mood": "Energetic", "why": "California classic", "best_for": "Instagram Stories"},
-            {"title": "Hotel California", "artist": "Eagles", "genre": "Rock", "mood": "Chill", "why": "Iconic California song", "best_for": "Photo Slideshows"},
-            {"title": "California Gurls", "artist": "Katy Perry", "genre": "Pop", "mood": "Upbeat", "why": "Fun California vibe", "best_for": "TikTok"},
-            {"title": "California Dreamin'", "artist": "The Mamas & The Papas", "genre": "Folk Rock", "mood": "Chill", "why": "Classic California vibe", "best_for": "Reels"},
-            {"title": "California", "artist": "Phantom Planet", "genre": "Rock", "mood": "Upbeat", "why": "Perfect for California posts", "best_for": "Instagram Stories"},
-        ],
-        "new york": [
-            {"title": "Empire State Of Mind", "artist": "Jay-Z & Alicia Keys", "genre": "Hip-Hop", "mood": "Inspiring", "why": "NYC anthem", "best_for": "Instagram Stories"},
-            {"title": "New York, New York", "artist": "Frank Sinatra", "genre": "Jazz", "mood": "Classic", "why": "Timeless NYC song", "best_for": "Reels"},
-            {"title": "Welcome To New York", "artist": "Taylor Swift", "genre": "Pop", "mood": "Upbeat", "why": "Perfect for travel posts", "best_for": "TikTok"},
-            {"title": "New York State Of Mind", "artist": "Billy Joel", "genre": "Rock", "mood": "Chill", "why": "NYC classic", "best_for": "Instagram Stories"},
-            {"title": "Theme From New York, New York", "artist": "Frank Sinatra", "genre": "Jazz", "mood": "Classic", "why": "Iconic NYC song", "best_for": "Reels"},
-        ],
-        "miami": [
-            {"title": "Despacito", "artist": "Luis Fonsi & Daddy Yankee", "genre": "Latin", "mood": "Energetic", "why": "Miami Latin vibe", "best_for": "Instagram Stories"},
-            {"title": "Conga", "artist": "Gloria Estefan", "genre": "Latin", "mood": "Energetic", "why": "Miami classic", "best_for": "TikTok"},
-            {"title": "Mi Gente", "artist": "J Balvin & Willy William", "genre": "Reggaeton", "mood": "Upbeat", "why": "Perfect for Miami", "best_for": "Reels"},
-            {"title": "Gasolina", "artist": "Daddy Yankee", "genre": "Reggaeton", "mood": "Energetic", "why": "Miami party vibe", "best_for": "Instagram Stories"},
-            {"title": "La Bicicleta", "artist": "Carlos Vives & Shakira", "genre": "Latin", "mood": "Upbeat", "why": "Great for Miami posts", "best_for": "TikTok"},
-        ],
-        "texas": [
-            {"title": "Texas Sun", "artist": "Khruangbin & Leon Bridges", "genre": "Indie", "mood": "Chill", "why": "Texas vibe classic", "best_for": "Instagram Stories"},
-            {"title": "God Blessed Texas", "artist": "Little Texas", "genre": "Country", "mood": "Energetic", "why": "Texas anthem", "best_for": "TikTok"},
-            {"title": "All My Ex's Live In Texas", "artist": "George Strait", "genre": "Country", "mood": "Upbeat", "why": "Texas country classic", "best_for": "Reels"},
-            {"title": "The Yellow Rose Of Texas", "artist": "Mitch Miller", "genre": "Country", "mood": "Chill", "why": "Texas tradition", "best_for": "Instagram Stories"},
-        ],
-        "los angeles": [
-            {"title": "California Love", "artist": "2Pac ft. Dr. Dre", "genre": "Hip-Hop", "mood": "Energetic", "why": "LA classic", "best_for": "Instagram Stories"},
-            {"title": "I Love LA", "artist": "Randy Newman", "genre": "Pop", "mood": "Upbeat", "why": "Perfect LA anthem", "best_for": "TikTok"},
-            {"title": "California", "artist": "Phantom Planet", "genre": "Rock", "mood": "Upbeat", "why": "Great for LA posts", "best_for": "Reels"},
-            {"title": "Malibu", "artist": "Miley Cyrus", "genre": "Pop", "mood": "Chill", "why": "LA beach vibe", "best_for": "Instagram Stories"},
-        ],
-    }
-    
     # Find matching location
-    for location, songs in default_songs.items():
+    for location, songs in _DEFAULT_SONGS.items():
         if location in destination_lower:
-            for song in songs:
-                song["destination"] = destination
-                # Ensure all fields are properly formatted
-                song["title"] = _clean_song_name(song["title"])
-                song["artist"] = _clean_artist_name(song["artist"])
-                song["genre"] = song["genre"].title()
-                song["mood"] = song["mood"].title()
-            return songs
-    
-    # Generic travel songs (properly formatted)
-    generic_songs = [
-        {"title": "On Top Of The World", "artist": "Imagine Dragons", "genre": genre, "mood": "Inspiring", "why": "Perfect travel anthem", "best_for": "Instagram Stories", "destination": destination},
-        {"title": "Good Life", "artist": "OneRepublic", "genre": "Pop", "mood": "Upbeat", "why": "Great for vacation vibes", "best_for": "Reels", "destination": destination},
-        {"title": "Adventure Of A Lifetime", "artist": "Coldplay", "genre": "Pop Rock", "mood": "Energetic", "why": "Perfect for travel content", "best_for": "TikTok", "destination": destination},
-        {"title": "I Gotta Feeling", "artist": "Black Eyed Peas", "genre": "Pop", "mood": "Upbeat", "why": "Fun vacation vibe", "best_for": "Instagram Stories", "destination": destination},
-        {"title": "Walking On Sunshine", "artist": "Katrina & The Waves", "genre": "Pop", "mood": "Upbeat", "why": "Perfect for travel posts", "best_for": "Reels", "destination": destination},
-        {"title": "Happy", "artist": "Pharrell Williams", "genre": "Pop", "mood": "Upbeat", "why": "Great vacation vibe", "best_for": "TikTok", "destination": destination},
-    ]
-    
-    # Clean all generic songs
-    for song in generic_songs:
-        song["title"] = _clean_song_name(song["title"])
-        song["artist"] = _clean_artist_name(song["artist"])
-        song["genre"] = song["genre"].title()
-        song["mood"] = song["mood"].title()
+            return [{**template, "destination": destination} for template in songs]
     
-    return generic_songs
+    first, *rest = _GENERIC_SONGS
+    return [{**first, "genre": genre.title(), "destination": destination}] + [
+        {**template, "destination": destination} for template in rest
+    ]
 
 
 def _get_fallback_music_recommendations(destination: str, location_genres: List[str], season: Optional[str] = None) -> Dict[str, Any]:
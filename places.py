@@ -2,11 +2,21 @@
 Places and POI search tool with mock support.
 """
 import os
-import json
+import asyncio
 import logging
-from typing import Dict, Any, List
+import re
+import threading
+from dataclasses import dataclass
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, List, NamedTuple, Optional, Tuple
+import orjson
 import requests
+from cachetools import LRUCache, TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
+from agent.cache import disk_cache
+from .maps import calculate_distance_batch
 
 load_dotenv()
 logger = logging.getLogger(__name__)
@@ -14,6 +24,53 @@ logger = logging.getLogger(__name__)
 USE_MOCKS = os.getenv("USE_MOCKS", "false").lower() == "true"
 GOOGLE_MAPS_API_KEY = os.getenv("GOOGLE_MAPS_API_KEY", "")
 
+# Shared HTTP session so repeated Places searches reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.headers["User-Agent"] = "hackutd-nemotron-travel-agent"
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=16,
+    max_retries=Retry(total=3, backoff_factor=0.2, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False)
+))
+
+# Places content may be cached for at most 30 days under the Maps Platform terms
+_MAX_CACHE_TTL = 30 * 24 * 3600
+_CACHE_TTL = min(int(os.getenv("PLACES_CACHE_TTL", str(24 * 3600))), _MAX_CACHE_TTL)
+
+# Successful non-empty search results keyed by normalized (query, near, limit); errors are never cached
+_SEARCH_CACHE = TTLCache(maxsize=512, ttl=_CACHE_TTL)
+_CACHE_LOCK = threading.Lock()
+
+# Searches currently being fetched, keyed like _SEARCH_CACHE; waiters share the leader's result
+_INFLIGHT: Dict[tuple, Future] = {}
+_INFLIGHT_LOCK = threading.Lock()
+
+# Joins a place's name and tags into one searchable string; an interest without it can't match across fields
+_FIELD_SEPARATOR = "\0"
+
+# Places API (New) response fields read by _search_api; everything else is left out of the payload
+_SEARCH_FIELD_MASK = "places.id,places.displayName,places.types,places.rating,places.priceLevel,places.location,places.formattedAddress"
+_PRICE_LEVEL_ENUM = {
+    "PRICE_LEVEL_FREE": 0,
+    "PRICE_LEVEL_INEXPENSIVE": 1,
+    "PRICE_LEVEL_MODERATE": 2,
+    "PRICE_LEVEL_EXPENSIVE": 3,
+    "PRICE_LEVEL_VERY_EXPENSIVE": 4,
+}
+
+# Estimated cost per person by Google Places price_level (0-4)
+_PRICE_BY_LEVEL = (
+    0.0,   # Free (parks, public spaces, etc.)
+    10.0,  # Inexpensive
+    20.0,  # Moderate
+    35.0,  # Expensive
+    50.0,  # Very expensive
+)
+
+# Mock places file and its parsed, indexed contents, keyed by path -> (mtime, index)
+_MOCK_FILE = "data/mock/places_austin.json"
+_MOCK_FILE_CACHE: Dict[str, Tuple[float, "_MockPlaceIndex"]] = {}
+
 
 def search(query: str, near: str, limit: int = 10) -> List[Dict[str, Any]]:
     """
@@ -29,60 +86,87 @@ def search(query: str, near: str, limit: int = 10) -> List[Dict[str, Any]]:
         logger.warning("No Google Maps API key configured. Returning empty results.")
         return []
     
+    cache_key = (_canonical_query(query), " ".join(near.lower().split()), limit)
+    disk_key = f"places:search:v2:{cache_key[0]}|{cache_key[1]}|{limit}"
+    cached = _cache_get(cache_key, disk_key)
+    if cached is not None:
+        return [place.to_dict() for place in cached]
+    
+    # Coalesce concurrent identical searches: the first caller fetches, the rest wait for its result
+    with _INFLIGHT_LOCK:
+        future = _INFLIGHT.get(cache_key)
+        is_leader = future is None
+        if is_leader:
+            future = _INFLIGHT[cache_key] = Future()
+    
+    if is_leader:
+        places = []
+        try:
+            places = _search_api(query, near, limit)
+            if places:
+                _cache_set(cache_key, disk_key, places)
+        finally:
+            with _INFLIGHT_LOCK:
+                del _INFLIGHT[cache_key]
+            future.set_result(places)
+    else:
+        places = future.result()
+    
+    # Callers get fresh dicts they can annotate (distance_from_center, ...)
+    return [place.to_dict() for place in places]
+
+
+def _search_api(query: str, near: str, limit: int) -> List["Place"]:
+    """Google Places text search; returns [] on any API error or empty result."""
     try:
-        # Google Places API text search
-        base_url = "https://maps.googleapis.com/maps/api/place/textsearch/json"
-        params = {
-            "query": f"{query} in {near}",
-            "key": GOOGLE_MAPS_API_KEY
+        # Use Places API (New) text search, requesting only the fields we read
+        base_url = "https://places.googleapis.com/v1/places:searchText"
+        headers = {
+            "X-Goog-Api-Key": GOOGLE_MAPS_API_KEY,
+            "X-Goog-FieldMask": _SEARCH_FIELD_MASK
+        }
+        body = {
+            "textQuery": f"{query} in {near}",
+            "maxResultCount": max(1, min(limit, 20))  # API accepts 1-20
         }
         
-        response = requests.get(base_url, params=params, timeout=10)
+        response = _SESSION.post(base_url, headers=headers, json=body, timeout=10)
         
-        if response.status_code == 200:
-            data = response.json()
-            api_status = data.get("status", "")
-            
-            # Check for API errors
-            if api_status == "REQUEST_DENIED":
-                error_msg = data.get("error_message", "API access denied")
-                logger.error(f"Google Places API denied: {error_msg}")
-                logger.error("To use real Places API, enable 'Places API' (not legacy) in Google Cloud Console.")
-                # Return empty list instead of mock data when API is denied
-                return []
-            
-            if api_status != "OK":
-                logger.error(f"Google Places API returned status: {api_status}. No results available.")
-                # Return empty list instead of mock data
-                return []
-            
-            results = data.get("results", [])
-            
-            if not results:
-                logger.info(f"No places found for query '{query}' in {near} via API.")
-                # Return empty list - let the agent handle no results
-                return []
-            
-            places = []
-            for result in results[:limit]:
-                place = {
-                    "name": result.get("name", ""),
-                    "tags": result.get("types", []),
-                    "rating": result.get("rating", 4.0),
-                    "price": _estimate_price_from_level(result.get("price_level")),
-                    "lat": result["geometry"]["location"]["lat"],
-                    "lng": result["geometry"]["location"]["lng"], 
-                    "place_id": result.get("place_id", ""),
-                    "link": f"https://maps.google.com/?place_id={result.get('place_id', '')}",
-                    "address": result.get("formatted_address", "")
-                }
-                places.append(place)
-            
-            return places
+        if response.status_code == 403:
+            error_msg = orjson.loads(response.content).get("error", {}).get("message", "API access denied")
+            logger.error(f"Google Places API denied: {error_msg}")
+            logger.error("To use real Places API, enable 'Places API' (not legacy) in Google Cloud Console.")
+            # Return empty list instead of mock data when API is denied
+            return []
         
-        logger.error(f"Google Places API error: {response.status_code}")
-        # Return empty list instead of mock data
-        return []
+        if response.status_code != 200:
+            logger.error(f"Google Places API error: HTTP {response.status_code}")
+            # Return empty list instead of mock data
+            return []
+        
+        results = orjson.loads(response.content).get("places", [])
+        
+        if not results:
+            logger.info(f"No places found for query '{query}' in {near} via API.")
+            # Return empty list - let the agent handle no results
+            return []
+        
+        # Single comprehension; the one-element "for ... in [...]" binds per-result locals
+        return [
+            Place(
+                name=result.get("displayName", {}).get("text", ""),
+                tags=result.get("types", []),
+                rating=result.get("rating", 4.0),
+                price=_estimate_price_from_level(_PRICE_LEVEL_ENUM.get(result.get("priceLevel"))),
+                lat=location["latitude"],
+                lng=location["longitude"],
+                place_id=place_id,
+                link=f"https://maps.google.com/?place_id={place_id}",
+                address=result.get("formattedAddress", "")
+            )
+            for result in results[:limit]
+            for location, place_id in [(result.get("location", {}), result.get("id", ""))]
+        ]
         
     except Exception as e:
         logger.error(f"Places API call failed: {e}")
@@ -90,247 +174,395 @@ def search(query: str, near: str, limit: int = 10) -> List[Dict[str, Any]]:
         return []
 
 
+class Place(NamedTuple):
+    """
+    One Places API result. Cached results are held as these compact tuples (no per-place
+    dict); search() hands callers dicts via to_dict(), so the public format is unchanged.
+    """
+    name: str
+    tags: List[str]
+    rating: float
+    price: float
+    lat: float
+    lng: float
+    place_id: str
+    link: str
+    address: str
+    
+    def to_dict(self) -> Dict[str, Any]:
+        # Copy tags: the tuple may sit in _SEARCH_CACHE, and callers are free to edit their dicts
+        return {**self._asdict(), "tags": list(self.tags)}
+
+
+def _canonical_query(query: str) -> str:
+    """
+    Cache form of a search query: only case, whitespace and word order are ignored, so queries that
+    share a key send the same words to the API (e.g. "BBQ  Austin" and "austin bbq").
+    """
+    return " ".join(sorted(query.lower().split()))
+
+
+def _cache_get(key: tuple, disk_key: str) -> Optional[Tuple["Place", ...]]:
+    """Look in the in-memory cache, then the shared disk cache (promoting disk hits into memory)."""
+    with _CACHE_LOCK:
+        value = _SEARCH_CACHE.get(key)
+    if value is None:
+        raw = disk_cache.get(disk_key)
+        if raw is not None:
+            value = tuple(Place(**row) for row in orjson.loads(raw))
+            with _CACHE_LOCK:
+                _SEARCH_CACHE[key] = value
+    return value
+
+
+def _cache_set(key: tuple, disk_key: str, places: List["Place"]) -> None:
+    with _CACHE_LOCK:
+        _SEARCH_CACHE[key] = tuple(places)
+    # Stored as JSON objects on disk so entries stay readable if fields are added
+    disk_cache.set(disk_key, orjson.dumps([place.to_dict() for place in places]), _CACHE_TTL)
+
+
+def search_many(queries: List[Tuple[str, str, int]], concurrency: int = 8) -> List[List[Dict[str, Any]]]:
+    """
+    Run several (query, near, limit) searches concurrently.
+    Results are returned in input order, each in the same format as search; concurrency
+    caps simultaneous Places requests so a fan-out stays within the API's QPS limits.
+    """
+    if len(queries) <= 1:
+        return [search(query, near, limit) for query, near, limit in queries]
+    
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(queries))) as pool:
+        return list(pool.map(lambda q: search(*q), queries))
+
+
+async def asearch_many(queries: List[Tuple[str, str, int]], concurrency: int = 8) -> List[List[Dict[str, Any]]]:
+    """
+    Async variant of search_many for use from event-loop code.
+    The fan-out runs on the search_many thread pool in a worker thread, so the loop is never blocked.
+    """
+    return await asyncio.to_thread(search_many, queries, concurrency)
+
+
+class _MockPlaceIndex:
+    """
+    Search index over the mock places file: names and tags lowercased once at load, and
+    query -> matching positions memoized so a repeated query is a single dict lookup.
+    Matching is the same substring test as before (query in name or in any tag).
+    """
+    
+    def __init__(self, places: List[Dict[str, Any]]):
+        self.places = places
+        self._names = [place.get("name", "").lower() for place in places]
+        self._tags = [[tag.lower() for tag in place.get("tags", [])] for place in places]
+        self._matches = LRUCache(maxsize=256)
+        self._lock = threading.Lock()
+    
+    def lookup(self, query_lower: str) -> Tuple[int, ...]:
+        """Positions of the places whose name or a tag contains query_lower, in file order."""
+        with self._lock:
+            matches = self._matches.get(query_lower)
+        if matches is None:
+            matches = tuple(
+                i for i, (name, tags) in enumerate(zip(self._names, self._tags))
+                if query_lower in name or any(query_lower in tag for tag in tags)
+            )
+            with self._lock:
+                self._matches[query_lower] = matches
+        return matches
+
+
+def _load_mock_file(path: str) -> Optional[_MockPlaceIndex]:
+    """Indexed mock places file, re-read only when its mtime changes; None if the file doesn't exist."""
+    try:
+        mtime = os.stat(path).st_mtime
+    except FileNotFoundError:
+        return None
+    
+    cached = _MOCK_FILE_CACHE.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    
+    with open(path, 'rb') as f:
+        index = _MockPlaceIndex(orjson.loads(f.read()))
+    _MOCK_FILE_CACHE[path] = (mtime, index)
+    return index
+
+
+# Hardcoded mock places by category, used when there is no mock data file.
+# Built once at import and shared, so _get_mock_places returns copies.
+
+# BBQ places
+_MOCK_BBQ_PLACES = (
+    {
+        "name": "Franklin Barbecue",
+        "tags": ["BBQ", "restaurant"],
+        "rating": 4.6,
+        "price": 25.0,
+        "lat": 30.2701,
+        "lng": -97.7374,
+        "place_id": "franklin_bbq",
+        "link": "https://franklinbbq.com",
+        "address": "900 E 11th St, Austin, TX 78702"
+    },
+    {
+        "name": "la Barbecue",
+        "tags": ["BBQ", "restaurant"],
+        "rating": 4.4,
+        "price": 20.0,
+        "lat": 30.2580,
+        "lng": -97.7386,
+        "place_id": "la_barbecue",
+        "link": "https://labarbecue.com",
+        "address": "2401 E Cesar Chavez St, Austin, TX 78702"
+    },
+    {
+        "name": "Stubb's Bar-B-Q",
+        "tags": ["BBQ", "restaurant", "live music", "venue"],
+        "rating": 4.2,
+        "price": 22.0,
+        "lat": 30.2634,
+        "lng": -97.7354,
+        "place_id": "stubbs_bbq",
+        "link": "https://stubbsaustin.com",
+        "address": "801 Red River St, Austin, TX 78701"
+    },
+)
+
+# Live music venues
+_MOCK_MUSIC_PLACES = (
+    {
+        "name": "The Continental Club",
+        "tags": ["live music", "venue", "bar"],
+        "rating": 4.5,
+        "price": 15.0,
+        "lat": 30.2625,
+        "lng": -97.7506,
+        "place_id": "continental_club",
+        "link": "https://continentalclub.com",
+        "address": "1315 S Congress Ave, Austin, TX 78704"
+    },
+    {
+        "name": "Antone's Nightclub",
+        "tags": ["live music", "venue", "blues"],
+        "rating": 4.4,
+        "price": 20.0,
+        "lat": 30.2669,
+        "lng": -97.7431,
+        "place_id": "antones",
+        "link": "https://antonesnightclub.com",
+        "address": "305 E 5th St, Austin, TX 78701"
+    },
+    {
+        "name": "Stubb's Bar-B-Q",
+        "tags": ["BBQ", "restaurant", "live music", "venue"],
+        "rating": 4.2,
+        "price": 22.0,
+        "lat": 30.2634,
+        "lng": -97.7354,
+        "place_id": "stubbs_bbq",
+        "link": "https://stubbsaustin.com",
+        "address": "801 Red River St, Austin, TX 78701"
+    },
+    {
+        "name": "Saxon Pub",
+        "tags": ["live music", "venue", "songwriter"],
+        "rating": 4.6,
+        "price": 12.0,
+        "lat": 30.2515,
+        "lng": -97.7697,
+        "place_id": "saxon_pub",
+        "link": "https://saxonpub.com",
+        "address": "1320 S Lamar Blvd, Austin, TX 78704"
+    },
+)
+
+# Parks and outdoor activities
+_MOCK_OUTDOOR_PLACES = (
+    {
+        "name": "Zilker Park",
+        "tags": ["park", "outdoor", "activities"],
+        "rating": 4.5,
+        "price": 0.0,
+        "lat": 30.2672,
+        "lng": -97.7731,
+        "place_id": "zilker_park",
+        "link": "https://austintexas.gov/department/zilker-metropolitan-park",
+        "address": "2100 Barton Springs Rd, Austin, TX 78746"
+    },
+    {
+        "name": "Barton Springs Pool",
+        "tags": ["swimming", "park", "outdoor"],
+        "rating": 4.4,
+        "price": 5.0,
+        "lat": 30.2641,
+        "lng": -97.7731,
+        "place_id": "barton_springs",
+        "link": "https://austintexas.gov/department/barton-springs-pool",
+        "address": "2201 Barton Springs Rd, Austin, TX 78746"
+    },
+)
+
+# Museums and indoor activities
+_MOCK_INDOOR_PLACES = (
+    {
+        "name": "Bullock Texas State History Museum",
+        "tags": ["museum", "history", "indoor"],
+        "rating": 4.3,
+        "price": 15.0,
+        "lat": 30.2808,
+        "lng": -97.7391,
+        "place_id": "bullock_museum",
+        "link": "https://thestoryoftexas.com",
+        "address": "1800 Congress Ave, Austin, TX 78701"
+    },
+    {
+        "name": "Contemporary Austin",
+        "tags": ["museum", "art", "indoor"],
+        "rating": 4.2,
+        "price": 10.0,
+        "lat": 30.2648,
+        "lng": -97.7678,
+        "place_id": "contemporary_austin",
+        "link": "https://thecontemporaryaustin.org",
+        "address": "700 Congress Ave, Austin, TX 78701"
+    },
+)
+
+# Coffee shops
+_MOCK_COFFEE_PLACES = (
+    {
+        "name": "Sightglass Coffee",
+        "tags": ["coffee", "cafe"],
+        "rating": 4.4,
+        "price": 8.0,
+        "lat": 30.2651,
+        "lng": -97.7451,
+        "place_id": "sightglass_coffee",
+        "link": "https://sightglasscoffee.com",
+        "address": "111 W 2nd St, Austin, TX 78701"
+    },
+    {
+        "name": "Radio Coffee & Beer",
+        "tags": ["coffee", "beer", "cafe"],
+        "rating": 4.3,
+        "price": 10.0,
+        "lat": 30.2515,
+        "lng": -97.7595,
+        "place_id": "radio_coffee",
+        "link": "https://radiocoffeeandbeer.com",
+        "address": "4204 Menchaca Rd, Austin, TX 78704"
+    },
+)
+
+# (query keywords, places): a category is included when any keyword appears in the query
+_MOCK_CATEGORIES = (
+    (("bbq", "barbecue"), _MOCK_BBQ_PLACES),
+    (("music", "live"), _MOCK_MUSIC_PLACES),
+    (("park", "outdoor"), _MOCK_OUTDOOR_PLACES),
+    (("museum", "indoor"), _MOCK_INDOOR_PLACES),
+    (("coffee",), _MOCK_COFFEE_PLACES),
+)
+
+
 def _get_mock_places(query: str, near: str, limit: int) -> List[Dict[str, Any]]:
     """Mock places data - works for any city."""
     
     # Try to load from mock data file first (Austin-specific, but works for any city)
-    mock_file = "data/mock/places_austin.json"
-    if os.path.exists(mock_file):
+    try:
+        mock_index = _load_mock_file(_MOCK_FILE)
+    except Exception as e:
+        logger.error(f"Failed to load mock places data: {e}")
+        mock_index = None
+    
+    if mock_index is not None:
         try:
-            with open(mock_file, 'r') as f:
-                places_data = json.load(f)
-                
-            # Filter places based on query
-            query_lower = query.lower()
-            matching_places = []
-            
-            for place in places_data:
-                # Check if query matches name or tags
-                if (query_lower in place.get("name", "").lower() or
-                    any(query_lower in tag.lower() for tag in place.get("tags", []))):
-                    matching_places.append(place)
+            # Filter places based on query (name or tag contains it)
+            matches = mock_index.lookup(query.lower())
             
-            return matching_places[:limit]
+            # The parsed file is shared between calls, so hand out copies
+            return [dict(mock_index.places[i]) for i in matches[:limit]]
             
         except Exception as e:
-            logger.error(f"Failed to load mock places data: {e}")
+            logger.error(f"Failed to filter mock places data: {e}")
     
     # Fallback to hardcoded mock data
     query_lower = query.lower()
-    near_lower = near.lower()
-    
-    all_places = []
-    
-    # BBQ places
-    if "bbq" in query_lower or "barbecue" in query_lower:
-        all_places.extend([
-            {
-                "name": "Franklin Barbecue",
-                "tags": ["BBQ", "restaurant"],
-                "rating": 4.6,
-                "price": 25.0,
-                "lat": 30.2701,
-                "lng": -97.7374,
-                "place_id": "franklin_bbq",
-                "link": "https://franklinbbq.com",
-                "address": "900 E 11th St, Austin, TX 78702"
-            },
-            {
-                "name": "la Barbecue",
-                "tags": ["BBQ", "restaurant"],
-                "rating": 4.4,
-                "price": 20.0,
-                "lat": 30.2580,
-                "lng": -97.7386,
-                "place_id": "la_barbecue",
-                "link": "https://labarbecue.com",
-                "address": "2401 E Cesar Chavez St, Austin, TX 78702"
-            },
-            {
-                "name": "Stubb's Bar-B-Q",
-                "tags": ["BBQ", "restaurant", "live music", "venue"],
-                "rating": 4.2,
-                "price": 22.0,
-                "lat": 30.2634,
-                "lng": -97.7354,
-                "place_id": "stubbs_bbq",
-                "link": "https://stubbsaustin.com",
-                "address": "801 Red River St, Austin, TX 78701"
-            }
-        ])
-    
-    # Live music venues
-    if "music" in query_lower or "live" in query_lower:
-        all_places.extend([
-            {
-                "name": "The Continental Club",
-                "tags": ["live music", "venue", "bar"],
-                "rating": 4.5,
-                "price": 15.0,
-                "lat": 30.2625,
-                "lng": -97.7506,
-                "place_id": "continental_club",
-                "link": "https://continentalclub.com",
-                "address": "1315 S Congress Ave, Austin, TX 78704"
-            },
-            {
-                "name": "Antone's Nightclub",
-                "tags": ["live music", "venue", "blues"],
-                "rating": 4.4,
-                "price": 20.0,
-                "lat": 30.2669,
-                "lng": -97.7431,
-                "place_id": "antones",
-                "link": "https://antonesnightclub.com",
-                "address": "305 E 5th St, Austin, TX 78701"
-            },
-            {
-                "name": "Stubb's Bar-B-Q",
-                "tags": ["BBQ", "restaurant", "live music", "venue"],
-                "rating": 4.2,
-                "price": 22.0,
-                "lat": 30.2634,
-                "lng": -97.7354,
-                "place_id": "stubbs_bbq",
-                "link": "https://stubbsaustin.com",
-                "address": "801 Red River St, Austin, TX 78701"
-            },
-            {
-                "name": "Saxon Pub",
-                "tags": ["live music", "venue", "songwriter"],
-                "rating": 4.6,
-                "price": 12.0,
-                "lat": 30.2515,
-                "lng": -97.7697,
-                "place_id": "saxon_pub",
-                "link": "https://saxonpub.com",
-                "address": "1320 S Lamar Blvd, Austin, TX 78704"
-            }
-        ])
     
-    # Parks and outdoor activities
-    if "park" in query_lower or "outdoor" in query_lower:
-        all_places.extend([
-            {
-                "name": "Zilker Park",
-                "tags": ["park", "outdoor", "activities"],
-                "rating": 4.5,
-                "price": 0.0,
-                "lat": 30.2672,
-                "lng": -97.7731,
-                "place_id": "zilker_park",
-                "link": "https://austintexas.gov/department/zilker-metropolitan-park",
-                "address": "2100 Barton Springs Rd, Austin, TX 78746"
-            },
-            {
-                "name": "Barton Springs Pool",
-                "tags": ["swimming", "park", "outdoor"],
-                "rating": 4.4,
-                "price": 5.0,
-                "lat": 30.2641,
-                "lng": -97.7731,
-                "place_id": "barton_springs",
-                "link": "https://austintexas.gov/department/barton-springs-pool",
-                "address": "2201 Barton Springs Rd, Austin, TX 78746"
-            }
-        ])
+    # Remove duplicates based on place_id (setdefault keeps the first occurrence, one hash per place)
+    unique_places = {}
+    for keywords, category_places in _MOCK_CATEGORIES:
+        if any(keyword in query_lower for keyword in keywords):
+            for place in category_places:
+                unique_places.setdefault(place["place_id"], place)
     
-    # Museums and indoor activities
-    if "museum" in query_lower or "indoor" in query_lower:
-        all_places.extend([
-            {
-                "name": "Bullock Texas State History Museum",
-                "tags": ["museum", "history", "indoor"],
-                "rating": 4.3,
-                "price": 15.0,
-                "lat": 30.2808,
-                "lng": -97.7391,
-                "place_id": "bullock_museum",
-                "link": "https://thestoryoftexas.com",
-                "address": "1800 Congress Ave, Austin, TX 78701"
-            },
-            {
-                "name": "Contemporary Austin",
-                "tags": ["museum", "art", "indoor"],
-                "rating": 4.2,
-                "price": 10.0,
-                "lat": 30.2648,
-                "lng": -97.7678,
-                "place_id": "contemporary_austin",
-                "link": "https://thecontemporaryaustin.org",
-                "address": "700 Congress Ave, Austin, TX 78701"
-            }
-        ])
-    
-    # Coffee shops
-    if "coffee" in query_lower:
-        all_places.extend([
-            {
-                "name": "Sightglass Coffee",
-                "tags": ["coffee", "cafe"],
-                "rating": 4.4,
-                "price": 8.0,
-                "lat": 30.2651,
-                "lng": -97.7451,
-                "place_id": "sightglass_coffee",
-                "link": "https://sightglasscoffee.com",
-                "address": "111 W 2nd St, Austin, TX 78701"
-            },
-            {
-                "name": "Radio Coffee & Beer",
-                "tags": ["coffee", "beer", "cafe"],
-                "rating": 4.3,
-                "price": 10.0,
-                "lat": 30.2515,
-                "lng": -97.7595,
-                "place_id": "radio_coffee",
-                "link": "https://radiocoffeeandbeer.com",
-                "address": "4204 Menchaca Rd, Austin, TX 78704"
-            }
-        ])
-    
-    # Remove duplicates based on place_id
-    seen_ids = set()
-    unique_places = []
-    for place in all_places:
-        if place["place_id"] not in seen_ids:
-            unique_places.append(place)
-            seen_ids.add(place["place_id"])
-    
-    return unique_places[:limit]
+    return [dict(place) for place in list(unique_places.values())[:limit]]
 
 
 def _estimate_price_from_level(price_level: int = None) -> float:
     """Convert Google Places price level to estimated cost per person."""
-    if price_level is None:
-        return 15.0  # Default moderate price
+    if price_level is not None and 0 <= price_level <= 4:
+        return _PRICE_BY_LEVEL[price_level]
+    return 15.0  # Default moderate price
+
+
+@dataclass(frozen=True)
+class PlaceTable:
+    """
+    Column (struct-of-arrays) view of a list of place dicts for bulk filtering.
+    Coordinates, lowercased names and lowercased tags sit in parallel tuples, so
+    distance and interest scans walk flat sequences instead of a dict per place;
+    filters return row positions and callers touch the dicts only for selected rows.
+    """
+    lats: Tuple[Optional[float], ...]
+    lngs: Tuple[Optional[float], ...]
+    names: Tuple[str, ...]
+    tags: Tuple[Tuple[str, ...], ...]
+    # Lowercased name and tags joined by NUL, so one substring test covers every field
+    texts: Tuple[str, ...]
+    
+    @classmethod
+    def from_dicts(cls, places: List[Dict[str, Any]]) -> "PlaceTable":
+        names = tuple(place.get("name", "").lower() for place in places)
+        tags = tuple(tuple(tag.lower() for tag in place.get("tags", [])) for place in places)
+        return cls(
+            # Coordinates are only needed by within(); interest scans work on places without them
+            lats=tuple(place.get("lat") for place in places),
+            lngs=tuple(place.get("lng") for place in places),
+            names=names,
+            tags=tags,
+            texts=tuple(_FIELD_SEPARATOR.join((name,) + place_tags) for name, place_tags in zip(names, tags)),
+        )
     
-    price_map = {
-        0: 0.0,   # Free (parks, public spaces, etc.)
-        1: 10.0,  # Inexpensive
-        2: 20.0,  # Moderate
-        3: 35.0,  # Expensive
-        4: 50.0   # Very expensive
-    }
+    def interest_counts(self, interests: List[str]) -> List[int]:
+        """Per row, how many interests appear in the name or in any tag."""
+        interests_lower = [interest.lower() for interest in interests]
+        if any(_FIELD_SEPARATOR in interest for interest in interests_lower):
+            # Could match across fields in the joined text; test each field separately
+            return [
+                sum(1 for interest in interests_lower if interest in name or any(interest in tag for tag in tags))
+                for name, tags in zip(self.names, self.tags)
+            ]
+        # One C-level substring scan per interest over the joined text
+        return [sum(interest in text for interest in interests_lower) for text in self.texts]
     
-    return price_map.get(price_level, 15.0)
+    def within(self, center_lat: float, center_lng: float, max_distance_miles: float) -> List[Tuple[int, float]]:
+        """(row, distance) for rows within max_distance_miles of the center, in row order."""
+        distances = calculate_distance_batch(center_lat, center_lng, self.lats, self.lngs,
+                                             max_miles=max_distance_miles)
+        return [(i, distance) for i, distance in enumerate(distances) if distance <= max_distance_miles]
 
 
-def find_overlapping_interests(places: List[Dict[str, Any]], interests: List[str]) -> List[Dict[str, Any]]:
-    """Find places that satisfy multiple interests."""
-    overlapping = []
+def find_overlapping_interests(places: List[Dict[str, Any]], interests: List[str],
+                               table: Optional[PlaceTable] = None) -> List[Dict[str, Any]]:
+    """
+    Find places that satisfy multiple interests.
+    Pass table (PlaceTable.from_dicts(places)) to reuse one column view across filters.
+    """
+    if table is None:
+        table = PlaceTable.from_dicts(places)
     
-    for place in places:
-        place_tags = [tag.lower() for tag in place.get("tags", [])]
-        place_name = place.get("name", "").lower()
-        
-        matching_interests = 0
-        for interest in interests:
-            interest_lower = interest.lower()
-            if (interest_lower in place_name or 
-                any(interest_lower in tag for tag in place_tags)):
-                matching_interests += 1
-        
+    overlapping = []
+    for place, matching_interests in zip(places, table.interest_counts(interests)):
         if matching_interests >= 2:
             place["interest_matches"] = matching_interests
             overlapping.append(place)
@@ -339,16 +571,20 @@ def find_overlapping_interests(places: List[Dict[str, Any]], interests: List[str
     return sorted(overlapping, key=lambda x: x.get("interest_matches", 0), reverse=True)
 
 
-def filter_by_location(places: List[Dict[str, Any]], center_lat: float, center_lng: float, max_distance_miles: float = 5.0) -> List[Dict[str, Any]]:
-    """Filter places within a certain distance of a center point."""
-    from .maps import calculate_distance
+def filter_by_location(places: List[Dict[str, Any]], center_lat: float, center_lng: float, max_distance_miles: float = 5.0,
+                       table: Optional[PlaceTable] = None) -> List[Dict[str, Any]]:
+    """
+    Filter places within a certain distance of a center point.
+    Pass table (PlaceTable.from_dicts(places)) to reuse one column view across filters.
+    """
+    if table is None:
+        table = PlaceTable.from_dicts(places)
     
     nearby_places = []
-    for place in places:
-        distance = calculate_distance(center_lat, center_lng, place["lat"], place["lng"])
-        if distance <= max_distance_miles:
-            place["distance_from_center"] = round(distance, 1)
-            nearby_places.append(place)
+    for i, distance in table.within(center_lat, center_lng, max_distance_miles):
+        place = places[i]
+        place["distance_from_center"] = round(distance, 1)
+        nearby_places.append(place)
     
     # Sort by distance
     return sorted(nearby_places, key=lambda x: x.get("distance_from_center", 0))
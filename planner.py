@@ -1,38 +1,115 @@
 """
 Planner module for creating ordered execution steps and budget allocations.
 """
+import hashlib
 import logging
+import threading
+import traceback
 from datetime import date, timedelta
-from typing import List
-from .state import UserRequest, AgentState, PlanStep, BudgetAllocation, PlanningResponse
-from .llm import get_json_completion
+from typing import Any, Dict, List, Optional, Tuple
+import orjson
+from cachetools import LRUCache, TTLCache
+from pydantic import TypeAdapter
+from .state import UserRequest, AgentState, PlanStep, BudgetAllocation
+from .llm import get_json_completion, llm_client
 
 logger = logging.getLogger(__name__)
 
+# Sanitized LLM plans per trip request, so replanning the same trip skips the LLM and the fixups
+_PLAN_CACHE = TTLCache(maxsize=512, ttl=3600)
+_PLAN_CACHE_LOCK = threading.Lock()
 
-def create_plan(user_request: UserRequest) -> AgentState:
-    """
-    Create an ordered execution plan with budget allocations.
-    Returns AgentState with plan steps and initial budget allocation.
-    """
-    logger.info(f"Creating plan for trip from {user_request.origin} to {user_request.destination}")
-    
-    # Calculate trip duration
-    trip_days = (user_request.end_date - user_request.start_date).days
-    if trip_days <= 0:
-        trip_days = 1
-    
-    # Build prompt for LLM planning
-    prompt = f"""
+# Validator for the LLM's step list, built once; the PlanningResponse wrapper is skipped
+_STEP_LIST_ADAPTER = TypeAdapter(List[PlanStep])
+
+# Fallback plan templates per trip request (pure function of the request, reused across retries)
+_FALLBACK_CACHE = LRUCache(maxsize=256)
+_FALLBACK_CACHE_LOCK = threading.Lock()
+
+# Common incorrect tool names from the LLM -> the tool they mean
+_TOOL_MAPPING = {
+    "google maps": "maps.find_directions",
+    "maps": "maps.find_directions",
+    "directions": "maps.find_directions",
+    "booking.com": "hotels.search",
+    "hotels": "hotels.search",
+    "hotel search": "hotels.search",
+    "weather.com": "weather.forecast",
+    "weather": "weather.forecast",
+    "forecast": "weather.forecast",
+    "yelp": "places.search",
+    "places": "places.search",
+    "search": "places.search",
+    "activities": "places.search"
+}
+
+# Tool names a plan step may use (the tool enum in the planning schema)
+_VALID_TOOLS = frozenset({
+    "maps.find_directions", "hotels.search", "hotels.find_plan_b", "weather.forecast", "places.search", "synthesis.none"
+})
+
+# Estimated minutes per tool call (other tools count 2)
+_TOOL_DURATIONS = {
+    "maps.find_directions": 2,
+    "hotels.search": 3,
+    "weather.forecast": 1,
+    "places.search": 2,
+    "synthesis.none": 5
+}
+
+# Phases every plan must cover
+_REQUIRED_PHASES = frozenset({"transport", "lodging", "activities", "synthesis"})
+
+# JSON schema for the structured planning response; one shared object so the LLM client's
+# per-schema memo (canonical text, defaults) is built once
+_PLAN_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "steps": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "phase": {
+                        "type": "string",
+                        "enum": ["transport", "lodging", "activities", "synthesis"]
+                    },
+                    "description": {"type": "string"},
+                    "tool": {
+                        "type": "string",
+                        "enum": ["maps.find_directions", "hotels.search", "hotels.find_plan_b", "weather.forecast", "places.search", "synthesis.none"],
+                        "description": "Must be one of the exact tool names: maps.find_directions, hotels.search, weather.forecast, places.search, or synthesis.none"
+                    },
+                    "params": {"type": "object"}
+                },
+                "required": ["phase", "description", "tool", "params"]
+            }
+        },
+        "allocations": {
+            "type": "object",
+            "properties": {
+                "transport": {"type": "number"},
+                "lodging_target": {"type": "number"},
+                "activities_buffer": {"type": "number"}
+            },
+            "required": ["transport", "lodging_target", "activities_buffer"]
+        },
+        "reasoning": {"type": "string"}
+    },
+    "required": ["steps", "allocations"]
+}
+
+# Planning prompt, filled per request by _build_plan_prompt (llm._PLAN_SENTINEL matches its field lines)
+_PROMPT_TEMPLATE = """
 Plan a trip itinerary with the following details:
-- Origin: {user_request.origin}
-- Destination: {user_request.destination}
-- Start Date: {user_request.start_date}
-- End Date: {user_request.end_date}
+- Origin: {origin}
+- Destination: {destination}
+- Start Date: {start_date}
+- End Date: {end_date}
 - Duration: {trip_days} days
-- Travelers: {user_request.travelers}
-- Total Budget: ${user_request.budget_total}
-- Interests: {', '.join(user_request.interests) if user_request.interests else 'None specified'}
+- Travelers: {travelers}
+- Total Budget: ${budget_total}
+- Interests: {interests}
 
 Create an ordered execution plan with these phases:
 1. Transport - Find directions and travel costs
@@ -58,125 +135,39 @@ For budget allocation:
 
 Return the plan as structured JSON matching the schema exactly.
 """
-    
-    # Define JSON schema for structured response
-    schema = {
-        "type": "object",
-        "properties": {
-            "steps": {
-                "type": "array",
-                "items": {
-                    "type": "object",
-                    "properties": {
-                        "phase": {
-                            "type": "string",
-                            "enum": ["transport", "lodging", "activities", "synthesis"]
-                        },
-                        "description": {"type": "string"},
-                        "tool": {
-                            "type": "string",
-                            "enum": ["maps.find_directions", "hotels.search", "hotels.find_plan_b", "weather.forecast", "places.search", "synthesis.none"],
-                            "description": "Must be one of the exact tool names: maps.find_directions, hotels.search, weather.forecast, places.search, or synthesis.none"
-                        },
-                        "params": {"type": "object"}
-                    },
-                    "required": ["phase", "description", "tool", "params"]
-                }
-            },
-            "allocations": {
-                "type": "object",
-                "properties": {
-                    "transport": {"type": "number"},
-                    "lodging_target": {"type": "number"},
-                    "activities_buffer": {"type": "number"}
-                },
-                "required": ["transport", "lodging_target", "activities_buffer"]
-            },
-            "reasoning": {"type": "string"}
-        },
-        "required": ["steps", "allocations"]
-    }
+
+
+def create_plan(user_request: UserRequest) -> AgentState:
+    """
+    Create an ordered execution plan with budget allocations.
+    Returns AgentState with plan steps and initial budget allocation.
+    """
+    logger.info(f"Creating plan for trip from {user_request.origin} to {user_request.destination}")
     
     # Get structured response from LLM
     try:
-        response_data = get_json_completion(prompt, schema)
-        
-        # Validate and fix tool names if needed, and validate against user_request
-        if "steps" in response_data:
-            origin_mismatch = False
-            destination_mismatch = False
-            
-            for step in response_data["steps"]:
-                tool_name = step.get("tool", "")
-                params = step.get("params", {})
-                
-                # Map common incorrect tool names to correct ones
-                tool_mapping = {
-                    "google maps": "maps.find_directions",
-                    "maps": "maps.find_directions",
-                    "directions": "maps.find_directions",
-                    "booking.com": "hotels.search",
-                    "hotels": "hotels.search",
-                    "hotel search": "hotels.search",
-                    "weather.com": "weather.forecast",
-                    "weather": "weather.forecast",
-                    "forecast": "weather.forecast",
-                    "yelp": "places.search",
-                    "places": "places.search",
-                    "search": "places.search",
-                    "activities": "places.search"
-                }
-                if tool_name.lower() in tool_mapping:
-                    logger.warning(f"Fixed invalid tool name '{tool_name}' to '{tool_mapping[tool_name.lower()]}'")
-                    step["tool"] = tool_mapping[tool_name.lower()]
-                elif tool_name not in ["maps.find_directions", "hotels.search", "hotels.find_plan_b", "weather.forecast", "places.search", "synthesis.none"]:
-                    logger.error(f"Invalid tool name '{tool_name}' in plan, using fallback")
-                    raise ValueError(f"Invalid tool name: {tool_name}")
-                
-                # Validate that params match user_request
-                if tool_name == "maps.find_directions":
-                    if params.get("origin", "").lower() != user_request.origin.lower():
-                        origin_mismatch = True
-                        logger.warning(f"Origin mismatch: LLM returned '{params.get('origin')}' but user requested '{user_request.origin}'")
-                    if params.get("destination", "").lower() != user_request.destination.lower():
-                        destination_mismatch = True
-                        logger.warning(f"Destination mismatch: LLM returned '{params.get('destination')}' but user requested '{user_request.destination}'")
-                
-                # Fix params to match user_request
-                if tool_name == "maps.find_directions":
-                    params["origin"] = user_request.origin
-                    params["destination"] = user_request.destination
-                elif tool_name == "hotels.search":
-                    params["city"] = user_request.destination
-                    if "start_date" not in params or params.get("start_date") != user_request.start_date.isoformat():
-                        params["start_date"] = user_request.start_date.isoformat()
-                    if "end_date" not in params or params.get("end_date") != user_request.end_date.isoformat():
-                        params["end_date"] = user_request.end_date.isoformat()
-                elif tool_name == "weather.forecast":
-                    params["city"] = user_request.destination
-                    if "start_date" not in params or params.get("start_date") != user_request.start_date.isoformat():
-                        params["start_date"] = user_request.start_date.isoformat()
-                    if "end_date" not in params or params.get("end_date") != user_request.end_date.isoformat():
-                        params["end_date"] = user_request.end_date.isoformat()
-                elif tool_name == "places.search":
-                    params["near"] = user_request.destination
+        cache_key = _plan_cache_key(user_request)
+        response_data = _plan_cache_get(cache_key)
+        if response_data is None:
+            # No client-side fallback: a failed call must raise (into _create_fallback_plan) rather
+            # than return a stand-in plan that would then be cached as the model's answer
+            response_data = get_json_completion(_build_plan_prompt(user_request), _PLAN_SCHEMA, fallback=False)
             
-            # If there were mismatches, log but continue (we've fixed them)
-            if origin_mismatch or destination_mismatch:
-                logger.warning("LLM returned incorrect origin/destination values. Fixed to match user request.")
-        
-        planning_response = PlanningResponse(**response_data)
-        
-        # PlanningResponse already converts steps and allocations via Pydantic
-        plan_steps = planning_response.steps
-        allocations = planning_response.allocations
+            # Validate and fix tool names if needed, and validate against user_request
+            _sanitize_plan_response(response_data, user_request)
+            plan_steps = _STEP_LIST_ADAPTER.validate_python(response_data.get("steps"))
+            allocations = BudgetAllocation.model_validate(response_data.get("allocations"))
+            _plan_cache_set(cache_key, plan_steps, allocations)
+        else:
+            logger.info("Reusing cached plan for identical trip request")
+            plan_steps, allocations = _construct_plan(response_data)
         
         logger.info(f"Created plan with {len(plan_steps)} steps")
         
     except Exception as e:
         logger.error(f"LLM planning failed, using fallback: {e}")
-        import traceback
-        logger.debug(traceback.format_exc())
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(traceback.format_exc())
         plan_steps, allocations = _create_fallback_plan(user_request)
     
     # Create initial agent state
@@ -189,76 +180,211 @@ Return the plan as structured JSON matching the schema exactly.
     return agent_state
 
 
-def _create_fallback_plan(user_request: UserRequest) -> tuple[List[PlanStep], BudgetAllocation]:
-    """Create a deterministic fallback plan when LLM is unavailable."""
-    
+def _build_plan_prompt(user_request: UserRequest) -> str:
+    """Planning prompt for user_request (only built when the plan isn't cached)."""
     # Calculate trip duration
     trip_days = (user_request.end_date - user_request.start_date).days
     if trip_days <= 0:
         trip_days = 1
     
+    return _PROMPT_TEMPLATE.format_map({
+        "origin": user_request.origin,
+        "destination": user_request.destination,
+        "start_date": user_request.start_date,
+        "end_date": user_request.end_date,
+        "trip_days": trip_days,
+        "travelers": user_request.travelers,
+        "budget_total": user_request.budget_total,
+        "interests": ', '.join(user_request.interests) if user_request.interests else 'None specified'
+    })
+
+
+def _plan_cache_key(user_request: UserRequest) -> Optional[str]:
+    """Key for the plan cache, or None when plans come from the deterministic fallback (never cached)."""
+    if llm_client.use_mocks or not llm_client.has_api_config:
+        return None
+    key_data = user_request.model_dump(mode="json")
+    return hashlib.sha256(orjson.dumps(key_data, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _plan_cache_get(key: Optional[str]) -> Optional[Dict[str, Any]]:
+    if key is None:
+        return None
+    with _PLAN_CACHE_LOCK:
+        blob = _PLAN_CACHE.get(key)
+    # Stored as JSON bytes so callers get a fresh dict they are free to mutate
+    return orjson.loads(blob) if blob is not None else None
+
+
+def _plan_cache_set(key: Optional[str], plan_steps: List[PlanStep], allocations: BudgetAllocation) -> None:
+    if key is None:
+        return
+    # The validated dump, so hits can be rebuilt without re-running validation
+    blob = orjson.dumps({
+        "steps": _STEP_LIST_ADAPTER.dump_python(plan_steps, mode="json"),
+        "allocations": allocations.model_dump(mode="json")
+    })
+    with _PLAN_CACHE_LOCK:
+        _PLAN_CACHE[key] = blob
+
+
+def _construct_plan(data: Dict[str, Any]) -> tuple[List[PlanStep], BudgetAllocation]:
+    """Rebuild plan steps and allocations from their own validated dump, skipping Pydantic validation."""
+    steps = [PlanStep.model_construct(**step) for step in data["steps"]]
+    return steps, BudgetAllocation.model_construct(**data["allocations"])
+
+
+def _sanitize_plan_response(response_data: Dict[str, Any], user_request: UserRequest) -> None:
+    """Fix tool names and params in an LLM plan in place so they match user_request; raises ValueError on unknown tools."""
+    if "steps" in response_data:
+        origin_mismatch = False
+        destination_mismatch = False
+        origin = user_request.origin
+        destination = user_request.destination
+        origin_lower = origin.lower()
+        destination_lower = destination.lower()
+        start_iso = user_request.start_date.isoformat()
+        end_iso = user_request.end_date.isoformat()
+        
+        for step in response_data["steps"]:
+            tool_name = step.get("tool", "")
+            params = step.get("params", {})
+            
+            # Map common incorrect tool names to correct ones (valid names must match exactly;
+            # only the known aliases are case-insensitive)
+            canonical = tool_name if tool_name in _VALID_TOOLS else _TOOL_MAPPING.get(tool_name.lower())
+            if canonical is None:
+                logger.error(f"Invalid tool name '{tool_name}' in plan, using fallback")
+                raise ValueError(f"Invalid tool name: {tool_name}")
+            if canonical != tool_name:
+                logger.warning(f"Fixed invalid tool name '{tool_name}' to '{canonical}'")
+                step["tool"] = canonical
+            
+            # Validate that params match user_request
+            if canonical == "maps.find_directions":
+                if params.get("origin", "").lower() != origin_lower:
+                    origin_mismatch = True
+                    logger.warning(f"Origin mismatch: LLM returned '{params.get('origin')}' but user requested '{user_request.origin}'")
+                if params.get("destination", "").lower() != destination_lower:
+                    destination_mismatch = True
+                    logger.warning(f"Destination mismatch: LLM returned '{params.get('destination')}' but user requested '{user_request.destination}'")
+            
+            # Fix params to match user_request
+            if canonical == "maps.find_directions":
+                params["origin"] = origin
+                params["destination"] = destination
+            elif canonical == "hotels.search":
+                params["city"] = destination
+                params["start_date"] = start_iso
+                params["end_date"] = end_iso
+            elif canonical == "weather.forecast":
+                params["city"] = destination
+                params["start_date"] = start_iso
+                params["end_date"] = end_iso
+            elif canonical == "places.search":
+                params["near"] = destination
+        
+        # If there were mismatches, log but continue (we've fixed them)
+        if origin_mismatch or destination_mismatch:
+            logger.warning("LLM returned incorrect origin/destination values. Fixed to match user request.")
+
+
+def _create_fallback_plan(user_request: UserRequest) -> tuple[List[PlanStep], BudgetAllocation]:
+    """Create a deterministic fallback plan when LLM is unavailable."""
+    key = (
+        user_request.origin,
+        user_request.destination,
+        user_request.start_date.isoformat(),
+        user_request.end_date.isoformat(),
+        tuple(user_request.interests[:3]),  # Limit to top 3 interests
+        user_request.budget_total
+    )
+    with _FALLBACK_CACHE_LOCK:
+        template = _FALLBACK_CACHE.get(key)
+    if template is None:
+        template = _fallback_template(*key)
+        with _FALLBACK_CACHE_LOCK:
+            _FALLBACK_CACHE[key] = template
+    step_templates, (transport_estimate, lodging_target, activities_buffer) = template
+    
+    # Every field was built from the validated request, so skip re-validation; params are
+    # copied because the executor updates them in place
+    steps = [
+        PlanStep.model_construct(phase=phase, description=description, tool=tool, params=dict(params))
+        for phase, description, tool, params in step_templates
+    ]
+    allocations = BudgetAllocation.model_construct(
+        transport=transport_estimate,
+        lodging_target=lodging_target,
+        activities_buffer=activities_buffer
+    )
+    
+    logger.info(f"Created fallback plan with {len(steps)} steps")
+    logger.info(f"Budget allocation: Transport ${transport_estimate}, Lodging ${lodging_target}, Activities ${activities_buffer}")
+    
+    return steps, allocations
+
+
+def _fallback_template(origin: str, destination: str, start_iso: str, end_iso: str,
+                       interests: Tuple[str, ...], total_budget: float):
+    """Fallback plan as ((phase, description, tool, params), ...) plus allocation amounts."""
     # Create ordered steps
     steps = [
-        PlanStep(
-            phase="transport",
-            description=f"Find driving directions from {user_request.origin} to {user_request.destination}",
-            tool="maps.find_directions",
-            params={
-                "origin": user_request.origin,
-                "destination": user_request.destination
+        (
+            "transport",
+            f"Find driving directions from {origin} to {destination}",
+            "maps.find_directions",
+            {
+                "origin": origin,
+                "destination": destination
             }
         ),
-        PlanStep(
-            phase="lodging",
-            description=f"Search for hotels in {user_request.destination}",
-            tool="hotels.search",
-            params={
-                "city": user_request.destination,
-                "start_date": user_request.start_date.isoformat(),
-                "end_date": user_request.end_date.isoformat(),
+        (
+            "lodging",
+            f"Search for hotels in {destination}",
+            "hotels.search",
+            {
+                "city": destination,
+                "start_date": start_iso,
+                "end_date": end_iso,
                 "max_price": 200.0,  # Will be updated based on budget
                 "limit": 5
             }
         ),
-        PlanStep(
-            phase="activities",
-            description=f"Check weather forecast for {user_request.destination}",
-            tool="weather.forecast",
-            params={
-                "city": user_request.destination,
-                "start_date": user_request.start_date.isoformat(),
-                "end_date": user_request.end_date.isoformat()
+        (
+            "activities",
+            f"Check weather forecast for {destination}",
+            "weather.forecast",
+            {
+                "city": destination,
+                "start_date": start_iso,
+                "end_date": end_iso
             }
         )
     ]
     
     # Add activity searches based on interests
-    for interest in user_request.interests[:3]:  # Limit to top 3 interests
-        steps.append(
-            PlanStep(
-                phase="activities",
-                description=f"Search for {interest} activities in {user_request.destination}",
-                tool="places.search",
-                params={
-                    "query": interest,
-                    "near": user_request.destination,
-                    "limit": 10
-                }
-            )
-        )
-    
-    # Add synthesis step
-    steps.append(
-        PlanStep(
-            phase="synthesis",
-            description="Create final itinerary with selected activities and budget breakdown",
-            tool="synthesis.none",
-            params={}
+    steps.extend(
+        (
+            "activities",
+            f"Search for {interest} activities in {destination}",
+            "places.search",
+            {
+                "query": interest,
+                "near": destination,
+                "limit": 10
+            }
         )
+        for interest in interests
     )
     
-    # Calculate budget allocations
-    total_budget = user_request.budget_total
+    # Add synthesis step
+    steps.append((
+        "synthesis",
+        "Create final itinerary with selected activities and budget breakdown",
+        "synthesis.none",
+        {}
+    ))
     
     # Estimate transport cost (driving assumption)
     transport_estimate = min(50.0, total_budget * 0.1)  # 10% or $50, whichever is less
@@ -270,16 +396,7 @@ def _create_fallback_plan(user_request: UserRequest) -> tuple[List[PlanStep], Bu
     # Activities buffer (at least $150 or 20% of total budget)
     activities_buffer = max(150.0, total_budget * 0.2)
     
-    allocations = BudgetAllocation(
-        transport=transport_estimate,
-        lodging_target=lodging_target,
-        activities_buffer=activities_buffer
-    )
-    
-    logger.info(f"Created fallback plan with {len(steps)} steps")
-    logger.info(f"Budget allocation: Transport ${transport_estimate}, Lodging ${lodging_target}, Activities ${activities_buffer}")
-    
-    return steps, allocations
+    return tuple(steps), (transport_estimate, lodging_target, activities_buffer)
 
 
 def update_plan_with_constraints(agent_state: AgentState, constraint_type: str, details: dict) -> AgentState:
@@ -297,21 +414,7 @@ def update_plan_with_constraints(agent_state: AgentState, constraint_type: str,
     logger.info(f"Updating plan due to {constraint_type} constraint: {details}")
     
     if constraint_type == "budget" and agent_state.budget_remaining < 100:
-        # Add hotel Plan B step
-        plan_b_step = PlanStep(
-            phase="lodging",
-            description="Search for cheaper hotel options (Plan B)",
-            tool="hotels.find_plan_b",
-            params={
-                "city": details.get("city", ""),
-                "start_date": details.get("start_date", ""),
-                "end_date": details.get("end_date", ""),
-                "original_max_price": details.get("original_max_price", 200),
-                "remaining_budget": agent_state.budget_remaining
-            }
-        )
-        
-        # Insert Plan B step after regular hotel search
+        # Insert Plan B step after regular hotel search (only built when there is one to follow)
         lodging_index = next(
             (i for i, step in enumerate(agent_state.plan) 
              if step.phase == "lodging" and "plan_b" not in step.tool.lower()), 
@@ -319,22 +422,23 @@ def update_plan_with_constraints(agent_state: AgentState, constraint_type: str,
         )
         
         if lodging_index >= 0:
+            # Add hotel Plan B step
+            plan_b_step = PlanStep(
+                phase="lodging",
+                description="Search for cheaper hotel options (Plan B)",
+                tool="hotels.find_plan_b",
+                params={
+                    "city": details.get("city", ""),
+                    "start_date": details.get("start_date", ""),
+                    "end_date": details.get("end_date", ""),
+                    "original_max_price": details.get("original_max_price", 200),
+                    "remaining_budget": agent_state.budget_remaining
+                }
+            )
             agent_state.plan.insert(lodging_index + 1, plan_b_step)
     
     elif constraint_type == "weather" and details.get("rain_chance", 0) > 0.5:
-        # Add indoor activity search
-        indoor_step = PlanStep(
-            phase="activities",
-            description="Search for indoor activities due to rain",
-            tool="places.search",
-            params={
-                "query": "indoor museum coffee restaurant",
-                "near": details.get("city", ""),
-                "limit": 8
-            }
-        )
-        
-        # Add after weather check
+        # Add indoor activity search after weather check
         weather_index = next(
             (i for i, step in enumerate(agent_state.plan) 
              if step.tool == "weather.forecast"), 
@@ -342,6 +446,16 @@ def update_plan_with_constraints(agent_state: AgentState, constraint_type: str,
         )
         
         if weather_index >= 0:
+            indoor_step = PlanStep(
+                phase="activities",
+                description="Search for indoor activities due to rain",
+                tool="places.search",
+                params={
+                    "query": "indoor museum coffee restaurant",
+                    "near": details.get("city", ""),
+                    "limit": 8
+                }
+            )
             agent_state.plan.insert(weather_index + 1, indoor_step)
     
     elif constraint_type == "geo":
@@ -364,21 +478,7 @@ def update_plan_with_constraints(agent_state: AgentState, constraint_type: str,
 
 def estimate_plan_duration(plan_steps: List[PlanStep]) -> int:
     """Estimate total execution time for the plan in minutes."""
-    
-    duration_estimates = {
-        "maps.find_directions": 2,
-        "hotels.search": 3,
-        "weather.forecast": 1,
-        "places.search": 2,
-        "synthesis.none": 5
-    }
-    
-    total_minutes = 0
-    for step in plan_steps:
-        tool_time = duration_estimates.get(step.tool, 2)
-        total_minutes += tool_time
-    
-    return total_minutes
+    return sum(_TOOL_DURATIONS.get(step.tool, 2) for step in plan_steps)
 
 
 def validate_plan(agent_state: AgentState) -> List[str]:
@@ -388,16 +488,15 @@ def validate_plan(agent_state: AgentState) -> List[str]:
     """
     issues = []
     
-    # Check for required phases
-    phases_present = {step.phase for step in agent_state.plan}
-    required_phases = {"transport", "lodging", "activities", "synthesis"}
+    # One pass over the plan for both the phase order and the phases present
+    phase_order = [step.phase for step in agent_state.plan]
     
-    missing_phases = required_phases - phases_present
+    # Check for required phases
+    missing_phases = _REQUIRED_PHASES.difference(phase_order)
     if missing_phases:
         issues.append(f"Missing required phases: {', '.join(missing_phases)}")
     
     # Check phase order
-    phase_order = [step.phase for step in agent_state.plan]
     if phase_order:
         if phase_order[0] != "transport":
             issues.append("Plan should start with transport phase")
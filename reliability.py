@@ -0,0 +1,145 @@
+"""
+Reliability helpers for outbound API calls (Nemotron, Google Maps).
+"""
+import os
+import time
+import random
+import logging
+import threading
+from typing import Callable, Dict
+import requests
+
+logger = logging.getLogger(__name__)
+
+
+# Transient statuses worth retrying; 400/401/403 and other client errors are returned as-is
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+
+def is_upstream_failure(status_code: int) -> bool:
+    """Rate limits and server errors mean the backend is struggling; other 4xx are our own request's fault."""
+    return status_code == 429 or status_code >= 500
+
+
+def retry_request(send: Callable[[], requests.Response], attempts: int = 3,
+                  base: float = 0.2, cap: float = 4.0) -> requests.Response:
+    """
+    Call send() again on transient failures (retryable status, connection error, timeout).
+    Sleeps with full jitter between attempts: uniform(0, min(cap, base * 2**attempt)).
+    The last response is returned, or the last exception re-raised, once attempts run out.
+    """
+    for attempt in range(attempts):
+        try:
+            response = send()
+            if response.status_code not in RETRYABLE_STATUS or attempt == attempts - 1:
+                return response
+            logger.info(f"Transient status {response.status_code}, retrying (attempt {attempt + 1}/{attempts})")
+            # Release the connection (streamed bodies are otherwise held until garbage collection)
+            response.close()
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == attempts - 1:
+                raise
+            logger.info(f"Transient error {e!r}, retrying (attempt {attempt + 1}/{attempts})")
+        time.sleep(random.uniform(0, min(cap, base * 2 ** attempt)))
+
+
+class CircuitBreaker:
+    """
+    Per-key CLOSED -> OPEN -> HALF_OPEN circuit breaker.
+
+    After fail_threshold consecutive failures the key opens and calls fail fast.
+    Once reset_seconds have passed a single probe is let through (half-open):
+    success closes the circuit, failure re-opens it for another reset_seconds.
+    A probe that never reports back is abandoned after reset_seconds and another is let through.
+    """
+
+    def __init__(self, fail_threshold: int = 5, reset_seconds: float = 30.0):
+        self.fail_threshold = fail_threshold
+        self.reset_seconds = reset_seconds
+        self._failures: Dict[str, int] = {}
+        self._opened_at: Dict[str, float] = {}
+        self._probing: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def is_open(self, key: str) -> bool:
+        """True if calls for key should skip the backend and use their fallback."""
+        with self._lock:
+            opened_at = self._opened_at.get(key)
+            if opened_at is None:
+                return False
+            now = time.monotonic()
+            if now - opened_at < self.reset_seconds:
+                return True
+            probe_started = self._probing.get(key)
+            if probe_started is not None and now - probe_started < self.reset_seconds:
+                return True
+            # Half-open: let this caller probe the backend
+            self._probing[key] = now
+            return False
+
+    def record_success(self, key: str) -> None:
+        with self._lock:
+            if key in self._opened_at:
+                logger.info(f"Circuit for {key} closed")
+            self._failures.pop(key, None)
+            self._opened_at.pop(key, None)
+            self._probing.pop(key, None)
+
+    def record_failure(self, key: str) -> None:
+        with self._lock:
+            failures = self._failures.get(key, 0) + 1
+            self._failures[key] = failures
+            if self._probing.pop(key, None) is not None or failures >= self.fail_threshold:
+                if key not in self._opened_at:
+                    logger.warning(f"Circuit for {key} opened after {failures} failures")
+                self._opened_at[key] = time.monotonic()
+
+
+class LatencyTracker:
+    """
+    Adaptive request timeout learned from the latency of successful calls.
+
+    Keeps exponentially weighted averages of latency and of its deviation (as TCP does for
+    retransmit timeouts) and estimates p95 as mean + 2 * deviation. timeout() returns
+    3 * p95 clamped to [min_timeout, max_timeout], or default_timeout until warmup samples exist.
+    """
+
+    def __init__(self, default_timeout: float, min_timeout: float, max_timeout: float,
+                 alpha: float = 0.1, warmup: int = 5):
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.alpha = alpha
+        self.warmup = warmup
+        self._mean = 0.0
+        self._dev = 0.0
+        self._samples = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            if self._samples == 0:
+                self._mean = seconds
+                self._dev = seconds / 2
+            else:
+                self._dev += self.alpha * (abs(seconds - self._mean) - self._dev)
+                self._mean += self.alpha * (seconds - self._mean)
+            self._samples += 1
+
+    @property
+    def p95(self) -> float:
+        with self._lock:
+            return self._mean + 2 * self._dev
+
+    def timeout(self) -> float:
+        if self._samples < self.warmup:
+            return self.default_timeout
+        return min(self.max_timeout, max(self.min_timeout, 3 * self.p95))
+
+
+# Shared breaker; keys are per backend ("nemotron", "googleapis")
+circuit_breaker = CircuitBreaker()
+
+# Bulkheads: separate caps on in-flight requests per backend so a slow one can't starve the other
+LLM_BULKHEAD = threading.BoundedSemaphore(int(os.getenv("LLM_CONCURRENCY", "8")))
+MAPS_BULKHEAD = threading.BoundedSemaphore(int(os.getenv("MAPS_CONCURRENCY", "16")))
@@ -7,12 +7,31 @@ import sys
 import webbrowser
 import threading
 import time
+import urllib.request
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 from pathlib import Path
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
+def wait_until_ready(url, timeout=10.0, interval=0.05, thread=None):
+    """
+    Poll url until it answers 200 or timeout seconds pass; returns whether it came up.
+    If thread (the server's) is given, stop early once it has died.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if thread is not None and not thread.is_alive():
+            return False
+        try:
+            with urllib.request.urlopen(url, timeout=0.5) as response:
+                if response.status == 200:
+                    return True
+        except OSError:
+            pass
+        time.sleep(interval)
+    return False
+
 def run_backend():
     """Run Flask backend server."""
     # Change to the directory containing this script
@@ -59,15 +78,17 @@ if __name__ == '__main__':
     backend_thread = threading.Thread(target=run_backend, daemon=True)
     backend_thread.start()
     
-    # Wait a bit for backend to start
-    time.sleep(2)
+    # Wait for the backend to answer its health check
+    port = int(os.environ.get('PORT', 5001))
+    if not wait_until_ready(f"http://localhost:{port}/api/health"):
+        print("⚠️  Backend is starting... (this may take a moment)")
     
     # Start frontend in a separate thread
     frontend_thread = threading.Thread(target=run_frontend, daemon=True)
     frontend_thread.start()
     
-    # Wait a bit for frontend to start
-    time.sleep(1)
+    # Wait for the frontend to serve
+    wait_until_ready("http://localhost:8080/")
     
     # Open browser
     print("\n✅ Application is running!")
@@ -5,6 +5,7 @@ Simple script to start both backend and frontend servers
 import os
 import sys
 import subprocess
+import threading
 import time
 import webbrowser
 from pathlib import Path
@@ -31,45 +32,37 @@ def main():
     os.chdir(base_dir)
     
     # Start backend (using port 5001 to avoid AirPlay Receiver conflict)
+    # Both servers run in-process threads, so no second interpreter re-imports the app
+    from run_web import run_backend, run_frontend, wait_until_ready
     os.environ['PORT'] = '5001'
     print("🚀 Starting backend server on http://localhost:5001...")
-    backend_process = subprocess.Popen(
-        [sys.executable, "-m", "backend.app"],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        env=os.environ.copy()
-    )
+    backend_thread = threading.Thread(target=run_backend, daemon=True)
+    backend_thread.start()
     
-    # Wait for backend to start
-    time.sleep(3)
-    
-    # Check if backend is running
-    try:
-        import requests
-        response = requests.get("http://localhost:5001/api/health", timeout=2)
-        if response.status_code == 200:
-            print("✅ Backend is running!")
-        else:
-            print("⚠️  Backend may not be fully ready yet")
-    except ImportError:
-        print("⚠️  'requests' not available for health check, but backend should be running")
-    except:
+    # Wait for backend to answer its health check instead of sleeping a fixed time
+    if wait_until_ready("http://localhost:5001/api/health", thread=backend_thread):
+        print("✅ Backend is running!")
+    elif not backend_thread.is_alive():
+        # e.g. the port is already in use; the error was printed by the server thread
+        print("❌ Backend failed to start (is port 5001 already in use?)")
+        sys.exit(1)
+    else:
         print("⚠️  Backend is starting... (this may take a moment)")
     
     print()
     
     # Start frontend
     print("🌐 Starting frontend server on http://localhost:8080...")
-    frontend_dir = base_dir / 'frontend'
-    frontend_process = subprocess.Popen(
-        [sys.executable, "-m", "http.server", "8080"],
-        cwd=frontend_dir,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE
-    )
+    frontend_thread = threading.Thread(target=run_frontend, daemon=True)
+    frontend_thread.start()
     
-    time.sleep(1)
-    print("✅ Frontend is running!")
+    if wait_until_ready("http://localhost:8080/", thread=frontend_thread):
+        print("✅ Frontend is running!")
+    elif not frontend_thread.is_alive():
+        print("❌ Frontend failed to start (is port 8080 already in use?)")
+        sys.exit(1)
+    else:
+        print("⚠️  Frontend may not be fully ready yet")
     print()
     
     # Print instructions
@@ -85,7 +78,6 @@ def main():
     
     # Try to open browser
     try:
-        time.sleep(2)
         webbrowser.open("http://localhost:8080")
         print("🌐 Opening browser...")
     except:
@@ -94,15 +86,13 @@ def main():
     print()
     
     try:
-        # Wait for user to stop
-        backend_process.wait()
-        frontend_process.wait()
+        # Keep main thread alive while both servers run; the server threads are daemons and stop with it
+        while backend_thread.is_alive() and frontend_thread.is_alive():
+            time.sleep(1)
+        print("❌ A server stopped unexpectedly, shutting down")
+        sys.exit(1)
     except KeyboardInterrupt:
         print("\n👋 Shutting down servers...")
-        backend_process.terminate()
-        frontend_process.terminate()
-        backend_process.wait()
-        frontend_process.wait()
         print("✅ Servers stopped")
 
 if __name__ == '__main__':
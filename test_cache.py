@@ -0,0 +1,53 @@
+"""
+Tests for the SQLite response cache.
+"""
+import pytest
+from unittest.mock import patch
+
+from agent import cache
+from agent.cache import DiskCache
+
+
+@pytest.fixture
+def disk(tmp_path):
+    return DiskCache(str(tmp_path / "cache" / "responses.sqlite3"))
+
+
+def test_get_returns_stored_bytes(disk):
+    disk.set("maps:geocode:v2:austin, tx", b"[30.27, -97.74]", ttl=60)
+    assert disk.get("maps:geocode:v2:austin, tx") == b"[30.27, -97.74]"
+    assert disk.get("maps:geocode:v2:austin, mn") is None
+
+
+def test_set_replaces_existing_key(disk):
+    disk.set("key", b"old", ttl=60)
+    disk.set("key", b"new", ttl=60)
+    assert disk.get("key") == b"new"
+
+
+def test_entries_expire_after_ttl(disk):
+    with patch.object(cache.time, "time", return_value=1000.0):
+        disk.set("key", b"value", ttl=60)
+    with patch.object(cache.time, "time", return_value=1059.0):
+        assert disk.get("key") == b"value"
+    with patch.object(cache.time, "time", return_value=1061.0):
+        assert disk.get("key") is None
+
+
+def test_entries_survive_reopen(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    DiskCache(path).set("key", b"value", ttl=60)
+    assert DiskCache(path).get("key") == b"value"
+
+
+def test_disabled_cache_is_a_no_op():
+    disabled = DiskCache(None)
+    disabled.set("key", b"value", ttl=60)
+    assert disabled.get("key") is None
+
+
+def test_off_unless_enabled(monkeypatch):
+    monkeypatch.delenv("DISK_CACHE", raising=False)
+    assert cache._default_path() is None
+    monkeypatch.setenv("DISK_CACHE", "true")
+    assert cache._default_path().endswith("responses.sqlite3")
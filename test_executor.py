@@ -234,6 +234,43 @@ def test_weather_constraint_triggers_replan(mock_weather, sample_agent_state):
     assert weather_log.output.get("rain_chance", 0) > 0.5
 
 
+@patch('tools.hotels.search')
+def test_multiple_hotels_scored_and_best_selected(mock_hotels, sample_agent_state):
+    """Test that multiple hotel results are scored together and the best is selected."""
+    
+    mock_hotels.return_value = [
+        {
+            "name": "Pricey Hotel",
+            "price_per_night": 180.0,
+            "total_price": 360.0,
+            "rating": 4.0,
+            "lat": 30.2640,
+            "lng": -97.7425
+        },
+        {
+            "name": "Value Hotel",
+            "price_per_night": 90.0,
+            "total_price": 180.0,
+            "rating": 4.5,
+            "lat": 30.2650,
+            "lng": -97.7430
+        }
+    ]
+    
+    hotel_state = AgentState(
+        budget_remaining=800.0,
+        plan=[sample_agent_state.plan[1]]  # Only hotel search
+    )
+    
+    result_state = execute_plan(hotel_state)
+    
+    assert result_state.selections.hotel.name == "Value Hotel"
+    assert abs(result_state.budget_remaining - 620.0) < 0.01
+    
+    hotel_log = next(log for log in result_state.log if log.tool == "hotels.search")
+    assert "Evaluating 2 hotel options" in hotel_log.thinking
+
+
 def test_select_activities_basic():
     """Test basic activity selection."""
     
@@ -0,0 +1,35 @@
+"""
+Tests for the LLM client.
+"""
+import pytest
+from unittest.mock import patch, MagicMock
+
+from agent import llm
+from agent.llm import NemotronClient
+
+
+def _ok_response():
+    response = MagicMock()
+    response.status_code = 200
+    return response
+
+
+def test_latency_tracked_per_call_class():
+    """Fast short completions don't shrink the timeout used for long JSON calls."""
+    client = NemotronClient()
+    timeouts = []
+
+    def post(url, headers, data, timeout, stream):
+        timeouts.append(timeout)
+        return _ok_response()
+
+    with patch.object(llm._SESSION, "post", side_effect=post), \
+         patch.object(llm.time, "monotonic", side_effect=[0.0, 0.5] * 20):
+        for _ in range(10):
+            client._post_chat({"max_tokens": 30})
+
+    short = client._latency_for("text", 30)
+    assert short.timeout() == short.min_timeout
+    assert client._latency_for("json", 2000).timeout() == 30
+    assert client._latency_for("text", 2000).timeout() == 30
+    assert client._latency_for("stream", 30).timeout() == 30
@@ -0,0 +1,65 @@
+"""
+Tests for the maps tool.
+"""
+import pytest
+import orjson
+from unittest.mock import patch, MagicMock
+
+from agent.cache import DiskCache
+from tools import maps
+
+
+def _geocode_response(lat, lng):
+    """Fake Geocoding API response for a single result."""
+    response = MagicMock()
+    response.status_code = 200
+    response.content = orjson.dumps({
+        "status": "OK",
+        "results": [{"geometry": {"location": {"lat": lat, "lng": lng}}}]
+    })
+    return response
+
+
+@pytest.fixture
+def live_geocoder():
+    """Geocoding as if an API key were set, with empty memory and disk caches."""
+    maps._GEOCODE_CACHE.clear()
+    with patch.object(maps, "USE_MOCKS", False), \
+         patch.object(maps, "GOOGLE_MAPS_API_KEY", "test-key"), \
+         patch.object(maps, "disk_cache", DiskCache(None)):
+        yield
+    maps._GEOCODE_CACHE.clear()
+
+
+def test_geocode_cache_keeps_state(live_geocoder):
+    """Cities that share a name but not a state are geocoded and cached separately."""
+    coords = {
+        "Portland, OR": (45.5152, -122.6784),
+        "Portland, ME": (43.6591, -70.2568),
+    }
+
+    def get_maps(url, params):
+        return _geocode_response(*coords[params["address"]])
+
+    with patch.object(maps, "_get_maps", side_effect=get_maps) as mock_get:
+        assert maps.geocode_city("Portland, OR") == coords["Portland, OR"]
+        assert maps.geocode_city("Portland, ME") == coords["Portland, ME"]
+
+        # Repeats (any case or spacing) are served from the cache
+        assert maps.geocode_city("portland,  or") == coords["Portland, OR"]
+        assert mock_get.call_count == 2
+
+
+def test_geocode_table_matches_own_state():
+    """The static coordinate table matches a city with or without its own state."""
+    austin = maps._CITY_COORDS["austin"]
+    for name in ("Austin", "Austin, TX", "austin,tx", "austin, texas", "Austin TX"):
+        assert maps.geocode_city(name) == austin
+
+
+def test_geocode_other_state_skips_table(live_geocoder):
+    """A table city name with a different state is geocoded, not taken from the table."""
+    with patch.object(maps, "_get_maps", return_value=_geocode_response(43.6667, -92.9746)) as mock_get:
+        assert maps.geocode_city("Austin, MN") == (43.6667, -92.9746)
+        assert maps.geocode_city("Dallas GA") == (43.6667, -92.9746)
+    assert mock_get.call_count == 2
@@ -0,0 +1,92 @@
+"""
+Tests for the music recommendation tool.
+"""
+import pytest
+import orjson
+import requests
+from unittest.mock import patch, MagicMock
+
+from agent.llm import llm_client
+from tools import music
+
+
+@pytest.fixture
+def live_llm_client():
+    """LLM client configured as if an API key were set, with the music result cache empty."""
+    music._RESULT_CACHE.clear()
+    with patch.object(llm_client, "has_api_config", True), \
+         patch.object(llm_client, "use_mocks", False), \
+         patch.object(llm_client, "_cache_get", return_value=None), \
+         patch.object(llm_client, "_cache_set"):
+        yield llm_client
+    music._RESULT_CACHE.clear()
+
+
+def _sse_response(text):
+    """Fake streamed chat response delivering text as server-sent events, one line per chunk."""
+    events = [b"data: " + orjson.dumps({"choices": [{"delta": {"content": line + "\n"}}]})
+              for line in text.split("\n")]
+    response = MagicMock()
+    response.status_code = 200
+    response.iter_lines.return_value = events + [b"data: [DONE]"]
+    response.__enter__.return_value = response
+    return response
+
+
+def test_recommend_music_streams_and_caches(live_llm_client):
+    """A streamed answer is parsed into songs and cached for the next identical request."""
+    text = "".join(
+        f'{i}. **"{title}"** by The Testers\nGenre: Indie\nMood: Chill\n\n'
+        for i, title in enumerate(("Zilker Sunset", "Barton Springs", "South Congress"), 1)
+    )
+
+    with patch.object(live_llm_client, "_post_chat", return_value=_sse_response(text)) as mock_post:
+        first = music.recommend_music("Austin, TX", season="summer")
+        second = music.recommend_music("Austin, TX", season="summer")
+
+    assert mock_post.call_count == 1
+    assert first["status"] == "success"
+    assert [(song["title"], song["artist"]) for song in first["recommendations"]] == [
+        ("Zilker Sunset", "The Testers"), ("Barton Springs", "The Testers"), ("South Congress", "The Testers")
+    ]
+    assert second == first
+
+
+def test_recommend_music_failed_stream_not_cached(live_llm_client):
+    """A failed LLM stream returns the fallback recommendations without caching them."""
+    with patch.object(live_llm_client, "_post_chat", side_effect=requests.ConnectionError("down")) as mock_post:
+        result = music.recommend_music("Austin, TX")
+        assert len(result["recommendations"]) > 0
+        assert len(music._RESULT_CACHE) == 0
+
+        # The next identical request asks the LLM again
+        music.recommend_music("Austin, TX")
+        assert mock_post.call_count == 2
+
+
+def test_recommend_music_batch_failed_call_not_cached(live_llm_client):
+    """Batch requests whose LLM call failed fall back individually and are not cached."""
+    with patch.object(live_llm_client, "_post_chat", side_effect=requests.ConnectionError("down")):
+        results = music.recommend_music_batch([{"destination": "Austin, TX"}, {"destination": "Denver, CO"}])
+
+    assert [len(result["recommendations"]) > 0 for result in results] == [True, True]
+    assert len(music._RESULT_CACHE) == 0
+
+
+def test_recommend_music_stream_parses_like_whole_response(live_llm_client):
+    """Streamed text is parsed exactly as the complete response would be, including cleanup spanning lines."""
+    text = (
+        '<div class="songs\n'
+        '1. **"Hidden"** by Nobody">\n'
+        '1. **"Zilker Sunset"** by The Testers\nGenre: Indie\n\n'
+        '2. *"Barton Springs"* by The Testers\nMood: Chill\n\n'
+        '3. "South Congress" - The Testers\n</div>'
+    )
+    expected = music._parse_music_response(text, "Austin, TX", music.get_location_music_genres("Austin, TX"))
+
+    with patch.object(live_llm_client, "_post_chat", return_value=_sse_response(text)):
+        result = music.recommend_music("Austin, TX")
+
+    assert result["raw_llm_response"].rstrip("\n") == text
+    assert result["recommendations"] == expected
+    assert "Hidden" not in [song["title"] for song in result["recommendations"]]
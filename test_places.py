@@ -0,0 +1,88 @@
+"""
+Tests for the places tool.
+"""
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from unittest.mock import patch
+
+from agent.cache import DiskCache
+from tools import places
+
+
+@pytest.fixture
+def live_places():
+    """Places search as if an API key were set, with empty memory and disk caches."""
+    places._SEARCH_CACHE.clear()
+    with patch.object(places, "USE_MOCKS", False), \
+         patch.object(places, "GOOGLE_MAPS_API_KEY", "test-key"), \
+         patch.object(places, "disk_cache", DiskCache(None)):
+        yield
+    places._SEARCH_CACHE.clear()
+
+
+def _place(name):
+    return places.Place(name=name, tags=["food"], rating=4.5, price=10.0, lat=30.27, lng=-97.74,
+                        place_id=name, link=None, address=None)
+
+
+def test_canonical_query_ignores_case_spacing_and_order():
+    """Only case, whitespace and word order are folded into the cache key."""
+    assert places._canonical_query("BBQ  Austin") == places._canonical_query("austin bbq")
+    assert places._canonical_query("restaurants") != places._canonical_query("dining")
+    assert places._canonical_query("pubs") != places._canonical_query("pub")
+
+
+def test_search_caches_per_query(live_places):
+    """Repeats of a query hit the cache; a different query still calls the API."""
+    with patch.object(places, "_search_api", side_effect=lambda query, near, limit: [_place(query)]) as mock_api:
+        first = places.search("BBQ", "Austin, TX")
+        assert places.search("bbq", "austin,  TX") == first
+        assert mock_api.call_count == 1
+
+        assert places.search("barbecue", "Austin, TX")[0]["name"] == "barbecue"
+        assert mock_api.call_count == 2
+
+
+def test_search_results_do_not_alias_cache(live_places):
+    """Editing a returned place, tags included, leaves later cache hits untouched."""
+    with patch.object(places, "_search_api", return_value=[_place("Franklin")]):
+        first = places.search("bbq", "Austin, TX")
+        first[0]["tags"].append("edited")
+        first[0]["name"] = "edited"
+
+        second = places.search("bbq", "Austin, TX")
+    assert second[0]["tags"] == ["food"]
+    assert second[0]["name"] == "Franklin"
+
+
+def test_search_coalesces_concurrent_identical_queries(live_places):
+    """Identical searches issued while one is in flight share its single API call."""
+    api_started = threading.Event()
+    release_api = threading.Event()
+    waiters = threading.Semaphore(0)
+
+    class CountingFuture(places.Future):
+        def result(self, timeout=None):
+            waiters.release()
+            return super().result(timeout)
+
+    def slow_search_api(query, near, limit):
+        api_started.set()
+        release_api.wait(5)
+        return [_place(query)]
+
+    with patch.object(places, "Future", CountingFuture), \
+         patch.object(places, "_search_api", side_effect=slow_search_api) as mock_api:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            leader = pool.submit(places.search, "BBQ", "Austin, TX")
+            assert api_started.wait(5)
+            followers = [pool.submit(places.search, "bbq", "Austin, TX") for _ in range(3)]
+            for _ in followers:
+                assert waiters.acquire(timeout=5)
+            release_api.set()
+            results = [leader.result()] + [follower.result() for follower in followers]
+
+    assert mock_api.call_count == 1
+    assert all(result == results[0] for result in results)
@@ -6,7 +6,7 @@ from datetime import date, timedelta
 from unittest.mock import patch, MagicMock
 
 from agent.state import UserRequest, PlanStep, BudgetAllocation
-from agent.planner import create_plan, validate_plan, estimate_plan_duration
+from agent.planner import create_plan, validate_plan, estimate_plan_duration, _sanitize_plan_response
 
 
 @pytest.fixture
@@ -272,3 +272,82 @@ def test_create_plan_single_day_trip():
     # Budget allocations should be reasonable for day trip
     assert agent_state.allocations.lodging_target >= 0  # Might be 0 for day trip
     assert agent_state.allocations.activities_buffer > 0
+
+
+@pytest.fixture
+def live_llm_client():
+    """LLM client configured as if an API key were set, with the plan cache empty."""
+    from agent import planner
+    from agent.llm import llm_client
+    
+    planner._PLAN_CACHE.clear()
+    with patch.object(llm_client, "has_api_config", True), \
+         patch.object(llm_client, "use_mocks", False), \
+         patch.object(llm_client, "plan_fast_path", False), \
+         patch.object(llm_client, "_cache_get", return_value=None):
+        yield llm_client
+    planner._PLAN_CACHE.clear()
+
+
+def test_create_plan_failed_llm_call_not_cached(live_llm_client, sample_user_request):
+    """A failed LLM call falls back to the deterministic plan without caching it."""
+    import requests
+    from agent import planner
+    
+    with patch.object(live_llm_client, "_post_chat", side_effect=requests.ConnectionError("down")) as mock_post:
+        agent_state = create_plan(sample_user_request)
+        assert len(agent_state.plan) > 0
+        assert len(planner._PLAN_CACHE) == 0
+        
+        # The next identical request asks the LLM again
+        create_plan(sample_user_request)
+        assert mock_post.call_count == 2
+
+
+def test_create_plan_caches_llm_answer(live_llm_client, sample_user_request):
+    """A real LLM answer is cached, so replanning the same trip skips the LLM."""
+    from agent import planner
+    
+    mock_response = {
+        "steps": [
+            {"phase": "transport", "description": "Find directions", "tool": "maps.find_directions", "params": {}},
+            {"phase": "synthesis", "description": "Create itinerary", "tool": "synthesis.none", "params": {}}
+        ],
+        "allocations": {"transport": 50.0, "lodging_target": 400.0, "activities_buffer": 350.0}
+    }
+    
+    with patch('agent.planner.get_json_completion', return_value=mock_response) as mock_llm:
+        first = create_plan(sample_user_request)
+        second = create_plan(sample_user_request)
+    
+    mock_llm.assert_called_once()
+    assert len(planner._PLAN_CACHE) == 1
+    assert [step.model_dump() for step in second.plan] == [step.model_dump() for step in first.plan]
+    assert second.plan[0].params["origin"] == "Dallas, TX"
+    assert second.allocations == first.allocations
+
+
+def test_sanitize_plan_fixes_aliased_tool_params(sample_user_request):
+    """An aliased tool name is mapped and its params are corrected like the canonical tool's."""
+    response_data = {"steps": [
+        {"tool": "Maps", "params": {"origin": "Houston", "destination": "Austin"}},
+        {"tool": "hotels", "params": {"city": "Houston"}},
+    ]}
+    _sanitize_plan_response(response_data, sample_user_request)
+
+    maps_step, hotel_step = response_data["steps"]
+    assert maps_step["tool"] == "maps.find_directions"
+    assert maps_step["params"] == {"origin": "Dallas, TX", "destination": "Austin, TX"}
+    assert hotel_step["tool"] == "hotels.search"
+    assert hotel_step["params"] == {
+        "city": "Austin, TX",
+        "start_date": sample_user_request.start_date.isoformat(),
+        "end_date": sample_user_request.end_date.isoformat(),
+    }
+
+
+def test_sanitize_plan_rejects_miscased_tool(sample_user_request):
+    """Valid tool names must match exactly; a mixed-case one sends the plan to the fallback."""
+    response_data = {"steps": [{"tool": "Maps.Find_Directions", "params": {}}]}
+    with pytest.raises(ValueError):
+        _sanitize_plan_response(response_data, sample_user_request)
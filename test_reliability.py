@@ -0,0 +1,173 @@
+"""
+Tests for the reliability helpers (circuit breaker, retries, adaptive timeouts, bulkheads).
+"""
+import pytest
+import requests
+from unittest.mock import patch, MagicMock
+
+from agent import reliability
+from agent.reliability import CircuitBreaker, LatencyTracker, retry_request
+
+
+class FakeClock:
+    """Stand-in for time.monotonic that only moves when told to."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    fake = FakeClock()
+    with patch.object(reliability.time, "monotonic", fake):
+        yield fake
+
+
+def _response(status_code):
+    response = MagicMock()
+    response.status_code = status_code
+    return response
+
+
+def test_breaker_opens_after_threshold(clock):
+    breaker = CircuitBreaker(fail_threshold=3, reset_seconds=30)
+
+    for _ in range(2):
+        breaker.record_failure("api")
+    assert not breaker.is_open("api")
+
+    breaker.record_failure("api")
+    assert breaker.is_open("api")
+    assert not breaker.is_open("other")
+
+
+def test_breaker_half_open_lets_one_probe_through(clock):
+    breaker = CircuitBreaker(fail_threshold=1, reset_seconds=30)
+    breaker.record_failure("api")
+
+    clock.now += 29
+    assert breaker.is_open("api")
+
+    clock.now += 2
+    assert not breaker.is_open("api")  # the probe
+    assert breaker.is_open("api")      # everyone else while the probe is out
+
+
+def test_breaker_probe_success_closes(clock):
+    breaker = CircuitBreaker(fail_threshold=2, reset_seconds=30)
+    breaker.record_failure("api")
+    breaker.record_failure("api")
+    clock.now += 31
+    assert not breaker.is_open("api")
+
+    breaker.record_success("api")
+    assert not breaker.is_open("api")
+    breaker.record_failure("api")  # failure count starts over once closed
+    assert not breaker.is_open("api")
+
+
+def test_breaker_probe_failure_reopens(clock):
+    breaker = CircuitBreaker(fail_threshold=5, reset_seconds=30)
+    for _ in range(5):
+        breaker.record_failure("api")
+    clock.now += 31
+    assert not breaker.is_open("api")
+
+    breaker.record_failure("api")
+    assert breaker.is_open("api")
+    clock.now += 29
+    assert breaker.is_open("api")
+    clock.now += 2
+    assert not breaker.is_open("api")
+
+
+def test_breaker_abandoned_probe_is_replaced(clock):
+    """A probe that never reports back doesn't keep the circuit open for good."""
+    breaker = CircuitBreaker(fail_threshold=1, reset_seconds=30)
+    breaker.record_failure("api")
+    clock.now += 31
+    assert not breaker.is_open("api")
+
+    clock.now += 29
+    assert breaker.is_open("api")
+    clock.now += 2
+    assert not breaker.is_open("api")
+
+
+def test_retry_returns_first_non_retryable_response():
+    send = MagicMock(side_effect=[_response(503), _response(200)])
+    with patch.object(reliability.time, "sleep") as mock_sleep:
+        assert retry_request(send).status_code == 200
+    assert send.call_count == 2
+    assert mock_sleep.call_count == 1
+
+
+def test_retry_does_not_retry_client_errors():
+    send = MagicMock(return_value=_response(400))
+    with patch.object(reliability.time, "sleep") as mock_sleep:
+        assert retry_request(send).status_code == 400
+    assert send.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+def test_retry_stops_at_max_attempts_with_jittered_backoff():
+    send = MagicMock(side_effect=requests.ConnectionError("down"))
+    with patch.object(reliability.time, "sleep") as mock_sleep, \
+         patch.object(reliability.random, "uniform", side_effect=lambda low, high: high) as mock_uniform:
+        with pytest.raises(requests.ConnectionError):
+            retry_request(send, attempts=4, base=0.5, cap=1.5)
+
+    assert send.call_count == 4
+    assert [call.args for call in mock_uniform.call_args_list] == [(0, 0.5), (0, 1.0), (0, 1.5)]
+    assert [call.args[0] for call in mock_sleep.call_args_list] == [0.5, 1.0, 1.5]
+
+
+def test_retry_returns_last_retryable_response():
+    send = MagicMock(return_value=_response(429))
+    with patch.object(reliability.time, "sleep"):
+        assert retry_request(send, attempts=3).status_code == 429
+    assert send.call_count == 3
+
+
+def test_latency_tracker_default_until_warm():
+    tracker = LatencyTracker(default_timeout=30, min_timeout=10, max_timeout=60, warmup=3)
+    tracker.observe(1.0)
+    tracker.observe(1.0)
+    assert tracker.timeout() == 30
+
+    tracker.observe(1.0)
+    assert tracker.timeout() == 10
+
+
+def test_latency_tracker_clamps_to_max():
+    tracker = LatencyTracker(default_timeout=30, min_timeout=10, max_timeout=60, warmup=1)
+    tracker.observe(40.0)
+    assert tracker.timeout() == 60
+
+
+def test_latency_tracker_follows_slow_backend():
+    tracker = LatencyTracker(default_timeout=30, min_timeout=1, max_timeout=60, warmup=1)
+    for _ in range(50):
+        tracker.observe(2.0)
+    fast = tracker.timeout()
+    for _ in range(50):
+        tracker.observe(8.0)
+    assert tracker.timeout() > fast
+
+
+def test_bulkheads_are_independent():
+    """Exhausting one backend's slots leaves the other's free."""
+    slots = []
+    while reliability.LLM_BULKHEAD.acquire(blocking=False):
+        slots.append(None)
+    try:
+        assert len(slots) > 0
+        assert not reliability.LLM_BULKHEAD.acquire(timeout=0.01)
+        assert reliability.MAPS_BULKHEAD.acquire(blocking=False)
+        reliability.MAPS_BULKHEAD.release()
+    finally:
+        for _ in slots:
+            reliability.LLM_BULKHEAD.release()